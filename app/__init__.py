@@ -5,10 +5,12 @@ from flask_jwt_extended import JWTManager
 from app.extensions import db, migrate, jwt, init_extensions
 from flask_cors import CORS
 from app.config import config
+from app.utils.json_provider import FastJSONProvider
 
 def create_app(config_name='development'):
     """创建Flask应用"""
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     # 加载配置
     app.config.from_object(config[config_name])
@@ -21,12 +23,17 @@ def create_app(config_name='development'):
     # 注册蓝图
     from app.api import (
         auth_bp, vocabulary_bp, learning_bp,
-        assessment_bp, test_bp
+        assessment_bp, test_bp, admin_bp
     )
     app.register_blueprint(auth_bp, url_prefix='/api/v1/auth')
     app.register_blueprint(vocabulary_bp, url_prefix='/api/v1/vocabulary')
     app.register_blueprint(learning_bp, url_prefix='/api/v1/learning')
     app.register_blueprint(assessment_bp, url_prefix='/api/v1/assessment')
     app.register_blueprint(test_bp, url_prefix='/api/v1/tests')
+    app.register_blueprint(admin_bp, url_prefix='/api/v1/admin')
+
+    # 注册命令行命令
+    from app.commands import register_commands
+    register_commands(app)
 
     return app 
\ No newline at end of file
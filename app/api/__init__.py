@@ -6,6 +6,7 @@ vocabulary_bp = Blueprint('vocabulary', __name__)
 learning_bp = Blueprint('learning', __name__)
 assessment_bp = Blueprint('assessment', __name__)
 test_bp = Blueprint('test', __name__)
+admin_bp = Blueprint('admin', __name__)
 
 # 导入路由
-from . import auth, vocabulary, learning, assessment, test
+from . import auth, vocabulary, learning, assessment, test, admin
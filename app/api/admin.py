@@ -0,0 +1,48 @@
+from functools import wraps
+from flask import request, jsonify, current_app
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from app.extensions import slow_query_log
+from . import admin_bp
+
+def admin_required(f):
+    """只允许 ADMIN_USER_IDS 中的用户访问"""
+    @wraps(f)
+    @jwt_required()
+    def decorated(*args, **kwargs):
+        admin_ids = {str(user_id) for user_id in current_app.config['ADMIN_USER_IDS']}
+        if str(get_jwt_identity()) not in admin_ids:
+            return jsonify({
+                'code': 403001,
+                'message': '需要管理员权限'
+            }), 403
+        return f(*args, **kwargs)
+    return decorated
+
+@admin_bp.route('/slow-queries', methods=['GET'])
+@admin_required
+def get_slow_queries():
+    """获取最近的慢查询，新的在前
+
+    参数：
+    - limit: 返回条数，默认全部
+    """
+    limit = request.args.get('limit', type=int)
+    config = current_app.config
+    return jsonify({
+        'code': 200,
+        'data': {
+            'threshold_ms': config['SLOW_QUERY_THRESHOLD'] * 1000,
+            'sample_rate': config['SLOW_QUERY_SAMPLE_RATE'],
+            'items': slow_query_log.recent(limit)
+        }
+    })
+
+@admin_bp.route('/slow-queries', methods=['DELETE'])
+@admin_required
+def clear_slow_queries():
+    """清空慢查询记录"""
+    slow_query_log.clear()
+    return jsonify({
+        'code': 200,
+        'message': '已清空'
+    })
@@ -2,15 +2,18 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import (
     create_access_token, create_refresh_token,
     jwt_required, get_jwt_identity,
-    get_jwt
+    get_jwt, decode_token
 )
 from app.models.user import User
 from app import db
+from app.extensions import token_blocklist
 from app.services.wechat_service import WeChatService
+from app.services.password_service import PasswordService, PasswordHasherBusy
+from app.utils.http_client import UpstreamError
+from app.utils.kv_cache import get_redis
 import random
 import string
 import re
-import redis
 from datetime import datetime, timedelta
 from functools import wraps
 from . import auth_bp
@@ -37,9 +40,14 @@ def token_required(f):
 
 def get_redis_client():
     """获取 Redis 客户端"""
-    if not hasattr(current_app, 'redis_client'):
-        current_app.redis_client = redis.from_url(current_app.config['REDIS_URL'])
-    return current_app.redis_client
+    return get_redis()
+
+@auth_bp.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(error):
+    """密码哈希排队已满，让客户端稍后重试"""
+    response = jsonify({'code': 503002, 'message': '服务繁忙，请稍后重试'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
 
 @auth_bp.route('/send-code', methods=['POST'])
 def send_verification_code():
@@ -118,6 +126,27 @@ def refresh():
         'data': {'access_token': access_token}
     })
 
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """退出登录
+
+    撤销当前令牌；请求体中带 refresh_token 时一并撤销。
+    """
+    token_blocklist.revoke(get_jwt())
+
+    refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+    if refresh_token:
+        try:
+            payload = decode_token(refresh_token)
+        except Exception:
+            return jsonify({'code': 400001, 'message': '无效的refresh_token'}), 400
+        if payload['sub'] != get_jwt_identity():
+            return jsonify({'code': 403001, 'message': '无权撤销该令牌'}), 403
+        token_blocklist.revoke(payload)
+
+    return jsonify({'code': 200, 'message': '已退出登录'})
+
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
@@ -151,11 +180,13 @@ def wechat_login():
     if not code:
         return jsonify({'code': 400001, 'message': '缺少微信授权码'}), 400
     
-    # 获取微信用户信息
-    wechat_service = WeChatService()
-    wechat_user = wechat_service.get_user_info(code)
+    # 授权码换取 access_token，再获取微信用户信息（优先使用缓存）
+    try:
+        wechat_user = WeChatService.login(code)
+    except UpstreamError:
+        return jsonify({'code': 503001, 'message': '微信服务暂时不可用'}), 503
     
-    if not wechat_user:
+    if not wechat_user or 'errcode' in wechat_user:
         return jsonify({'code': 400002, 'message': '获取微信用户信息失败'}), 400
     
     # 查找或创建用户
@@ -292,6 +323,10 @@ def login():
     if not user or not user.check_password(data['password']):
         return jsonify({'code': 401001, 'message': '用户名或密码错误'}), 401
     
+    # 哈希算法或强度已调整，借登录时的明文密码重新生成
+    if PasswordService.needs_rehash(user.password_hash):
+        user.set_password(data['password'])
+    
     user.last_login = datetime.utcnow()
     db.session.commit()
     
@@ -1,9 +1,16 @@
 from flask import jsonify, request
 from flask_jwt_extended import get_jwt_identity
 from app.models.learning import LearningRecord, LearningGoal
+from app.models.learning_record import REVIEW_INTERVALS
 from app.models.learning_plan import LearningPlan
 from app.models.vocabulary import VocabularyBook
 from app.models.word import Word
+from app.services.forecast_service import ForecastService
+from app.services.progress_service import ProgressService
+from app.services.export_service import ExportService, RECORD_COLUMNS
+from app.utils.export import stream_export
+from app.utils.serializers import RowSerializer, parse_fields
+from app.utils.http_cache import make_validators, not_modified, with_validators
 from app import db
 from datetime import datetime, timedelta
 from sqlalchemy import func
@@ -52,14 +59,23 @@ def create_learning_goal(current_user):
 @token_required
 def get_learning_goals(current_user):
     """获取学习目标列表"""
+    goal_count, goals_modified = db.session.query(
+        func.count(LearningGoal.id), func.max(LearningGoal.updated_at)
+    ).filter(LearningGoal.user_id == current_user.id).one()
+    # 删除目标不会留下修改时间，只提供 ETag
+    validators = make_validators(current_user.id, goal_count, goals_modified)
+    response = not_modified(validators)
+    if response:
+        return response
+
     goals = db.session.query(LearningGoal).filter_by(user_id=current_user.id).all()
     
-    return jsonify({
+    return with_validators(jsonify({
         'code': 200,
         'data': {
             'items': [goal.to_dict() for goal in goals]
         }
-    })
+    }), validators)
 
 @learning_bp.route('/review/plan', methods=['GET'])
 @token_required
@@ -118,7 +134,7 @@ def complete_review(current_user, record_id):
         record.review_count += 1
         if result == 'remembered':
             # 根据艾宾浩斯遗忘曲线设置下次复习时间
-            intervals = [1, 2, 4, 7, 15, 30, 60]  # 复习间隔(天)
+            intervals = REVIEW_INTERVALS
             next_interval = intervals[min(record.review_count, len(intervals) - 1)]
             record.next_review_time = datetime.utcnow() + timedelta(days=next_interval)
             if record.review_count >= len(intervals):
@@ -140,6 +156,10 @@ def complete_review(current_user, record_id):
             'message': str(e)
         }), 500
 
+def _valid_daily_load(value):
+    """每日复习和新词总量上限可以不传，传入时必须是正整数"""
+    return value is None or (isinstance(value, int) and not isinstance(value, bool) and value > 0)
+
 @learning_bp.route('/plans', methods=['POST'])
 @token_required
 def create_learning_plan(current_user):
@@ -153,6 +173,9 @@ def create_learning_plan(current_user):
                 'message': '缺少必要参数'
             }), 400
             
+        if not _valid_daily_load(data.get('max_daily_load')):
+            return jsonify({'code': 400001, 'message': 'max_daily_load 必须是正整数'}), 400
+
         # 创建学习计划
         plan = LearningPlan(
             user_id=current_user.id,
@@ -165,10 +188,13 @@ def create_learning_plan(current_user):
         
         db.session.add(plan)
         db.session.commit()
+
+        result = plan.to_dict()
+        result['forecast'] = ForecastService.forecast_plan(plan, max_daily_load=data.get('max_daily_load'))
         
         return jsonify({
             'code': 200,
-            'data': plan.to_dict()
+            'data': result
         })
     except ValueError as e:
         return jsonify({
@@ -191,11 +217,20 @@ def get_learning_plans(current_user):
             user_id=current_user.id,
             status='active'
         ).all()
+        # 所有计划的进度一次批量计算，保存首次读取时生成的进度行
+        progress = ProgressService.resolve(current_user.id, plans)
+        db.session.commit()
+
+        items = []
+        for plan in plans:
+            item = plan.to_dict()
+            item['progress'] = progress[plan.book_id]
+            items.append(item)
 
         return jsonify({
             'code': 200,
             'data': {
-                'plans': [plan.to_dict() for plan in plans]
+                'plans': items
             }
         })
 
@@ -218,15 +253,21 @@ def update_learning_plan(current_user, plan_id):
             return jsonify({'code': 403, 'message': '无权访问此学习计划'}), 403
 
         data = request.get_json()
+        if not _valid_daily_load(data.get('max_daily_load')):
+            return jsonify({'code': 400001, 'message': 'max_daily_load 必须是正整数'}), 400
+
         if 'daily_words' in data:
             plan.daily_words = data['daily_words']
         if 'status' in data:
             plan.status = data['status']
 
         db.session.commit()
+
+        result = plan.to_dict()
+        result['forecast'] = ForecastService.forecast_plan(plan, max_daily_load=data.get('max_daily_load'))
         return jsonify({
             'code': 200,
-            'data': plan.to_dict()
+            'data': result
         })
 
     except Exception as e:
@@ -287,16 +328,39 @@ def create_learning_record(current_user):
 @learning_bp.route('/records', methods=['GET'])
 @token_required
 def get_learning_records(current_user):
-    """获取学习记录列表"""
-    records = db.session.query(LearningRecord).filter_by(user_id=current_user.id).all()
+    """获取学习记录列表，支持 ?fields= 和 ?view=lean"""
+    try:
+        serializer = RowSerializer.for_model(LearningRecord, parse_fields(LearningRecord, request.args))
+    except ValueError as e:
+        return jsonify({'code': 400001, 'message': str(e)}), 400
+
+    rows = db.session.query(*serializer.columns).filter(
+        LearningRecord.user_id == current_user.id
+    ).order_by(LearningRecord.id).all()
     
     return jsonify({
         'code': 200,
         'data': {
-            'items': [record.to_dict() for record in records]
+            'items': serializer.to_dicts(rows)
         }
     })
 
+@learning_bp.route('/records/export', methods=['GET'])
+@token_required
+def export_learning_records(current_user):
+    """流式导出学习记录"""
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in ExportService.FORMATS:
+        return jsonify({'code': 400001, 'message': '不支持的文件格式'}), 400
+
+    return stream_export(
+        ExportService.record_rows(current_user.id),
+        fmt,
+        RECORD_COLUMNS,
+        f'learning-records-{current_user.id}',
+        compress=request.args.get('gzip', type=int) == 1
+    )
+
 @learning_bp.route('/records/<int:record_id>', methods=['PUT'])
 @token_required
 def update_learning_record(current_user, record_id):
@@ -454,7 +518,7 @@ def submit_review_result(current_user):
         record.review_count += 1
         if mapped_result == 'remembered':
             # 根据艾宾浩斯遗忘曲线设置下次复习时间
-            intervals = [1, 2, 4, 7, 15, 30, 60]  # 复习间隔(天)
+            intervals = REVIEW_INTERVALS
             next_interval = intervals[min(record.review_count, len(intervals) - 1)]
             record.next_review_time = datetime.utcnow() + timedelta(days=next_interval)
             if record.review_count >= len(intervals):
@@ -7,6 +7,8 @@ from app.models.vocabulary import VocabularyBook
 from app.models.learning import LearningRecord
 from app.models.test import Test, TestQuestion, TestRecord, TestAnswer
 from app import db
+from app.utils.serializers import RowSerializer, parse_fields
+from app.utils.http_cache import make_validators, not_modified, with_validators
 from . import test_bp
 from datetime import datetime, timedelta
 import random
@@ -31,7 +33,7 @@ def generate_test():
             'message': '缺少必要参数'
         }), 400
     
-    book = VocabularyBook.query.get_or_404(data['book_id'])
+    book = VocabularyBook.get_active_or_404(data['book_id'])
     if book.user_id != current_user.id:
         return jsonify({
             'code': 403001,
@@ -112,7 +114,7 @@ def create_test():
             'message': '缺少必要参数'
         }), 400
         
-    book = VocabularyBook.query.get_or_404(data['book_id'])
+    book = VocabularyBook.get_active_or_404(data['book_id'])
     if book.user_id != current_user.id:
         return jsonify({
             'code': 403001,
@@ -148,11 +150,16 @@ def get_tests():
             'message': '用户不存在'
         }), 401
     
-    tests = Test.query.filter_by(user_id=current_user.id).all()
+    try:
+        serializer = RowSerializer.for_model(Test, parse_fields(Test, request.args))
+    except ValueError as e:
+        return jsonify({'code': 400001, 'message': str(e)}), 400
+
+    rows = db.session.query(*serializer.columns).filter(Test.user_id == current_user.id).order_by(Test.id).all()
     return jsonify({
         'code': 200,
         'data': {
-            'items': [test.to_dict() for test in tests]
+            'items': serializer.to_dicts(rows)
         }
     })
 
@@ -174,11 +181,22 @@ def get_test_detail(test_id):
             'code': 403001,
             'message': '无权访问此测试'
         }), 403
+    
+    question_count, questions_modified = db.session.query(
+        db.func.count(TestQuestion.id), db.func.max(TestQuestion.updated_at)
+    ).filter(TestQuestion.test_id == test_id).one()
+    validators = make_validators(
+        test.updated_at, question_count, questions_modified,
+        last_modified=max(filter(None, (test.updated_at, questions_modified)), default=None)
+    )
+    response = not_modified(validators)
+    if response:
+        return response
         
-    return jsonify({
+    return with_validators(jsonify({
         'code': 200,
         'data': test.to_dict(with_questions=True)
-    })
+    }), validators)
 
 @test_bp.route('/<int:test_id>', methods=['PUT'])
 @jwt_required()
@@ -298,11 +316,16 @@ def get_test_questions(test_id):
             'code': 403001,
             'message': '无权访问此测试'
         }), 403
+    
+    try:
+        serializer = RowSerializer.for_model(TestQuestion, parse_fields(TestQuestion, request.args))
+    except ValueError as e:
+        return jsonify({'code': 400001, 'message': str(e)}), 400
         
     return jsonify({
         'code': 200,
         'data': {
-            'items': [question.to_dict() for question in test.questions]
+            'items': _question_rows(serializer, test_id)
         }
     })
 
@@ -369,7 +392,9 @@ def delete_test_question(test_id, question_id):
             'message': '题目不存在'
         }), 404
         
+    # 删除题目并更新测试修改时间使缓存失效
     db.session.delete(question)
+    test.updated_at = datetime.utcnow()
     db.session.commit()
     return jsonify({
         'code': 200,
@@ -400,6 +425,14 @@ def start_test(test_id):
             'code': 400001,
             'message': '测试已经开始'
         }), 400
+    
+    # 答题时不下发正确答案
+    try:
+        serializer = RowSerializer.for_model(
+            TestQuestion, parse_fields(TestQuestion, request.args, exclude=('correct_answer',))
+        )
+    except ValueError as e:
+        return jsonify({'code': 400001, 'message': str(e)}), 400
         
     test.start_time = datetime.utcnow()
     db.session.commit()
@@ -410,7 +443,7 @@ def start_test(test_id):
             'test_id': test.id,
             'start_time': test.start_time.isoformat(),
             'duration': test.duration,
-            'questions': [question.to_dict(include_answer=False) for question in test.questions]
+            'questions': _question_rows(serializer, test_id)
         }
     })
 
@@ -474,7 +507,7 @@ def submit_test(test_id):
             correct_count += 1
             
         test_answer = TestAnswer(
-            test_record_id=test_record.id,
+            record_id=test_record.id,
             question_id=answer['question_id'],
             answer=answer['answer'],
             is_correct=is_correct
@@ -648,4 +681,12 @@ def get_test_question(test_id, question_id):
     return jsonify({
         'code': 200,
         'data': question.to_dict()
-    }) 
\ No newline at end of file
+    }) 
+
+
+def _question_rows(serializer, test_id):
+    """按题目顺序查询测试题目的输出列"""
+    rows = db.session.query(*serializer.columns).filter(
+        TestQuestion.test_id == test_id
+    ).order_by(TestQuestion.id).all()
+    return serializer.to_dicts(rows)
@@ -1,13 +1,26 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import get_jwt_identity
 from app.models.vocabulary import VocabularyBook, WordRelation
 from app.models.word import Word
-from app.models.learning import LearningRecord, LearningGoal
+from app.models.learning import LearningRecord, LearningGoal, LearningFrontier
 from app.models.learning import ReviewPlan
 from app.models.user import User
+from app.services.coverage_service import CoverageService
+from app.services.progress_service import ProgressService
+from app.services.import_service import ImportService, ImportAborted
+from app.services.ordering_service import OrderingService
+from app.services.word_service import WordService
+from app.services.book_service import BookService
+from app.services.deletion_service import DeletionService
+from app.services.recommendation_service import RecommendationService
+from app.services.export_service import ExportService, BOOK_COLUMNS
+from app.utils.export import stream_export
+from app.utils.serializers import RowSerializer, parse_fields
+from app.utils.http_cache import make_validators, not_modified, with_validators
 from app import db
 from datetime import datetime, timedelta
 import random
+import io
 from .auth import token_required
 from . import vocabulary_bp  # 从__init__.py导入蓝图
 
@@ -15,7 +28,7 @@ from . import vocabulary_bp  # 从__init__.py导入蓝图
 @token_required
 def get_books(current_user):
     """获取词汇书列表"""
-    books = db.session.query(VocabularyBook).filter_by(user_id=current_user.id).all()
+    books = db.session.query(VocabularyBook).filter_by(user_id=current_user.id, deleted_at=None).all()
     return jsonify({
         'code': 200,
         'data': {
@@ -58,11 +71,26 @@ def create_book(current_user):
             'message': str(e)
         }), 400
 
+@vocabulary_bp.route('/books/coverage', methods=['GET'])
+@token_required
+def get_books_coverage(current_user):
+    """获取所有词汇书的掌握覆盖率"""
+    items = CoverageService.get_coverage(current_user.id)
+    # 保存首次读取时生成的位图
+    db.session.commit()
+    return jsonify({
+        'code': 200,
+        'data': {
+            'items': items,
+            'total': len(items)
+        }
+    })
+
 @vocabulary_bp.route('/books/<int:book_id>', methods=['GET'])
 @token_required
 def get_book_detail(current_user, book_id):
     """获取词汇书详情"""
-    book = db.session.get(VocabularyBook, book_id)
+    book = VocabularyBook.get_active(book_id)
     
     if not book:
         return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
@@ -70,16 +98,27 @@ def get_book_detail(current_user, book_id):
     if book.user_id != current_user.id:
         return jsonify({'code': 403001, 'message': '无权访问此词汇书'}), 403
     
-    return jsonify({
+    word_count, relations_modified = db.session.query(
+        db.func.count(WordRelation.id), db.func.max(WordRelation.updated_at)
+    ).filter(WordRelation.book_id == book_id).one()
+    validators = make_validators(
+        book.updated_at, word_count, relations_modified,
+        last_modified=max(filter(None, (book.updated_at, relations_modified)), default=None)
+    )
+    response = not_modified(validators)
+    if response:
+        return response
+    
+    return with_validators(jsonify({
         'code': 200,
-        'data': book.to_dict()
-    })
+        'data': book.to_dict(word_count=word_count)
+    }), validators)
 
 @vocabulary_bp.route('/books/<int:book_id>', methods=['PUT'])
 @token_required
 def update_book(current_user, book_id):
     """更新词汇书"""
-    book = db.session.get(VocabularyBook, book_id)
+    book = VocabularyBook.get_active(book_id)
     if not book:
         return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
     
@@ -110,24 +149,60 @@ def delete_book(current_user, book_id):
     """删除词汇书"""
     book = db.session.get(VocabularyBook, book_id)
     if not book:
-        return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
+        return jsonify({'code': 404001, 'message': '词汇书不存在'}), 404
     
     if book.user_id != current_user.id:
         return jsonify({'code': 403001, 'message': '无权删除此词汇书'}), 403
     
-    db.session.delete(book)
-    db.session.commit()
+    # 已在后台删除中，重复请求不再启动删除
+    if book.deleted_at is not None:
+        return jsonify({
+            'code': 202,
+            'message': '词汇书正在后台删除'
+        }), 202
+
+    # 特别大的词书先标记删除再在后台分批删除，其余由数据库级联删除关联数据
+    word_count = db.session.query(db.func.count(WordRelation.id)).filter_by(book_id=book_id).scalar()
+    if word_count > current_app.config['BOOK_DELETE_CHUNK_THRESHOLD']:
+        if DeletionService.mark_book_deleting(book_id):
+            DeletionService.purge_book_in_background(book_id)
+        return jsonify({
+            'code': 202,
+            'message': '词汇书正在后台删除'
+        }), 202
+    
+    DeletionService.delete_book(book_id)
+    db.session.expunge(book)
     
     return jsonify({
         'code': 200,
         'message': '词汇书删除成功'
     })
 
+@vocabulary_bp.route('/books/<int:book_id>/clone', methods=['POST'])
+@token_required
+def clone_book(current_user, book_id):
+    """复制词汇书及其全部单词"""
+    book = VocabularyBook.get_active(book_id)
+    if not book:
+        return jsonify({'code': 404001, 'message': '词汇书不存在'}), 404
+    
+    if book.user_id != current_user.id:
+        return jsonify({'code': 403001, 'message': '无权访问此词汇书'}), 403
+
+    data = request.get_json(silent=True) or {}
+    clone = BookService.clone(book, current_user.id, data.get('name'))
+
+    return jsonify({
+        'code': 200,
+        'data': clone.to_dict(word_count=clone.total_words)
+    }), 201
+
 @vocabulary_bp.route('/books/<int:book_id>/words', methods=['POST'])
 @token_required
 def add_words(current_user, book_id):
     """添加单词"""
-    book = db.session.get(VocabularyBook, book_id)
+    book = VocabularyBook.get_active(book_id)
     if not book:
         return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
     
@@ -142,18 +217,19 @@ def add_words(current_user, book_id):
         if len(words) != len(word_ids):
             return jsonify({'code': 400001, 'message': '部分单词不存在'}), 400
             
-        max_order = db.session.query(db.func.max(WordRelation.order)).filter_by(book_id=book.id).scalar() or 0
+        next_order = OrderingService.next_order(book.id)
         
         word_relations = []
         for i, word in enumerate(words):
             word_relation = WordRelation(
                 word_id=word.id,
                 book_id=book.id,
-                order=max_order + i + 1
+                order=next_order + i * WordRelation.ORDER_GAP
             )
             word_relations.append(word_relation)
         
         db.session.bulk_save_objects(word_relations)
+        CoverageService.invalidate_book(book.id)
         db.session.commit()
         
         return jsonify({
@@ -162,23 +238,17 @@ def add_words(current_user, book_id):
         })
     
     elif 'text' in data:  # 单个单词
-        word = db.session.query(Word).filter_by(text=data['text']).first()
-        if not word:
-            word = Word(
-                text=data['text'],
-                phonetic=data.get('phonetic'),
-                definition=data.get('definition'),
-                example=data.get('example')
-            )
-            db.session.add(word)
-            db.session.flush()
+        word = WordService.get_or_create(
+            text=data['text'],
+            definition=data.get('definition'),
+            phonetic=data.get('phonetic'),
+            example=data.get('example')
+        )
 
-        max_order = db.session.query(db.func.max(WordRelation.order)).filter_by(book_id=book.id).scalar() or 0
-        
         word_relation = WordRelation(
             word_id=word.id,
             book_id=book.id,
-            order=max_order + 1
+            order=OrderingService.next_order(book.id)
         )
         db.session.add(word_relation)
         db.session.commit()
@@ -191,6 +261,105 @@ def add_words(current_user, book_id):
     else:
         return jsonify({'code': 400001, 'message': '缺少必填字段'}), 400
 
+@vocabulary_bp.route('/books/<int:book_id>/import', methods=['POST'])
+@token_required
+def import_words(current_user, book_id):
+    """从 CSV 或 JSONL 文件批量导入单词"""
+    book = VocabularyBook.get_active(book_id)
+    if not book:
+        return jsonify({'code': 404001, 'message': '词汇书不存在'}), 404
+    
+    if book.user_id != current_user.id:
+        return jsonify({'code': 403001, 'message': '无权访问此词汇书'}), 403
+
+    # 支持 multipart 上传文件，或直接以请求体发送文件内容
+    upload = request.files.get('file')
+    if upload:
+        stream = upload.stream
+        fmt = request.args.get('format') or upload.filename.rsplit('.', 1)[-1].lower()
+    else:
+        stream = request.stream
+        fmt = request.args.get('format')
+    
+    if fmt not in ImportService.FORMATS:
+        return jsonify({'code': 400001, 'message': '不支持的文件格式'}), 400
+
+    rows = ImportService.iter_rows(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''), fmt)
+    try:
+        stats = ImportService.import_words(book.id, rows)
+    except ImportAborted as e:
+        # 按块提交，出错前的行已经导入
+        return jsonify({
+            'code': 400001,
+            'message': f"{e}；导入不是原子的，前 {e.stats['processed']} 行已提交",
+            'data': e.stats
+        }), 400
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'code': 400001, 'message': str(e)}), 400
+
+    return jsonify({
+        'code': 200,
+        'message': '单词导入成功',
+        'data': stats
+    })
+
+@vocabulary_bp.route('/books/<int:book_id>/export', methods=['GET'])
+@token_required
+def export_book(current_user, book_id):
+    """流式导出词书单词"""
+    book = VocabularyBook.get_active(book_id)
+    if not book:
+        return jsonify({'code': 404001, 'message': '词汇书不存在'}), 404
+    
+    if book.user_id != current_user.id:
+        return jsonify({'code': 403001, 'message': '无权访问此词汇书'}), 403
+
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in ExportService.FORMATS:
+        return jsonify({'code': 400001, 'message': '不支持的文件格式'}), 400
+
+    return stream_export(
+        ExportService.book_rows(book.id),
+        fmt,
+        BOOK_COLUMNS,
+        f'book-{book.id}',
+        compress=request.args.get('gzip', type=int) == 1
+    )
+
+@vocabulary_bp.route('/books/<int:book_id>/recommendations', methods=['GET'])
+@token_required
+def get_recommendations(current_user, book_id):
+    """按词书顺序推荐尚未学习的新词
+
+    参数：
+    - limit: 返回数量，默认 20，最多 100
+    """
+    book = VocabularyBook.get_active(book_id)
+    if not book:
+        return jsonify({'code': 404001, 'message': '词汇书不存在'}), 404
+
+    if book.user_id != current_user.id:
+        return jsonify({'code': 403001, 'message': '无权访问此词汇书'}), 403
+
+    limit = request.args.get('limit', 20, type=int)
+    if not 1 <= limit <= 100:
+        return jsonify({'code': 400001, 'message': 'limit 必须在 1 到 100 之间'}), 400
+
+    try:
+        words = RecommendationService.get_recommended_words(current_user.id, book_id, limit, use_frontier=True)
+    except ValueError:
+        return jsonify({'code': 400001, 'message': '请先完成水平评估'}), 400
+    # 保存前移后的新词推进位置
+    db.session.commit()
+
+    return jsonify({
+        'code': 200,
+        'data': {
+            'words': words
+        }
+    })
+
 @vocabulary_bp.route('/books/<int:book_id>/words', methods=['GET'])
 @token_required
 def get_book_words(current_user, book_id):
@@ -199,15 +368,35 @@ def get_book_words(current_user, book_id):
     per_page = request.args.get('per_page', 20, type=int)
     keyword = request.args.get('keyword', '')
     
-    book = db.session.get(VocabularyBook, book_id)
+    book = VocabularyBook.get_active(book_id)
     if not book:
         return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
         
     if book.user_id != current_user.id:
         return jsonify({'code': 403, 'message': '无权访问此词汇书'}), 403
     
-    # 使用join查询获取单词列表
-    query = db.session.query(Word).join(WordRelation).filter(WordRelation.book_id == book_id)
+    try:
+        fields = parse_fields(Word, request.args)
+    except ValueError as e:
+        return jsonify({'code': 400001, 'message': str(e)}), 400
+    
+    # 单词增删、移动和修改都会改变关联数或 updated_at 最大值
+    word_count, relations_modified, words_modified = db.session.query(
+        db.func.count(WordRelation.id), db.func.max(WordRelation.updated_at), db.func.max(Word.updated_at)
+    ).join(Word, WordRelation.word_id == Word.id).filter(WordRelation.book_id == book_id).one()
+    validators = make_validators(
+        book.updated_at, word_count, relations_modified, words_modified,
+        last_modified=max(filter(None, (book.updated_at, relations_modified, words_modified)), default=None)
+    )
+    response = not_modified(validators)
+    if response:
+        return response
+    
+    # 只查询输出的列，行元组直接转换为字典
+    serializer = RowSerializer.for_model(Word, fields)
+    query = db.session.query(*serializer.columns).join(
+        WordRelation, WordRelation.word_id == Word.id
+    ).filter(WordRelation.book_id == book_id)
     
     # 如果有关键词,添加搜索条件
     if keyword:
@@ -221,28 +410,28 @@ def get_book_words(current_user, book_id):
     # 按order字段排序
     query = query.order_by(WordRelation.order)
     
-    total = query.count()
-    words = query.offset((page - 1) * per_page).limit(per_page).all()
+    total = query.count() if keyword else word_count
+    rows = query.offset((page - 1) * per_page).limit(per_page).all()
     
     # 计算总页数
     pages = (total + per_page - 1) // per_page
     
-    return jsonify({
+    return with_validators(jsonify({
         'code': 200,
         'data': {
-            'items': [word.to_dict() for word in words],
+            'items': serializer.to_dicts(rows),
             'total': total,
             'page': page,
             'per_page': per_page,
             'pages': pages
         }
-    })
+    }), validators)
 
 @vocabulary_bp.route('/books/<int:book_id>/words/<int:word_id>', methods=['GET'])
 @token_required
 def get_word_detail(current_user, book_id, word_id):
     """获取单词详情"""
-    book = db.session.get(VocabularyBook, book_id)
+    book = VocabularyBook.get_active(book_id)
     if not book:
         return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
     
@@ -267,7 +456,7 @@ def get_word_detail(current_user, book_id, word_id):
 def update_word(current_user, book_id, word_id):
     """更新单词"""
     try:
-        book = db.session.get(VocabularyBook, book_id)
+        book = VocabularyBook.get_active(book_id)
         if not book:
             return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
         
@@ -315,7 +504,7 @@ def update_word(current_user, book_id, word_id):
 def delete_word(current_user, book_id, word_id):
     """删除单词"""
     try:
-        book = db.session.get(VocabularyBook, book_id)
+        book = VocabularyBook.get_active(book_id)
         if not book:
             return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
         
@@ -331,8 +520,9 @@ def delete_word(current_user, book_id, word_id):
         if not word_relation:
             return jsonify({'code': 404, 'message': '单词不存在于此词汇书中'}), 404
             
-        # 删除单词关系
+        # 删除单词关系，并更新词书修改时间使缓存失效
         db.session.delete(word_relation)
+        book.updated_at = datetime.utcnow()
         db.session.commit()
         
         return jsonify({
@@ -541,7 +731,7 @@ def create_learning_goal(current_user):
         return jsonify({'code': 400, 'message': '缺少必要参数'}), 400
     
     user = User.query.get(current_user.id)
-    book = VocabularyBook.query.get_or_404(book_id)
+    book = VocabularyBook.get_active_or_404(book_id)
     
     # 检查是否已有相同书的学习目标
     existing_goal = LearningGoal.query.filter_by(
@@ -600,22 +790,22 @@ def update_learning_goal(current_user, goal_id):
 def get_learning_goals(current_user):
     """获取学习目标列表"""
     goals = LearningGoal.query.filter_by(user_id=current_user.id).all()
+    # 所有目标的进度一次批量计算，保存首次读取时生成的进度行
+    progress = ProgressService.resolve(current_user.id, goals)
+    db.session.commit()
     
     return jsonify({
         'code': 200,
         'data': [{
             'id': goal.id,
             'book_id': goal.book_id,
-            'book_name': goal.book.name,
-            'daily_words': goal.daily_words,
+            'book_name': progress[goal.book_id]['book_name'],
+            'daily_words': goal.daily_word_count,
             'target_date': goal.target_date.isoformat(),
             'status': goal.status,
             'progress': {
-                'total_words': goal.book.total_words,
-                'learned_words': LearningRecord.query.filter_by(
-                    user_id=current_user.id,
-                    status='mastered'
-                ).join(Word).filter(Word.book_id == goal.book_id).count()
+                'total_words': progress[goal.book_id]['total_words'],
+                'learned_words': progress[goal.book_id]['mastered_words']
             }
         } for goal in goals]
     })
@@ -731,31 +921,28 @@ def get_word_relations(current_user, word_id):
 @token_required
 def get_learning_progress(current_user, book_id):
     """获取词汇书学习进度"""
-    book = VocabularyBook.query.get_or_404(book_id)
+    book = VocabularyBook.get_active_or_404(book_id)
     
     if book.user_id != current_user.id:
         return jsonify({'code': 403001, 'message': '无权访问此词汇书'}), 403
 
-    # 获取词汇书中的所有单词ID
-    word_ids = db.session.query(WordRelation.word_id).filter_by(book_id=book_id).all()
-    word_ids = [w[0] for w in word_ids]
+    # 获取词汇书单词总数
+    total_words = WordRelation.query.filter_by(book_id=book_id).count()
     
-    # 获取学习记录
-    records = LearningRecord.query.filter(
-        LearningRecord.user_id == current_user.id,
-        LearningRecord.book_id == book_id,
-        LearningRecord.word_id.in_(word_ids)
-    ).all()
-
-    # 统计不同状态的单词数量
+    # 统计不同状态的单词数量，保存首次读取时生成的进度行
+    progress = ProgressService.get_progress(current_user.id, book_id)
+    db.session.commit()
     status_counts = {
-        'new': len(word_ids) - len(records),
-        'learning': len([r for r in records if r.status == 'learning']),
-        'mastered': len([r for r in records if r.status == 'mastered'])
+        'new': progress.new_count(total_words),
+        'learning': progress.learning_count,
+        'mastered': progress.mastered_count
     }
 
     # 计算总学习时长（秒）
-    total_study_time = sum(r.study_time for r in records)
+    total_study_time = db.session.query(db.func.sum(LearningRecord.study_time)).filter(
+        LearningRecord.user_id == current_user.id,
+        LearningRecord.book_id == book_id
+    ).scalar() or 0
 
     # 获取今日学习的单词数
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -784,7 +971,7 @@ def get_learning_progress(current_user, book_id):
     return jsonify({
         'code': 200,
         'data': {
-            'total_words': len(word_ids),
+            'total_words': total_words,
             'learning_words': status_counts['learning'],
             'mastered_words': status_counts['mastered'],
             'new_words': status_counts['new'],
@@ -798,7 +985,7 @@ def get_learning_progress(current_user, book_id):
 @token_required
 def batch_delete_words(current_user, book_id):
     """批量删除单词"""
-    book = VocabularyBook.query.get_or_404(book_id)
+    book = VocabularyBook.get_active_or_404(book_id)
     
     if book.user_id != current_user.id:
         return jsonify({'code': 403001, 'message': '无权访问此词汇书'}), 403
@@ -812,6 +999,8 @@ def batch_delete_words(current_user, book_id):
         WordRelation.book_id == book_id,
         WordRelation.word_id.in_(data['word_ids'])
     ).delete(synchronize_session=False)
+    CoverageService.invalidate_book(book_id)
+    book.updated_at = datetime.utcnow()
     
     db.session.commit()
     
@@ -824,7 +1013,7 @@ def batch_delete_words(current_user, book_id):
 @token_required
 def reorder_words(current_user, book_id):
     """重新排序单词"""
-    book = db.session.get(VocabularyBook, book_id)
+    book = VocabularyBook.get_active(book_id)
     if not book:
         return jsonify({'code': 404, 'message': '词汇书不存在'}), 404
         
@@ -849,8 +1038,10 @@ def reorder_words(current_user, book_id):
     # 更新单词顺序
     word_relation_dict = {relation.word_id: relation for relation in word_relations}
     for i, word_id in enumerate(word_ids):
-        word_relation_dict[word_id].order = i + 1
+        word_relation_dict[word_id].order = (i + 1) * WordRelation.ORDER_GAP
     
+    # 顺序变化后原有的新词推进位置失效
+    LearningFrontier.reset_for_book(book_id)
     db.session.commit()
     
     return jsonify({
@@ -858,11 +1049,36 @@ def reorder_words(current_user, book_id):
         'message': '单词顺序更新成功'
     })
 
+@vocabulary_bp.route('/books/<int:book_id>/words/<int:word_id>/move', methods=['PUT'])
+@token_required
+def move_word(current_user, book_id, word_id):
+    """移动单词到另一个单词之后，after_word_id 为空时移到开头"""
+    book = VocabularyBook.get_active(book_id)
+    if not book:
+        return jsonify({'code': 404001, 'message': '词汇书不存在'}), 404
+        
+    if book.user_id != current_user.id:
+        return jsonify({'code': 403001, 'message': '无权修改此词汇书'}), 403
+    
+    data = request.get_json() or {}
+    try:
+        order = OrderingService.move(book_id, word_id, data.get('after_word_id'))
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'code': 400001, 'message': str(e)}), 400
+    db.session.commit()
+    
+    return jsonify({
+        'code': 200,
+        'message': '单词顺序更新成功',
+        'data': {'word_id': word_id, 'order': order}
+    })
+
 @vocabulary_bp.route('/books/<int:book_id>/statistics', methods=['GET'])
 @token_required
 def get_book_statistics(current_user, book_id):
     """获取词汇书统计信息"""
-    book = VocabularyBook.query.get_or_404(book_id)
+    book = VocabularyBook.get_active_or_404(book_id)
     
     if book.user_id != current_user.id:
         return jsonify({'code': 403001, 'message': '无权访问此词汇书'}), 403
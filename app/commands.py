@@ -0,0 +1,129 @@
+import click
+from flask.cli import AppGroup
+
+progress_cli = AppGroup('progress', help='学习进度计数维护')
+words_cli = AppGroup('words', help='单词数据维护')
+purge_cli = AppGroup('purge', help='分批删除大量数据')
+
+@progress_cli.command('rebuild')
+@click.option('--user-id', type=int, default=None, help='只重建指定用户')
+def rebuild_progress(user_id):
+    """由学习记录重建用户词书进度计数"""
+    from app.services.progress_service import ProgressService
+
+    count = ProgressService.rebuild(user_id)
+    click.echo(f'已重建 {count} 条进度记录')
+
+@words_cli.command('import')
+@click.argument('book_id', type=int)
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None, help='文件格式，默认按扩展名判断')
+@click.option('--chunk-size', type=int, default=1000, help='每批处理的行数')
+def import_words(book_id, path, fmt, chunk_size):
+    """从 CSV 或 JSONL 文件批量导入单词到词书"""
+    from app.services.import_service import ImportService, ImportAborted
+
+    fmt = fmt or path.rsplit('.', 1)[-1].lower()
+
+    def report(stats):
+        click.echo(f"已处理 {stats['processed']} 行，新建 {stats['created']}，加入 {stats['added']}，跳过 {stats['skipped']}")
+
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        try:
+            stats = ImportService.import_words(book_id, ImportService.iter_rows(f, fmt), chunk_size, report)
+        except ImportAborted as e:
+            raise click.ClickException(f"{e}（导入不是原子的，前 {e.stats['processed']} 行已提交，加入 {e.stats['added']} 个单词）")
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    click.echo(f"导入完成：加入 {stats['added']} 个单词")
+
+@words_cli.command('rebalance')
+@click.option('--book-id', type=int, default=None, help='只重新编号指定词书')
+def rebalance_words(book_id):
+    """把词书单词顺序重新编号为等间隔的顺序值"""
+    from app import db
+    from app.models.vocabulary import VocabularyBook
+    from app.services.ordering_service import OrderingService
+
+    book_ids = [book_id] if book_id else [row.id for row in db.session.query(VocabularyBook.id)]
+    for current_id in book_ids:
+        OrderingService.rebalance(current_id)
+        db.session.commit()
+    click.echo(f'已重新编号 {len(book_ids)} 本词书')
+
+@words_cli.command('dedupe')
+def dedupe_words():
+    """合并规范化文本相同的重复单词"""
+    from app.services.word_service import WordService
+
+    stats = WordService.dedupe()
+    click.echo(f"已合并 {stats['merged']} 个重复单词，删除 {stats['relations']} 条词书关联、{stats['records']} 条学习记录")
+
+@purge_cli.command('book')
+@click.argument('book_id', type=int)
+@click.option('--chunk-size', type=int, default=None, help='每批删除的行数')
+def purge_book(book_id, chunk_size):
+    """分批删除词书及其关联数据"""
+    from app.services.deletion_service import DeletionService
+
+    DeletionService.purge_book(book_id, chunk_size)
+    click.echo(f'已删除词书 {book_id}')
+
+@purge_cli.command('pending')
+@click.option('--chunk-size', type=int, default=None, help='每批删除的行数')
+def purge_pending(chunk_size):
+    """继续删除已标记删除但未完成的词书，用于进程中途退出后恢复"""
+    from app.services.deletion_service import DeletionService
+
+    book_ids = DeletionService.pending_books()
+    for book_id in book_ids:
+        DeletionService.purge_book(book_id, chunk_size)
+        click.echo(f'已删除词书 {book_id}')
+    click.echo(f'共删除 {len(book_ids)} 本词书')
+
+@purge_cli.command('user')
+@click.argument('user_id', type=int)
+@click.option('--chunk-size', type=int, default=None, help='每批删除的行数')
+def purge_user(user_id, chunk_size):
+    """分批删除用户及其全部数据"""
+    from app.services.deletion_service import DeletionService
+
+    DeletionService.purge_user(user_id, chunk_size)
+    click.echo(f'已删除用户 {user_id}')
+
+@click.command('seed')
+@click.option('--seed', 'seed_value', type=int, default=42, help='随机种子，相同种子生成相同数据')
+@click.option('--users', type=int, default=100, help='用户数')
+@click.option('--books', type=int, default=10, help='词书数')
+@click.option('--min-words', type=int, default=1000, help='每本词书最少单词数')
+@click.option('--max-words', type=int, default=50000, help='每本词书最多单词数')
+@click.option('--records', type=int, default=1000000, help='学习记录总数')
+@click.option('--tests', type=int, default=2, help='每个用户的测试数')
+@click.option('--questions', type=int, default=20, help='每个测试的题目数')
+@click.option('--prefix', default='seed', help='用户名和词书名前缀')
+@click.option('--chunk-size', type=int, default=10000, help='每批插入的行数')
+def seed_data(seed_value, users, books, min_words, max_words, records, tests, questions, prefix, chunk_size):
+    """生成压测和基准测试用的合成数据"""
+    import time
+    from app.services.seed_service import SeedService
+
+    def report(table, count):
+        if count % (chunk_size * 10) == 0:
+            click.echo(f'{table}: {count}')
+
+    start = time.perf_counter()
+    try:
+        stats = SeedService.seed(seed_value, users, books, min_words, max_words, records, tests, questions,
+                                 prefix, chunk_size, on_progress=report)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    for table, count in stats.items():
+        click.echo(f'{table}: {count}')
+    click.echo(f'生成完成，用时 {time.perf_counter() - start:.1f} 秒')
+
+def register_commands(app):
+    """注册命令行命令"""
+    app.cli.add_command(progress_cli)
+    app.cli.add_command(words_cli)
+    app.cli.add_command(purge_cli)
+    app.cli.add_command(seed_data)
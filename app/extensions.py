@@ -1,7 +1,17 @@
+import sqlite3
+from sqlalchemy import event
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask import jsonify
+from app.utils.compression import Compressor
+from app.utils.kv_cache import KVCache
+from app.utils.load_shedding import LoadShedder
+from app.utils.rate_limit import RateLimiter
+from app.utils.token_blocklist import TokenBlocklist
+from app.utils.query_stats import QueryProfiler
+from app.utils.metrics import Metrics
+from app.utils.slow_query import SlowQueryLog
 
 db = SQLAlchemy(
     session_options={
@@ -11,6 +21,14 @@ db = SQLAlchemy(
 )
 migrate = Migrate()
 jwt = JWTManager()
+compressor = Compressor()
+kv_cache = KVCache()
+load_shedder = LoadShedder()
+rate_limiter = RateLimiter()
+token_blocklist = TokenBlocklist()
+query_profiler = QueryProfiler()
+metrics = Metrics()
+slow_query_log = SlowQueryLog()
 
 # 配置 JWT 错误处理
 @jwt.invalid_token_loader
@@ -29,6 +47,19 @@ def expired_token_callback(jwt_header, jwt_payload):
         'message': '令牌已过期'
     }), 401
 
+@jwt.token_in_blocklist_loader
+def check_if_token_revoked(jwt_header, jwt_payload):
+    """检查令牌是否已撤销"""
+    return token_blocklist.is_revoked(jwt_payload)
+
+@jwt.revoked_token_loader
+def revoked_token_callback(jwt_header, jwt_payload):
+    """处理已撤销的token"""
+    return jsonify({
+        'code': 401004,
+        'message': '令牌已撤销'
+    }), 401
+
 @jwt.unauthorized_loader
 def unauthorized_callback(error_string):
     """处理未授权的请求"""
@@ -37,8 +68,28 @@ def unauthorized_callback(error_string):
         'message': '缺少认证头'
     }), 401
 
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite 默认不检查外键，开启后 ON DELETE CASCADE 才会生效"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
 def init_extensions(app):
     """初始化Flask扩展"""
+    # 请求耗时从第一个 before_request 开始计算，包括过载和限流拒绝的请求
+    metrics.init_app(app, db)
+    # 先于 db 初始化，以便替换连接池类；过载检查先于限流执行
+    load_shedder.init_app(app)
     db.init_app(app)
+    query_profiler.init_app(app, db)
+    slow_query_log.init_app(app, db)
+    if app.config.get('SQLITE_FOREIGN_KEYS'):
+        with app.app_context():
+            event.listen(db.engine, 'connect', _enable_sqlite_foreign_keys)
     migrate.init_app(app, db)
-    jwt.init_app(app) 
\ No newline at end of file
+    jwt.init_app(app)
+    compressor.init_app(app)
+    kv_cache.init_app(app)
+    token_blocklist.init_app(app)
+    rate_limiter.init_app(app)
@@ -4,10 +4,12 @@ from app.extensions import db
 from .user import User
 from .vocabulary import VocabularyBook, WordRelation
 from .word import Word
+from .word_bitset import WordBitset
 
 # 导入学习相关模型
-from .learning import LearningRecord, LearningGoal
+from .learning import LearningRecord, LearningGoal, LearningFrontier
 from .learning_plan import LearningPlan
+from .user_book_progress import UserBookProgress
 from .assessment import AssessmentQuestion
 
 # 导入测试相关模型
@@ -19,9 +21,12 @@ __all__ = [
     'VocabularyBook',
     'WordRelation',
     'Word',
+    'WordBitset',
     'LearningRecord',
     'LearningGoal',
+    'LearningFrontier',
     'LearningPlan',
+    'UserBookProgress',
     'AssessmentQuestion',
     'TestQuestion'
 ]
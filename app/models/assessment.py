@@ -8,8 +8,8 @@ class UserLevelAssessment(db.Model):
     __tablename__ = 'user_level_assessments'
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id', ondelete='CASCADE'), nullable=False)
     level = db.Column(db.String(20), nullable=False)  # beginner, intermediate, advanced
     status = db.Column(db.String(20), default='in_progress')  # in_progress, completed
     level_score = db.Column(db.Float)  # 评估得分
@@ -24,7 +24,7 @@ class UserLevelAssessment(db.Model):
     # 关系
     user = db.relationship('User', back_populates='level_assessments')
     book = db.relationship('VocabularyBook', back_populates='level_assessments')
-    questions = db.relationship('AssessmentQuestion', back_populates='assessment')
+    questions = db.relationship('AssessmentQuestion', back_populates='assessment', passive_deletes='all')
 
     def __init__(self, user_id=None, book_id=None, level='beginner', status='in_progress',
                  level_score=None, score=None, total_questions=None, correct_answers=None, assessment_date=None):
@@ -43,7 +43,7 @@ class AssessmentQuestion(db.Model):
     __tablename__ = 'assessment_questions'
 
     id = db.Column(db.Integer, primary_key=True)
-    assessment_id = db.Column(db.Integer, db.ForeignKey('user_level_assessments.id'), nullable=False)
+    assessment_id = db.Column(db.Integer, db.ForeignKey('user_level_assessments.id', ondelete='CASCADE'), nullable=False)
     word_id = db.Column(db.Integer, db.ForeignKey('words.id'), nullable=False)
     question_type = db.Column(db.String(50), nullable=False)  # multiple_choice, translation, etc.
     options = db.Column(db.JSON)  # For multiple choice questions
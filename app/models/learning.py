@@ -10,8 +10,8 @@ class LearningGoal(db.Model):
     __table_args__ = {'extend_existing': True}
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id', ondelete='CASCADE'), nullable=False)
     daily_word_count = db.Column(db.Integer, nullable=False)  # 每日目标单词数
     target_date = db.Column(db.DateTime, nullable=False)  # 目标完成日期
     status = db.Column(db.String(20), default='active')  # active, completed, paused
@@ -48,7 +48,7 @@ class ReviewPlan(db.Model):
     __table_args__ = {'extend_existing': True}
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     word_id = db.Column(db.Integer, db.ForeignKey('words.id'), nullable=False)
     next_review_time = db.Column(db.DateTime, nullable=False)
     review_count = db.Column(db.Integer, default=0)
@@ -78,4 +78,48 @@ class ReviewPlan(db.Model):
             'status': self.status,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
-        } 
\ No newline at end of file
+        }
+
+class LearningFrontier(db.Model):
+    """新词推进位置（每个用户、每本词书一条）
+
+    last_order 之前（含）的单词均已有学习记录，推荐新词时可直接从该位置向后做索引范围扫描。
+    """
+    __tablename__ = 'learning_frontiers'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'book_id', name='uq_learning_frontiers_user_book'),
+        {'extend_existing': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id', ondelete='CASCADE'), nullable=False)
+    last_order = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, user_id=None, book_id=None, last_order=0):
+        self.user_id = user_id
+        self.book_id = book_id
+        self.last_order = last_order
+
+    @classmethod
+    def reset_for_book(cls, book_id):
+        """词书顺序或学习记录变化后清除推进位置"""
+        cls.query.filter_by(book_id=book_id).delete(synchronize_session=False)
+
+    @classmethod
+    def reset_for_user(cls, user_id):
+        """用户的学习记录删除后清除推进位置"""
+        cls.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+
+    def to_dict(self):
+        """转换为字典格式"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'book_id': self.book_id,
+            'last_order': self.last_order,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
@@ -7,8 +7,8 @@ class LearningPlan(db.Model):
     __table_args__ = {'extend_existing': True}
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id', ondelete='CASCADE'), nullable=False)
     daily_words = db.Column(db.Integer, nullable=False)
     start_date = db.Column(db.Date, nullable=False)  # 添加开始日期
     end_date = db.Column(db.Date)  # 添加结束日期
@@ -56,14 +56,10 @@ class LearningPlan(db.Model):
 
     def calculate_progress(self):
         """计算学习进度"""
-        from app.models.learning import LearningRecord
+        from app.services.progress_service import ProgressService
         
         # 获取已掌握的单词数
-        mastered_count = LearningRecord.query.filter_by(
-            user_id=self.user_id,
-            book_id=self.book_id,
-            status='mastered'
-        ).count()
+        mastered_count = ProgressService.get_progress(self.user_id, self.book_id).mastered_count
         
         # 获取词书总单词数
         total_words = self.book.total_words or 0
@@ -75,19 +71,10 @@ class LearningPlan(db.Model):
 
     def get_daily_progress(self):
         """获取今日学习进度"""
-        from app.models.learning import LearningRecord
-        from datetime import datetime, timedelta
-        
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
+        from app.services.progress_service import ProgressService
         
         # 获取今日学习的单词数
-        today_learned = LearningRecord.query.filter(
-            LearningRecord.user_id == self.user_id,
-            LearningRecord.book_id == self.book_id,
-            LearningRecord.created_at >= today_start,
-            LearningRecord.created_at < today_end
-        ).count()
+        today_learned = ProgressService.get_progress(self.user_id, self.book_id).today_learned
         
         return {
             'target': self.daily_words,
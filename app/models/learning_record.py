@@ -2,14 +2,20 @@ from app import db
 from datetime import datetime, timedelta
 from sqlalchemy import func
 
+# 根据艾宾浩斯遗忘曲线设置的复习间隔(天)，完成全部间隔的复习后视为掌握
+REVIEW_INTERVALS = [1, 2, 4, 7, 15, 30, 60]
+
 class LearningRecord(db.Model):
     """学习记录模型"""
     __tablename__ = 'learning_records'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        db.Index('ix_learning_records_user_word', 'user_id', 'word_id'),
+        {'extend_existing': True}
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id', ondelete='CASCADE'), nullable=False)
     word_id = db.Column(db.Integer, db.ForeignKey('words.id'), nullable=False)
     status = db.Column(db.String(20), nullable=False, default='learning')  # learning, mastered, reviewing
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -97,6 +103,12 @@ class LearningRecord(db.Model):
         self.updated_at = datetime.utcnow()
         self.mastery_level = 0.0
 
+    # 行序列化器输出的字段，与 to_dict 一致
+    SERIALIZE_FIELDS = ('id', 'user_id', 'book_id', 'word_id', 'status', 'created_at', 'updated_at',
+                        'last_review_time', 'next_review_time', 'review_count', 'mastery_level')
+    # 精简视图（?view=lean）输出的字段
+    LEAN_FIELDS = ('id', 'word_id', 'status', 'next_review_time', 'mastery_level')
+
     def to_dict(self):
         """转换为字典"""
         return {
@@ -7,8 +7,8 @@ class Test(db.Model):
     __table_args__ = {'extend_existing': True}
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id', ondelete='CASCADE'), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     test_type = db.Column(db.String(20))  # 测试类型
@@ -27,8 +27,8 @@ class Test(db.Model):
     # 关系
     user = db.relationship('User', back_populates='tests')
     book = db.relationship('app.models.vocabulary.VocabularyBook', back_populates='tests')
-    questions = db.relationship('TestQuestion', back_populates='test', cascade='all, delete-orphan')
-    test_records = db.relationship('TestRecord', back_populates='test', cascade='all, delete-orphan')
+    questions = db.relationship('TestQuestion', back_populates='test', cascade='all, delete-orphan', passive_deletes=True)
+    test_records = db.relationship('TestRecord', back_populates='test', cascade='all, delete-orphan', passive_deletes=True)
 
     def __init__(self, user_id=None, book_id=None, name=None, description=None, test_type=None, duration=None, total_questions=None, pass_score=None):
         self.user_id = user_id
@@ -41,6 +41,13 @@ class Test(db.Model):
         self.pass_score = pass_score
         self.score = None
 
+    # 行序列化器输出的字段，与 to_dict 一致
+    SERIALIZE_FIELDS = ('id', 'user_id', 'book_id', 'name', 'description', 'test_type', 'duration',
+                        'total_questions', 'pass_score', 'score', 'status', 'start_time', 'end_time',
+                        'completed_at', 'created_at', 'updated_at')
+    # 精简视图（?view=lean）输出的字段
+    LEAN_FIELDS = ('id', 'name', 'test_type', 'status', 'total_questions', 'score')
+
     def to_dict(self, with_questions=False):
         """转换为字典格式"""
         data = {
@@ -71,7 +78,7 @@ class TestQuestion(db.Model):
     __table_args__ = {'extend_existing': True}
 
     id = db.Column(db.Integer, primary_key=True)
-    test_id = db.Column(db.Integer, db.ForeignKey('tests.id'), nullable=False)
+    test_id = db.Column(db.Integer, db.ForeignKey('tests.id', ondelete='CASCADE'), nullable=False)
     word_id = db.Column(db.Integer, db.ForeignKey('words.id'), nullable=False)
     question_type = db.Column(db.String(20), nullable=False)  # choice, fill, etc.
     question = db.Column(db.Text, nullable=False)
@@ -86,7 +93,7 @@ class TestQuestion(db.Model):
     # 关系
     test = db.relationship('Test', back_populates='questions')
     word = db.relationship('app.models.word.Word', back_populates='test_questions')
-    answers = db.relationship('TestAnswer', back_populates='question', cascade='all, delete-orphan')
+    answers = db.relationship('TestAnswer', back_populates='question', cascade='all, delete-orphan', passive_deletes=True)
 
     def __init__(self, test_id=None, word_id=None, question_type=None, question=None, options=None, correct_answer=None, score=None):
         self.test_id = test_id
@@ -99,6 +106,12 @@ class TestQuestion(db.Model):
         self.is_correct = False
         self.user_answer = None
 
+    # 行序列化器输出的字段，与 to_dict 一致
+    SERIALIZE_FIELDS = ('id', 'test_id', 'word_id', 'question_type', 'question', 'options', 'score',
+                        'created_at', 'updated_at', 'correct_answer')
+    # 精简视图（?view=lean）输出的字段
+    LEAN_FIELDS = ('id', 'word_id', 'question_type', 'question', 'options')
+
     def to_dict(self, include_answer=True):
         """转换为字典格式"""
         data = {
@@ -122,8 +135,8 @@ class TestRecord(db.Model):
     __table_args__ = {'extend_existing': True}
 
     id = db.Column(db.Integer, primary_key=True)
-    test_id = db.Column(db.Integer, db.ForeignKey('tests.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    test_id = db.Column(db.Integer, db.ForeignKey('tests.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime)
     score = db.Column(db.Integer)
@@ -135,7 +148,7 @@ class TestRecord(db.Model):
     # 关系
     test = db.relationship('Test', back_populates='test_records')
     user = db.relationship('User', back_populates='test_records')
-    answers = db.relationship('TestAnswer', back_populates='record', cascade='all, delete-orphan')
+    answers = db.relationship('TestAnswer', back_populates='record', cascade='all, delete-orphan', passive_deletes=True)
 
     def __init__(self, test_id=None, user_id=None, start_time=None, end_time=None, score=None, status=None, correct_count=None):
         self.test_id = test_id
@@ -146,6 +159,10 @@ class TestRecord(db.Model):
         self.status = status or 'in_progress'
         self.correct_count = correct_count or 0
 
+    # 行序列化器输出的字段，与 to_dict 一致
+    SERIALIZE_FIELDS = ('id', 'test_id', 'user_id', 'start_time', 'end_time', 'score', 'correct_count',
+                        'status', 'created_at', 'updated_at')
+
     def to_dict(self):
         """转换为字典格式"""
         return {
@@ -167,8 +184,8 @@ class TestAnswer(db.Model):
     __table_args__ = {'extend_existing': True}
 
     id = db.Column(db.Integer, primary_key=True)
-    record_id = db.Column(db.Integer, db.ForeignKey('test_records.id'), nullable=False)
-    question_id = db.Column(db.Integer, db.ForeignKey('test_questions.id'), nullable=False)
+    record_id = db.Column(db.Integer, db.ForeignKey('test_records.id', ondelete='CASCADE'), nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey('test_questions.id', ondelete='CASCADE'), nullable=False)
     answer = db.Column(db.String(200), nullable=False)
     is_correct = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,6 +1,6 @@
 from app.extensions import db
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_service import PasswordService
 
 class User(db.Model):
     """用户"""
@@ -19,25 +19,25 @@ class User(db.Model):
     last_login = db.Column(db.DateTime)
     
     # 关系
-    vocabulary_books = db.relationship('VocabularyBook', back_populates='user', cascade='all, delete-orphan')
-    learning_records = db.relationship('LearningRecord', back_populates='user', cascade='all, delete-orphan')
-    learning_goals = db.relationship('LearningGoal', back_populates='user', cascade='all, delete-orphan')
-    learning_plans = db.relationship('app.models.learning_plan.LearningPlan', back_populates='user')
-    review_plans = db.relationship('app.models.learning.ReviewPlan', back_populates='user')
-    level_assessments = db.relationship('app.models.assessment.UserLevelAssessment', back_populates='user')
-    tests = db.relationship('app.models.test.Test', back_populates='user')
-    test_records = db.relationship('app.models.test.TestRecord', back_populates='user', cascade='all, delete-orphan')
+    vocabulary_books = db.relationship('VocabularyBook', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    learning_records = db.relationship('LearningRecord', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    learning_goals = db.relationship('LearningGoal', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    learning_plans = db.relationship('app.models.learning_plan.LearningPlan', back_populates='user', passive_deletes='all')
+    review_plans = db.relationship('app.models.learning.ReviewPlan', back_populates='user', passive_deletes='all')
+    level_assessments = db.relationship('app.models.assessment.UserLevelAssessment', back_populates='user', passive_deletes='all')
+    tests = db.relationship('app.models.test.Test', back_populates='user', passive_deletes='all')
+    test_records = db.relationship('app.models.test.TestRecord', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
     
     def __repr__(self):
         return f'<User {self.username}>'
     
     def set_password(self, password):
         """设置密码"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = PasswordService.hash(password)
     
     def check_password(self, password):
         """验证密码"""
-        return check_password_hash(self.password_hash, password)
+        return PasswordService.verify(self.password_hash, password)
 
     def update_last_login(self):
         """更新最后登录时间"""
@@ -0,0 +1,71 @@
+from app.extensions import db
+from datetime import datetime
+
+class UserBookProgress(db.Model):
+    """用户词书学习进度计数
+
+    由学习记录的状态变化增量维护，计划和进度接口直接读取这一行。
+    学习记录按自身的 book_id 计入，不按单词是否属于词书计入。
+    """
+    __tablename__ = 'user_book_progress'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'book_id', name='uq_user_book_progress_user_book'),
+        {'extend_existing': True}
+    )
+
+    STATUSES = ('learning', 'mastered', 'reviewing')
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id', ondelete='CASCADE'), nullable=False)
+    learning_count = db.Column(db.Integer, nullable=False, default=0)
+    mastered_count = db.Column(db.Integer, nullable=False, default=0)
+    reviewing_count = db.Column(db.Integer, nullable=False, default=0)
+    last_studied_at = db.Column(db.DateTime)
+    today_date = db.Column(db.Date)  # today_count 对应的日期
+    today_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, user_id=None, book_id=None, learning_count=0, mastered_count=0, reviewing_count=0,
+                 last_studied_at=None, today_date=None, today_count=0):
+        self.user_id = user_id
+        self.book_id = book_id
+        self.learning_count = learning_count
+        self.mastered_count = mastered_count
+        self.reviewing_count = reviewing_count
+        self.last_studied_at = last_studied_at
+        self.today_date = today_date
+        self.today_count = today_count
+
+    @property
+    def studied_count(self):
+        """已有学习记录的单词数"""
+        return self.learning_count + self.mastered_count + self.reviewing_count
+
+    @property
+    def today_learned(self):
+        """今日新学单词数，跨天后自动归零"""
+        if self.today_date != datetime.utcnow().date():
+            return 0
+        return self.today_count
+
+    def new_count(self, total_words):
+        """词书中尚未学习的单词数"""
+        return max((total_words or 0) - self.studied_count, 0)
+
+    def to_dict(self, total_words=None):
+        """转换为字典格式"""
+        data = {
+            'user_id': self.user_id,
+            'book_id': self.book_id,
+            'learning_words': self.learning_count,
+            'mastered_words': self.mastered_count,
+            'reviewing_words': self.reviewing_count,
+            'today_learned_count': self.today_learned,
+            'last_studied_at': self.last_studied_at.isoformat() if self.last_studied_at else None
+        }
+        if total_words is not None:
+            data['total_words'] = total_words
+            data['new_words'] = self.new_count(total_words)
+        return data
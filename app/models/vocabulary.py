@@ -1,3 +1,4 @@
+from flask import abort
 from app.extensions import db
 from datetime import datetime, timedelta
 import uuid
@@ -16,25 +17,26 @@ class VocabularyBook(db.Model):
     description = db.Column(db.Text)
     level = db.Column(db.String(20))  # beginner, intermediate, advanced
     total_words = db.Column(db.Integer, default=0)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     tags = db.Column(db.String(200))  # 标签，用逗号分隔
+    deleted_at = db.Column(db.DateTime, index=True)  # 正在后台分批删除，列表和详情中不再显示
 
     # 关联关系
     user = db.relationship('User', back_populates='vocabulary_books')
-    word_relations = db.relationship('WordRelation', back_populates='book', cascade='all, delete-orphan')
-    learning_records = db.relationship('LearningRecord', back_populates='book', cascade='all, delete-orphan')
-    learning_plans = db.relationship('LearningPlan', back_populates='book', cascade='all, delete-orphan')
-    learning_goals = db.relationship('LearningGoal', back_populates='book', cascade='all, delete-orphan')
+    word_relations = db.relationship('WordRelation', back_populates='book', cascade='all, delete-orphan', passive_deletes=True)
+    learning_records = db.relationship('LearningRecord', back_populates='book', cascade='all, delete-orphan', passive_deletes=True)
+    learning_plans = db.relationship('LearningPlan', back_populates='book', cascade='all, delete-orphan', passive_deletes=True)
+    learning_goals = db.relationship('LearningGoal', back_populates='book', cascade='all, delete-orphan', passive_deletes=True)
     words = db.relationship(
         'app.models.word.Word',
         secondary='word_relations',
         back_populates='books',
         viewonly=True
     )
-    tests = db.relationship('app.models.test.Test', back_populates='book', lazy='dynamic')
-    level_assessments = db.relationship('app.models.assessment.UserLevelAssessment', back_populates='book')
+    tests = db.relationship('app.models.test.Test', back_populates='book', lazy='dynamic', passive_deletes='all')
+    level_assessments = db.relationship('app.models.assessment.UserLevelAssessment', back_populates='book', passive_deletes='all')
 
     def __init__(self, name=None, description=None, level=None, user_id=None, tags=None, total_words=0):
         self.name = name
@@ -44,8 +46,22 @@ class VocabularyBook(db.Model):
         self.tags = ','.join(tags) if tags else None
         self.total_words = total_words
 
-    def to_dict(self):
-        """转换为字典格式"""
+    @classmethod
+    def get_active(cls, book_id):
+        """按ID获取词书，不存在或正在删除时返回 None"""
+        book = db.session.get(cls, book_id)
+        return book if book is not None and book.deleted_at is None else None
+
+    @classmethod
+    def get_active_or_404(cls, book_id):
+        """按ID获取词书，不存在或正在删除时返回 404"""
+        book = cls.get_active(book_id)
+        if book is None:
+            abort(404)
+        return book
+
+    def to_dict(self, word_count=None):
+        """转换为字典格式，已知单词数时可直接传入，避免加载全部单词"""
         return {
             'id': self.id,
             'name': self.name,
@@ -53,7 +69,7 @@ class VocabularyBook(db.Model):
             'level': self.level,
             'user_id': self.user_id,
             'tags': self.tags.split(',') if self.tags else [],
-            'word_count': len(self.words),
+            'word_count': len(self.words) if word_count is None else word_count,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -61,12 +77,15 @@ class VocabularyBook(db.Model):
 class WordRelation(db.Model):
     """单词与词汇书的关联"""
     __tablename__ = 'word_relations'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        db.Index('ix_word_relations_book_order', 'book_id', 'order'),
+        {'extend_existing': True}
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     word_id = db.Column(db.Integer, db.ForeignKey('words.id'), nullable=False)
-    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id'), nullable=False)
-    order = db.Column(db.Integer)  # 在词汇书中的顺序
+    book_id = db.Column(db.Integer, db.ForeignKey('vocabulary_books.id', ondelete='CASCADE'), nullable=False)
+    order = db.Column(db.Integer)  # 在词汇书中的顺序，相邻单词间留有间隔
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -74,6 +93,9 @@ class WordRelation(db.Model):
     word = db.relationship('app.models.word.Word', back_populates='word_relations')
     book = db.relationship('VocabularyBook', back_populates='word_relations')
 
+    # 新分配的顺序值之间的间隔，移动单词时取前后两个值的中点
+    ORDER_GAP = 1024
+
     def __init__(self, word_id=None, book_id=None, order=None):
         self.word_id = word_id
         self.book_id = book_id
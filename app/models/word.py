@@ -1,13 +1,18 @@
+import unicodedata
 from app import db
 from datetime import datetime
 
 class Word(db.Model):
     """单词模型"""
     __tablename__ = 'words'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        db.Index('ix_words_text_key', 'text_key', unique=True),
+        {'extend_existing': True}
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.String(100), nullable=False)
+    text_key = db.Column(db.String(100))  # 规范化后的文本，用于唯一查找
     phonetic = db.Column(db.String(100))
     audio_url = db.Column(db.String(200))  # 发音音频URL
     definition = db.Column(db.Text, nullable=False)
@@ -31,6 +36,7 @@ class Word(db.Model):
 
     def __init__(self, text, definition, book_id=None, phonetic=None, example=None, difficulty_level=1.0):
         self.text = text
+        self.text_key = Word.normalize(text)
         self.definition = definition
         self.phonetic = phonetic
         self.example = example
@@ -41,6 +47,19 @@ class Word(db.Model):
             relation = WordRelation(word_id=self.id, book_id=book_id)
             db.session.add(relation)
 
+    @staticmethod
+    def normalize(text):
+        """规范化单词文本：Unicode NFKC、大小写折叠、合并空白"""
+        if text is None:
+            return None
+        return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+    # 行序列化器输出的字段，与 to_dict 一致
+    SERIALIZE_FIELDS = ('id', 'text', 'phonetic', 'definition', 'example', 'difficulty_level',
+                        'created_at', 'updated_at')
+    # 精简视图（?view=lean）输出的字段
+    LEAN_FIELDS = ('id', 'text', 'phonetic', 'difficulty_level')
+
     def to_dict(self):
         """转换为字典"""
         return {
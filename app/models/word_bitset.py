@@ -0,0 +1,58 @@
+from app.extensions import db
+from datetime import datetime
+
+class WordBitset(db.Model):
+    """单词ID位图
+
+    kind 为 mastered 时 owner_id 是用户ID，记录该用户已掌握的单词；
+    kind 为 book 时 owner_id 是词书ID，记录词书包含的单词。
+    第 n 位为 1 表示 ID 为 n 的单词在集合中，按小端字节序存储。
+    """
+    __tablename__ = 'word_bitsets'
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'owner_id', name='uq_word_bitsets_kind_owner'),
+        {'extend_existing': True}
+    )
+
+    KIND_MASTERED = 'mastered'
+    KIND_BOOK = 'book'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    owner_id = db.Column(db.Integer, nullable=False)
+    bits = db.Column(db.LargeBinary, nullable=False, default=b'')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, kind=None, owner_id=None, bits=b''):
+        self.kind = kind
+        self.owner_id = owner_id
+        self.bits = bits
+
+    @staticmethod
+    def encode(value):
+        """整数位图转为字节"""
+        return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+    @staticmethod
+    def decode(data):
+        """字节转为整数位图"""
+        return int.from_bytes(data or b'', 'little')
+
+    @staticmethod
+    def from_ids(word_ids):
+        """由单词ID集合构建整数位图"""
+        word_ids = list(word_ids)
+        if not word_ids:
+            return 0
+        buf = bytearray(max(word_ids) // 8 + 1)
+        for word_id in word_ids:
+            buf[word_id >> 3] |= 1 << (word_id & 7)
+        return int.from_bytes(buf, 'little')
+
+    @property
+    def value(self):
+        return self.decode(self.bits)
+
+    def __repr__(self):
+        return f'<WordBitset {self.kind}:{self.owner_id}>'
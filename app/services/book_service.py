@@ -0,0 +1,69 @@
+from datetime import datetime
+from sqlalchemy import select, insert, literal
+from app import db
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word_bitset import WordBitset
+
+class BookService:
+    """词书服务"""
+
+    @staticmethod
+    def clone(book: VocabularyBook, user_id: int, name: str = None) -> VocabularyBook:
+        """复制词书及其全部单词
+
+        单词关联和词书位图都用 INSERT ... SELECT 在数据库内复制，耗时与 Python 端无关。
+
+        Args:
+            book: 源词书
+            user_id: 新词书所属用户ID
+            name: 新词书名称（可选，默认在原名后加“副本”）
+
+        Returns:
+            新词书
+        """
+        clone = VocabularyBook(
+            name=name or f'{book.name} (副本)',
+            description=book.description,
+            level=book.level,
+            user_id=user_id
+        )
+        clone.tags = book.tags
+        db.session.add(clone)
+        db.session.flush()
+
+        now = datetime.utcnow()
+        relations = WordRelation.__table__
+        result = db.session.execute(
+            insert(relations).from_select(
+                ['word_id', 'book_id', 'order', 'created_at', 'updated_at'],
+                select(
+                    relations.c.word_id,
+                    literal(clone.id),
+                    relations.c.order,
+                    literal(now),
+                    literal(now)
+                ).where(relations.c.book_id == book.id)
+            )
+        )
+        clone.total_words = result.rowcount
+
+        # 单词相同，词书位图直接复制；源词书没有位图时下次读取再生成
+        bitsets = WordBitset.__table__
+        db.session.execute(
+            insert(bitsets).from_select(
+                ['kind', 'owner_id', 'bits', 'created_at', 'updated_at'],
+                select(
+                    bitsets.c.kind,
+                    literal(clone.id),
+                    bitsets.c.bits,
+                    literal(now),
+                    literal(now)
+                ).where(
+                    bitsets.c.kind == WordBitset.KIND_BOOK,
+                    bitsets.c.owner_id == book.id
+                )
+            )
+        )
+
+        db.session.commit()
+        return clone
@@ -0,0 +1,241 @@
+from typing import Dict, Any, List, Iterable
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import event, inspect, select, insert, update, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.learning_record import LearningRecord
+from app.models.word_bitset import WordBitset
+
+UPSERT_DIALECTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}  # 支持 ON CONFLICT
+
+class CoverageService:
+    """词书覆盖率服务
+
+    用户已掌握单词和词书单词都以位图保存，覆盖率通过按位与和 popcount 计算，
+    不需要对每本词书做关联计数。
+    """
+
+    @staticmethod
+    def get_mastered_bitset(user_id: int) -> int:
+        """获取用户已掌握单词位图，缺失时从学习记录构建并在当前事务中插入，由调用方提交"""
+        row = WordBitset.query.filter_by(kind=WordBitset.KIND_MASTERED, owner_id=user_id).first()
+        if row is not None:
+            return row.value
+        connection = db.session.connection()
+        value = _mastered_value(connection, user_id)
+        if not _create(connection, WordBitset.KIND_MASTERED, user_id, value):
+            # 其他请求已先插入
+            value = WordBitset.decode(_locked_bits(connection, WordBitset.KIND_MASTERED, user_id))
+        return value
+
+    @staticmethod
+    def get_book_bitsets(book_ids: Iterable[int]) -> Dict[int, int]:
+        """批量获取词书单词位图，缺失的位图一次查询补齐并在当前事务中插入，由调用方提交
+
+        Args:
+            book_ids: 词书ID列表
+
+        Returns:
+            词书ID到位图的映射
+        """
+        book_ids = list(book_ids)
+        if not book_ids:
+            return {}
+
+        rows = WordBitset.query.filter(
+            WordBitset.kind == WordBitset.KIND_BOOK,
+            WordBitset.owner_id.in_(book_ids)
+        ).all()
+        bitsets = {row.owner_id: row.value for row in rows}
+
+        missing = [book_id for book_id in book_ids if book_id not in bitsets]
+        if missing:
+            word_ids = defaultdict(list)
+            for book_id, word_id in db.session.query(WordRelation.book_id, WordRelation.word_id).filter(
+                WordRelation.book_id.in_(missing)
+            ):
+                word_ids[book_id].append(word_id)
+
+            connection = db.session.connection()
+            for book_id in missing:
+                value = WordBitset.from_ids(word_ids[book_id])
+                bitsets[book_id] = value
+                # 并发的首次读取插入同一词书时保留先插入的一行，两者由相同的单词计算
+                _create(connection, WordBitset.KIND_BOOK, book_id, value)
+
+        return bitsets
+
+    @staticmethod
+    def get_coverage(user_id: int) -> List[Dict[str, Any]]:
+        """计算用户所有词书的掌握覆盖率
+
+        Args:
+            user_id: 用户ID
+
+        Returns:
+            每本词书的单词数、已掌握数和覆盖率
+        """
+        books = db.session.query(VocabularyBook.id, VocabularyBook.name).filter_by(
+            user_id=user_id, deleted_at=None
+        ).order_by(VocabularyBook.id).all()
+        mastered = CoverageService.get_mastered_bitset(user_id)
+        bitsets = CoverageService.get_book_bitsets([book.id for book in books])
+
+        items = []
+        for book in books:
+            book_bits = bitsets[book.id]
+            total_words = book_bits.bit_count()
+            mastered_words = (book_bits & mastered).bit_count()
+            items.append({
+                'book_id': book.id,
+                'book_name': book.name,
+                'total_words': total_words,
+                'mastered_words': mastered_words,
+                'coverage': round(mastered_words / total_words * 100, 2) if total_words > 0 else 0
+            })
+        return items
+
+    @staticmethod
+    def invalidate_book(book_id: int) -> None:
+        """词书单词变化后删除词书位图，下次读取时重建"""
+        WordBitset.query.filter_by(
+            kind=WordBitset.KIND_BOOK,
+            owner_id=book_id
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def rebuild_user(user_id: int) -> int:
+        """根据学习记录重建用户已掌握单词位图，由调用方提交"""
+        return _build_mastered(db.session.connection(), user_id)
+
+
+def _mastered_value(connection, user_id):
+    """从学习记录计算已掌握位图"""
+    word_ids = connection.execute(
+        select(LearningRecord.word_id).where(
+            LearningRecord.user_id == user_id,
+            LearningRecord.status == 'mastered'
+        ).distinct()
+    ).scalars()
+    return WordBitset.from_ids(word_ids)
+
+
+def _build_mastered(connection, user_id):
+    """从学习记录构建已掌握位图并写入"""
+    value = _mastered_value(connection, user_id)
+    _store(connection, WordBitset.KIND_MASTERED, user_id, value)
+    return value
+
+
+def _store(connection, kind, owner_id, value):
+    """写入位图，已存在时覆盖"""
+    table = WordBitset.__table__
+    now = datetime.utcnow()
+    values = dict(kind=kind, owner_id=owner_id, bits=WordBitset.encode(value), created_at=now, updated_at=now)
+    dialect = connection.dialect.name
+    if dialect in UPSERT_DIALECTS:
+        stmt = UPSERT_DIALECTS[dialect](table).values(**values)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=['kind', 'owner_id'],
+            set_={'bits': stmt.excluded.bits, 'updated_at': stmt.excluded.updated_at}
+        ))
+        return
+    result = connection.execute(
+        update(table).where(
+            table.c.kind == kind,
+            table.c.owner_id == owner_id
+        ).values(bits=values['bits'], updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(**values))
+
+
+def _create(connection, kind, owner_id, value):
+    """位图不存在时插入，返回是否由本次插入；并发插入时保留先插入的一行"""
+    table = WordBitset.__table__
+    now = datetime.utcnow()
+    values = dict(kind=kind, owner_id=owner_id, bits=WordBitset.encode(value), created_at=now, updated_at=now)
+    dialect = connection.dialect.name
+    if dialect in UPSERT_DIALECTS:
+        stmt = UPSERT_DIALECTS[dialect](table).values(**values)
+        return connection.execute(stmt.on_conflict_do_nothing(index_elements=['kind', 'owner_id'])).rowcount == 1
+    connection.execute(insert(table).values(**values))
+    return True
+
+
+def _locked_bits(connection, kind, owner_id):
+    """读取位图并锁定该行直到事务结束，避免并发的读-改-写覆盖彼此的修改"""
+    table = WordBitset.__table__
+    return connection.execute(
+        select(table.c.bits).where(
+            table.c.kind == kind,
+            table.c.owner_id == owner_id
+        ).with_for_update()
+    ).scalar()
+
+
+def _set_mastered(connection, user_id, word_id, mastered):
+    """在 flush 过程中更新用户已掌握位图的单个位"""
+    bits = _locked_bits(connection, WordBitset.KIND_MASTERED, user_id)
+    if bits is None:
+        # 尚无位图时从学习记录完整构建，当前记录已写入数据库；
+        # 其他事务已先插入时改为在其位图上修改单个位
+        if _create(connection, WordBitset.KIND_MASTERED, user_id, _mastered_value(connection, user_id)):
+            return
+        bits = _locked_bits(connection, WordBitset.KIND_MASTERED, user_id)
+
+    if not mastered:
+        # 同一单词可能在其他词书中仍为已掌握
+        still_mastered = connection.execute(
+            select(LearningRecord.id).where(
+                LearningRecord.user_id == user_id,
+                LearningRecord.word_id == word_id,
+                LearningRecord.status == 'mastered'
+            ).limit(1)
+        ).first()
+        if still_mastered:
+            return
+
+    value = WordBitset.decode(bits)
+    if mastered:
+        value |= 1 << word_id
+    else:
+        value &= ~(1 << word_id)
+    _store(connection, WordBitset.KIND_MASTERED, user_id, value)
+
+
+@event.listens_for(LearningRecord, 'after_insert')
+def _record_inserted(mapper, connection, target):
+    if target.status == 'mastered':
+        _set_mastered(connection, target.user_id, target.word_id, True)
+
+
+@event.listens_for(LearningRecord, 'after_update')
+def _record_updated(mapper, connection, target):
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return
+    was_mastered = 'mastered' in (history.deleted or ())
+    is_mastered = target.status == 'mastered'
+    if was_mastered != is_mastered:
+        _set_mastered(connection, target.user_id, target.word_id, is_mastered)
+
+
+@event.listens_for(LearningRecord, 'after_delete')
+def _record_deleted(mapper, connection, target):
+    if target.status == 'mastered':
+        _set_mastered(connection, target.user_id, target.word_id, False)
+
+
+@event.listens_for(WordRelation, 'after_insert')
+@event.listens_for(WordRelation, 'after_delete')
+def _relation_changed(mapper, connection, target):
+    table = WordBitset.__table__
+    connection.execute(
+        delete(table).where(
+            table.c.kind == WordBitset.KIND_BOOK,
+            table.c.owner_id == target.book_id
+        )
+    )
@@ -0,0 +1,136 @@
+import threading
+from typing import List, Set
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, update, delete
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.learning_record import LearningRecord
+from app.models.learning import LearningFrontier
+from app.models.word_bitset import WordBitset
+
+class DeletionService:
+    """词书和用户删除服务
+
+    子表外键为 ON DELETE CASCADE，删除词书或用户只需一条 DELETE，由数据库级联删除关联行。
+    特别大的词书和用户先分批删除学习记录和单词关联，避免单个事务过长。
+    后台删除的词书先标记 deleted_at，进程中途退出后由 flask purge pending 继续删除。
+    """
+
+    @staticmethod
+    def delete_book(book_id: int) -> None:
+        """删除词书，关联数据由数据库级联删除"""
+        users = _mastered_users(LearningRecord.book_id == book_id)
+        db.session.execute(delete(VocabularyBook.__table__).where(VocabularyBook.__table__.c.id == book_id))
+        _invalidate_bitsets(book_id, users)
+        db.session.commit()
+
+    @staticmethod
+    def purge_book(book_id: int, chunk_size: int = None) -> None:
+        """分批删除词书的学习记录和单词关联，最后删除词书"""
+        chunk_size = chunk_size or current_app.config['DELETE_CHUNK_SIZE']
+        users = _mastered_users(LearningRecord.book_id == book_id)
+        _delete_chunked(LearningRecord.__table__, 'book_id', book_id, chunk_size)
+        LearningFrontier.reset_for_book(book_id)
+        _delete_chunked(WordRelation.__table__, 'book_id', book_id, chunk_size)
+        db.session.execute(delete(VocabularyBook.__table__).where(VocabularyBook.__table__.c.id == book_id))
+        _invalidate_bitsets(book_id, users)
+        db.session.commit()
+
+    @staticmethod
+    def purge_user(user_id: int, chunk_size: int = None) -> None:
+        """分批删除用户的学习记录和词书，最后删除用户"""
+        chunk_size = chunk_size or current_app.config['DELETE_CHUNK_SIZE']
+        _delete_chunked(LearningRecord.__table__, 'user_id', user_id, chunk_size)
+        # 学习记录先于词书删除，推进位置不再成立
+        LearningFrontier.reset_for_user(user_id)
+        book_ids = db.session.execute(
+            select(VocabularyBook.id).where(VocabularyBook.user_id == user_id)
+        ).scalars().all()
+        for book_id in book_ids:
+            DeletionService.purge_book(book_id, chunk_size)
+        db.session.execute(delete(User.__table__).where(User.__table__.c.id == user_id))
+        bitsets = WordBitset.__table__
+        db.session.execute(delete(bitsets).where(
+            bitsets.c.kind == WordBitset.KIND_MASTERED,
+            bitsets.c.owner_id == user_id
+        ))
+        db.session.commit()
+
+    @staticmethod
+    def mark_book_deleting(book_id: int) -> bool:
+        """标记词书正在删除并提交
+
+        Args:
+            book_id: 词书ID
+
+        Returns:
+            本次是否成功标记；已经在删除中时返回 False
+        """
+        table = VocabularyBook.__table__
+        result = db.session.execute(
+            update(table).where(table.c.id == book_id, table.c.deleted_at.is_(None))
+            .values(deleted_at=datetime.utcnow())
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def pending_books() -> List[int]:
+        """已标记删除但尚未删除完的词书ID"""
+        return db.session.execute(
+            select(VocabularyBook.id).where(VocabularyBook.deleted_at.isnot(None)).order_by(VocabularyBook.id)
+        ).scalars().all()
+
+    @staticmethod
+    def purge_book_in_background(book_id: int) -> threading.Thread:
+        """在后台线程中分批删除词书，调用前应先用 mark_book_deleting 标记
+
+        Args:
+            book_id: 词书ID
+
+        Returns:
+            执行删除的线程
+        """
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                try:
+                    DeletionService.purge_book(book_id)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Failed to purge book %s', book_id)
+
+        thread = threading.Thread(target=run, name=f'purge-book-{book_id}', daemon=True)
+        thread.start()
+        return thread
+
+
+def _delete_chunked(table, column, value, chunk_size):
+    """按主键分批删除，每批单独提交"""
+    while True:
+        ids = select(table.c.id).where(table.c[column] == value).limit(chunk_size).scalar_subquery()
+        result = db.session.execute(delete(table).where(table.c.id.in_(ids)))
+        db.session.commit()
+        if result.rowcount < chunk_size:
+            break
+
+
+def _mastered_users(condition) -> Set[int]:
+    """删除前找出已掌握位图会受影响的用户"""
+    return set(db.session.execute(
+        select(LearningRecord.user_id).where(condition, LearningRecord.status == 'mastered').distinct()
+    ).scalars())
+
+
+def _invalidate_bitsets(book_id, users):
+    """级联删除不触发 ORM 事件，相关位图删除后按需重建"""
+    table = WordBitset.__table__
+    db.session.execute(delete(table).where(table.c.kind == WordBitset.KIND_BOOK, table.c.owner_id == book_id))
+    if users:
+        db.session.execute(delete(table).where(
+            table.c.kind == WordBitset.KIND_MASTERED,
+            table.c.owner_id.in_(users)
+        ))
@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+import zlib
+from typing import Dict, Any, Iterable, Iterator, List
+from datetime import datetime, date
+from sqlalchemy import select
+from app import db
+from app.models.word import Word
+from app.models.vocabulary import WordRelation
+from app.models.learning_record import LearningRecord
+
+BOOK_COLUMNS = ['order', 'text', 'phonetic', 'definition', 'example', 'difficulty_level']
+RECORD_COLUMNS = [
+    'id', 'book_id', 'word_id', 'text', 'status', 'review_count', 'mastery_level',
+    'last_review_time', 'next_review_time', 'created_at', 'updated_at'
+]
+
+class ExportService:
+    """数据导出服务
+
+    查询结果通过 yield_per 分批从游标读取，逐行编码后以生成器输出，内存占用与行数无关。
+    """
+
+    FORMATS = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv'
+    }
+    YIELD_PER = 1000
+    # gzip 输出时攒够这么多字节再压缩一次
+    FLUSH_SIZE = 64 * 1024
+
+    @staticmethod
+    def book_rows(book_id: int) -> Iterator[Dict[str, Any]]:
+        """按顺序逐行读取词书单词"""
+        query = select(
+            WordRelation.order,
+            Word.text,
+            Word.phonetic,
+            Word.definition,
+            Word.example,
+            Word.difficulty_level
+        ).join(Word, Word.id == WordRelation.word_id).where(
+            WordRelation.book_id == book_id
+        ).order_by(WordRelation.order, WordRelation.id)
+        return ExportService._stream(query)
+
+    @staticmethod
+    def record_rows(user_id: int) -> Iterator[Dict[str, Any]]:
+        """逐行读取用户学习记录"""
+        query = select(
+            LearningRecord.id,
+            LearningRecord.book_id,
+            LearningRecord.word_id,
+            Word.text,
+            LearningRecord.status,
+            LearningRecord.review_count,
+            LearningRecord.mastery_level,
+            LearningRecord.last_review_time,
+            LearningRecord.next_review_time,
+            LearningRecord.created_at,
+            LearningRecord.updated_at
+        ).join(Word, Word.id == LearningRecord.word_id).where(
+            LearningRecord.user_id == user_id
+        ).order_by(LearningRecord.id)
+        return ExportService._stream(query)
+
+    @staticmethod
+    def encode(rows: Iterable[Dict[str, Any]], fmt: str, columns: List[str]) -> Iterator[str]:
+        """把行编码为 NDJSON 或 CSV 文本片段
+
+        Args:
+            rows: 行字典迭代器
+            fmt: 输出格式（ndjson 或 csv）
+            columns: 输出列
+
+        Returns:
+            文本片段迭代器，每行一个片段
+        """
+        if fmt == 'ndjson':
+            for row in rows:
+                yield json.dumps(row, ensure_ascii=False, default=_default) + '\n'
+        elif fmt == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow([_csv_value(row[column]) for column in columns])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            raise ValueError(f'Invalid format. Must be one of {list(ExportService.FORMATS)}')
+
+    @staticmethod
+    def gzip(chunks: Iterable[str]) -> Iterator[bytes]:
+        """流式 gzip 压缩文本片段"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        pending = []
+        size = 0
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            pending.append(data)
+            size += len(data)
+            if size >= ExportService.FLUSH_SIZE:
+                compressed = compressor.compress(b''.join(pending))
+                pending, size = [], 0
+                if compressed:
+                    yield compressed
+        yield compressor.compress(b''.join(pending)) + compressor.flush()
+
+    @staticmethod
+    def _stream(query) -> Iterator[Dict[str, Any]]:
+        result = db.session.execute(query.execution_options(yield_per=ExportService.YIELD_PER))
+        try:
+            for row in result.mappings():
+                yield dict(row)
+        finally:
+            result.close()
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
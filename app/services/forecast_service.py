@@ -0,0 +1,144 @@
+from typing import Dict, Any, Iterable, Tuple
+from datetime import datetime, date, timedelta
+import numpy as np
+from sqlalchemy import func
+from app import db
+from app.models.learning_record import LearningRecord, REVIEW_INTERVALS
+from app.models.vocabulary import VocabularyBook
+from app.services.progress_service import ProgressService
+
+class ForecastService:
+    """学习计划预测服务
+
+    按天模拟新词引入和间隔复习，所有单词按复习阶段聚合成数组，每天只做一次向量运算。
+    """
+
+    @staticmethod
+    def simulate(new_words: int, daily_words: int, start_date: date = None, horizon_days: int = 365,
+                 intervals: Iterable[int] = REVIEW_INTERVALS, retention: float = 1.0,
+                 max_daily_load: int = None, pending: Iterable[Tuple[int, int, int]] = ()) -> Dict[str, Any]:
+        """模拟学习计划的每日工作量
+
+        Args:
+            new_words: 尚未学习的单词数
+            daily_words: 每日新学单词数
+            start_date: 开始日期，默认今天
+            horizon_days: 模拟天数
+            intervals: 各阶段复习间隔(天)
+            retention: 每次复习记住的比例，忘记的单词次日重新复习
+            max_daily_load: 每日最大学习量（新词加复习），复习优先占用
+            pending: 已在学习中的单词，(复习阶段, 距开始日期的天数, 单词数) 列表
+
+        Returns:
+            每日新词数、复习数、总工作量以及新词学完日期和全部掌握日期
+        """
+        if daily_words <= 0:
+            raise ValueError('Daily words must be positive')
+
+        start_date = start_date or datetime.utcnow().date()
+        intervals = np.asarray(list(intervals), dtype=np.int64)
+        stages = len(intervals)
+        # 阶段 k 复习通过后，下次复习在 intervals[k + 1] 天后
+        next_stage = np.arange(1, stages)
+        next_offset = intervals[1:]
+
+        due = np.zeros((stages, horizon_days + int(intervals.max()) + 2))
+        for stage, offset, count in pending:
+            due[min(stage, stages - 1), min(max(offset, 0), horizon_days)] += count
+        active = due.sum()
+
+        daily_new = np.zeros(horizon_days)
+        daily_reviews = np.zeros(horizon_days)
+        remaining = float(new_words)
+        introduction_end = 0 if remaining == 0 else None
+        completion = None
+
+        for day in range(horizon_days):
+            reviews = due[:, day]
+            review_total = reviews.sum()
+
+            introduced = min(float(daily_words), remaining)
+            if max_daily_load is not None:
+                introduced = min(introduced, max(float(max_daily_load) - review_total, 0.0))
+            remaining -= introduced
+            due[0, day + intervals[0]] += introduced
+
+            passed = reviews * retention
+            due[:, day + 1] += reviews - passed
+            due[next_stage, day + next_offset] += passed[:-1]
+            active += introduced - passed[-1]
+
+            daily_new[day] = introduced
+            daily_reviews[day] = review_total
+
+            if introduction_end is None and remaining <= 0:
+                introduction_end = day
+            if remaining <= 0 and active < 0.5:
+                completion = day
+                break
+
+        daily_new = np.rint(daily_new).astype(int)
+        daily_reviews = np.rint(daily_reviews).astype(int)
+        workload = daily_new + daily_reviews
+        days = len(workload) if completion is None else completion + 1
+
+        return {
+            'start_date': start_date.isoformat(),
+            'horizon_days': horizon_days,
+            'daily_new_words': daily_new[:days].tolist(),
+            'daily_reviews': daily_reviews[:days].tolist(),
+            'daily_workload': workload[:days].tolist(),
+            'peak_workload': int(workload.max()) if len(workload) else 0,
+            'introduction_end_date': (start_date + timedelta(days=introduction_end)).isoformat()
+                if introduction_end is not None else None,
+            'completion_date': (start_date + timedelta(days=completion)).isoformat()
+                if completion is not None else None
+        }
+
+    @staticmethod
+    def forecast_plan(plan, horizon_days: int = 365, max_daily_load: int = None) -> Dict[str, Any]:
+        """预测学习计划的每日工作量和完成日期
+
+        Args:
+            plan: 学习计划
+            horizon_days: 模拟天数
+            max_daily_load: 每日最大学习量（可选）
+
+        Returns:
+            预测结果
+        """
+        today = datetime.utcnow().date()
+        start_date = max(plan.start_date or today, today)
+        book = db.session.get(VocabularyBook, plan.book_id)
+        progress = ProgressService.get_progress(plan.user_id, plan.book_id)
+
+        # 学习中的单词按复习次数和下次复习日期聚合，一次查询
+        next_review_date = func.date(LearningRecord.next_review_time)
+        rows = db.session.query(
+            LearningRecord.review_count,
+            next_review_date,
+            func.count(LearningRecord.id)
+        ).filter(
+            LearningRecord.user_id == plan.user_id,
+            LearningRecord.book_id == plan.book_id,
+            LearningRecord.status != 'mastered'
+        ).group_by(LearningRecord.review_count, next_review_date).all()
+
+        pending = []
+        for review_count, review_date, count in rows:
+            if review_date is None:
+                offset = 0
+            else:
+                if isinstance(review_date, str):
+                    review_date = date.fromisoformat(review_date)
+                offset = (review_date - start_date).days
+            pending.append((review_count or 0, offset, count))
+
+        return ForecastService.simulate(
+            new_words=progress.new_count(book.total_words if book else 0),
+            daily_words=plan.daily_words,
+            start_date=start_date,
+            horizon_days=horizon_days,
+            max_daily_load=max_daily_load,
+            pending=pending
+        )
@@ -0,0 +1,202 @@
+import csv
+import json
+from typing import Dict, Any, Iterable, Iterator, List, Callable, IO
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import insert, update, func
+from app import db
+from app.models.word import Word
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.services.coverage_service import CoverageService
+from app.services.ordering_service import OrderingService
+
+WORD_FIELDS = ('text', 'phonetic', 'definition', 'example')
+
+class ImportAborted(ValueError):
+    """导入中途遇到无效行
+
+    导入按块提交，不是原子的：出错前的块已经写入，stats 为已写入部分的统计。
+    """
+
+    def __init__(self, message: str, stats: Dict[str, int]):
+        super().__init__(message)
+        self.stats = stats
+
+class ImportService:
+    """单词批量导入服务
+
+    输入按块流式读取，每块按规范化文本只做一次已有单词查询，新单词和词书关联用 executemany 批量插入，
+    顺序值按间隔连续分配在词书末尾。
+    """
+
+    FORMATS = ('csv', 'jsonl')
+    CHUNK_SIZE = 1000
+
+    @staticmethod
+    def iter_rows(stream: IO[str], fmt: str) -> Iterator[Dict[str, Any]]:
+        """逐行解析导入文件
+
+        Args:
+            stream: 文本流
+            fmt: 文件格式（csv 或 jsonl）
+
+        Returns:
+            单词字段字典的迭代器
+
+        Raises:
+            ValueError: 格式不支持，或某行不是对象、字段不是字符串或数字，消息中包含行号
+        """
+        if fmt == 'csv':
+            reader = csv.DictReader(stream)
+            rows = ((reader.line_num, row) for row in reader)
+        elif fmt == 'jsonl':
+            rows = _jsonl_rows(stream)
+        else:
+            raise ValueError(f'Invalid format. Must be one of {list(ImportService.FORMATS)}')
+
+        for line_num, row in rows:
+            if not isinstance(row, dict):
+                raise ValueError(f'Line {line_num}: expected an object, got {type(row).__name__}')
+            yield {field: _field_value(line_num, field, row.get(field)) for field in WORD_FIELDS}
+
+    @staticmethod
+    def import_words(book_id: int, rows: Iterable[Dict[str, Any]], chunk_size: int = None,
+                     on_progress: Callable[[Dict[str, int]], None] = None) -> Dict[str, int]:
+        """批量导入单词到词书
+
+        Args:
+            book_id: 词书ID
+            rows: 单词字段字典的迭代器
+            chunk_size: 每块行数，默认 CHUNK_SIZE
+            on_progress: 每块完成后的回调，参数为当前统计
+
+        Returns:
+            统计信息：处理行数、新建单词数、加入词书数、跳过行数
+
+        Raises:
+            ValueError: 词书不存在
+            ImportAborted: 读取到无效行，之前的块已提交
+        """
+        book = db.session.get(VocabularyBook, book_id)
+        if not book:
+            raise ValueError('Book not found')
+
+        chunk_size = chunk_size or ImportService.CHUNK_SIZE
+        stats = {'processed': 0, 'created': 0, 'added': 0, 'skipped': 0}
+        next_order = OrderingService.next_order(book_id)
+
+        rows = iter(rows)
+        while True:
+            try:
+                chunk = list(islice(rows, chunk_size))
+            except ValueError as e:
+                db.session.rollback()
+                raise ImportAborted(str(e), dict(stats)) from e
+            if not chunk:
+                break
+            added = ImportService._import_chunk(book_id, chunk, next_order, stats)
+            next_order += added * WordRelation.ORDER_GAP
+            if added:
+                # 关联通过 Core 插入，不会触发 ORM 事件，需手动失效词书位图
+                CoverageService.invalidate_book(book_id)
+
+            db.session.execute(
+                update(VocabularyBook.__table__)
+                .where(VocabularyBook.__table__.c.id == book_id)
+                .values(total_words=func.coalesce(VocabularyBook.__table__.c.total_words, 0) + added)
+            )
+            db.session.commit()
+            if on_progress:
+                on_progress(dict(stats))
+
+        db.session.expire(book)
+        return stats
+
+    @staticmethod
+    def _import_chunk(book_id: int, chunk: List[Dict[str, Any]], next_order: int, stats: Dict[str, int]) -> int:
+        """导入一块单词，返回加入词书的单词数"""
+        stats['processed'] += len(chunk)
+
+        # 块内按规范化文本去重，保持首次出现的顺序
+        unique = {}
+        for row in chunk:
+            key = Word.normalize(row['text'])
+            if not key or key in unique:
+                stats['skipped'] += 1
+                continue
+            unique[key] = row
+
+        # 一次查询已有单词及其是否已在词书中
+        word_ids = {}
+        in_book = set()
+        query = db.session.query(Word.id, Word.text_key, WordRelation.id).outerjoin(
+            WordRelation,
+            (WordRelation.word_id == Word.id) & (WordRelation.book_id == book_id)
+        ).filter(Word.text_key.in_(list(unique)))
+        for word_id, key, relation_id in query:
+            word_ids[key] = word_id
+            if relation_id is not None:
+                in_book.add(key)
+
+        now = datetime.utcnow()
+        new_words = []
+        for key, row in unique.items():
+            if key in word_ids:
+                continue
+            if not row['definition']:
+                # 新单词必须有释义
+                stats['skipped'] += 1
+                continue
+            new_words.append(dict(row, text_key=key, difficulty_level=1.0, created_at=now, updated_at=now))
+
+        if new_words:
+            table = Word.__table__
+            result = db.session.execute(
+                insert(table).returning(table.c.id, table.c.text_key, sort_by_parameter_order=True),
+                new_words
+            )
+            for word_id, key in result:
+                word_ids[key] = word_id
+            stats['created'] += len(new_words)
+
+        relations = []
+        for key in unique:
+            if key not in word_ids:
+                continue
+            if key in in_book:
+                stats['skipped'] += 1
+                continue
+            relations.append({
+                'word_id': word_ids[key],
+                'book_id': book_id,
+                'order': next_order + len(relations) * WordRelation.ORDER_GAP,
+                'created_at': now,
+                'updated_at': now
+            })
+
+        if relations:
+            db.session.execute(insert(WordRelation.__table__), relations)
+            stats['added'] += len(relations)
+        return len(relations)
+
+
+def _jsonl_rows(stream):
+    """逐行解析 JSONL，返回 (行号, 对象)"""
+    for line_num, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f'Line {line_num}: invalid JSON ({e.msg})') from None
+
+
+def _field_value(line_num, field, value):
+    """字段值转为去除首尾空白的字符串，数字按文本处理，空值为 None"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        raise ValueError(f'Line {line_num}: field {field!r} must be a string, got {type(value).__name__}')
+    return value.strip() or None
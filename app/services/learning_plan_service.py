@@ -7,6 +7,8 @@ from app.models.vocabulary import VocabularyBook, WordRelation
 from app.models.word import Word
 from app.models.learning import LearningRecord, LearningGoal
 from app.models.learning_plan import LearningPlan
+from app.services.progress_service import ProgressService
+from app.services.forecast_service import ForecastService
 
 class LearningPlanService:
     """学习计划服务"""
@@ -34,11 +36,8 @@ class LearningPlanService:
             raise ValueError('Learning plan already exists')
             
         # 获取词书中的剩余单词数
-        book = VocabularyBook.query.get_or_404(book_id)
-        mastered_words = LearningRecord.query.filter_by(
-            user_id=user_id,
-            status='mastered'
-        ).join(Word).join(WordRelation).filter(WordRelation.book_id == book_id).count()
+        book = VocabularyBook.get_active_or_404(book_id)
+        mastered_words = ProgressService.get_progress(user_id, book_id).mastered_count
         
         remaining_words = book.total_words - mastered_words
         start_date = datetime.utcnow().date()
@@ -72,7 +71,8 @@ class LearningPlanService:
             'daily_words': plan.daily_words,
             'start_date': plan.start_date.isoformat(),
             'end_date': plan.end_date.isoformat(),
-            'created_at': plan.created_at.isoformat()
+            'created_at': plan.created_at.isoformat(),
+            'forecast': ForecastService.forecast_plan(plan)
         }
     
     @staticmethod
@@ -89,29 +89,20 @@ class LearningPlanService:
         """
         plan = LearningPlan.query.get_or_404(plan_id)
         
+        if daily_words or target_date:
+            book = VocabularyBook.query.get(plan.book_id)
+            mastered_words = ProgressService.get_progress(plan.user_id, plan.book_id).mastered_count
+            remaining_words = book.total_words - mastered_words
+        
         if daily_words:
             plan.daily_words = daily_words
             # 根据新的每日单词数重新计算目标日期
-            book = VocabularyBook.query.get(plan.book_id)
-            mastered_words = LearningRecord.query.filter_by(
-                user_id=plan.user_id,
-                status='mastered'
-            ).join(Word).join(WordRelation).filter(WordRelation.book_id == plan.book_id).count()
-            
-            remaining_words = book.total_words - mastered_words
             days_needed = math.ceil(remaining_words / daily_words)
             plan.end_date = datetime.utcnow().date() + timedelta(days=days_needed)
             
         if target_date:
             end_date = datetime.strptime(target_date, '%Y-%m-%d').date()
             # 根据新的目标日期重新计算每日单词数
-            book = VocabularyBook.query.get(plan.book_id)
-            mastered_words = LearningRecord.query.filter_by(
-                user_id=plan.user_id,
-                status='mastered'
-            ).join(Word).join(WordRelation).filter(WordRelation.book_id == plan.book_id).count()
-            
-            remaining_words = book.total_words - mastered_words
             days_available = (end_date - datetime.utcnow().date()).days
             if days_available <= 0:
                 raise ValueError('Target date must be in the future')
@@ -127,7 +118,8 @@ class LearningPlanService:
             'daily_words': plan.daily_words,
             'start_date': plan.start_date.isoformat(),
             'end_date': plan.end_date.isoformat(),
-            'updated_at': plan.updated_at.isoformat()
+            'updated_at': plan.updated_at.isoformat(),
+            'forecast': ForecastService.forecast_plan(plan)
         }
     
     @staticmethod
@@ -144,10 +136,7 @@ class LearningPlanService:
         
         # 获取学习进度
         book = VocabularyBook.query.get(plan.book_id)
-        mastered_words = LearningRecord.query.filter_by(
-            user_id=plan.user_id,
-            status='mastered'
-        ).join(Word).join(WordRelation).filter(WordRelation.book_id == plan.book_id).count()
+        mastered_words = ProgressService.get_progress(plan.user_id, plan.book_id).mastered_count
         
         remaining_words = book.total_words - mastered_words
         days_remaining = (plan.end_date - datetime.utcnow().date()).days
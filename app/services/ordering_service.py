@@ -0,0 +1,100 @@
+from typing import Optional
+from sqlalchemy import func, select, update
+from app import db
+from app.models.vocabulary import WordRelation
+from app.models.learning import LearningFrontier
+
+class OrderingService:
+    """词书单词顺序服务
+
+    顺序值按 WordRelation.ORDER_GAP 间隔分配，移动单词只需把它的顺序改为前后两个值的中点；
+    间隔用尽时才对整本词书重新编号。
+    """
+
+    @staticmethod
+    def next_order(book_id: int) -> int:
+        """词书末尾的下一个顺序值"""
+        max_order = db.session.query(func.max(WordRelation.order)).filter_by(book_id=book_id).scalar() or 0
+        return max_order + WordRelation.ORDER_GAP
+
+    @staticmethod
+    def move(book_id: int, word_id: int, after_word_id: int = None) -> int:
+        """移动单词到另一个单词之后
+
+        Args:
+            book_id: 词书ID
+            word_id: 要移动的单词ID
+            after_word_id: 目标位置前面的单词ID，缺省时移动到词书开头
+
+        Returns:
+            单词新的顺序值
+        """
+        if after_word_id == word_id:
+            raise ValueError('Cannot move a word after itself')
+
+        relation = WordRelation.query.filter_by(book_id=book_id, word_id=word_id).first()
+        if not relation:
+            raise ValueError('Word not found in book')
+
+        new_order = OrderingService._order_after(book_id, after_word_id, relation.id)
+        if new_order is None:
+            # 前后两个顺序值之间没有空隙，重新编号后再取中点
+            OrderingService.rebalance(book_id)
+            new_order = OrderingService._order_after(book_id, after_word_id, relation.id)
+
+        relation.order = new_order
+
+        # 移到推进位置之前的单词可能还没有学习记录，推进位置退回到它前面
+        LearningFrontier.query.filter(
+            LearningFrontier.book_id == book_id,
+            LearningFrontier.last_order >= new_order
+        ).update({LearningFrontier.last_order: new_order - 1}, synchronize_session=False)
+
+        return new_order
+
+    @staticmethod
+    def rebalance(book_id: int) -> None:
+        """按当前顺序把词书单词重新编号为等间隔的顺序值"""
+        table = WordRelation.__table__
+        ranked = select(
+            table.c.id,
+            func.row_number().over(order_by=(table.c.order, table.c.id)).label('rank')
+        ).where(table.c.book_id == book_id).subquery()
+
+        db.session.execute(
+            update(table).where(table.c.id == ranked.c.id).values(order=ranked.c.rank * WordRelation.ORDER_GAP)
+        )
+        # 顺序值整体变化，推进位置失效
+        LearningFrontier.reset_for_book(book_id)
+        db.session.expire_all()
+
+    @staticmethod
+    def _order_after(book_id: int, after_word_id: Optional[int], exclude_id: int) -> Optional[int]:
+        """计算紧跟在指定单词之后的空闲顺序值，没有空隙时返回 None"""
+        if after_word_id is None:
+            first_order = db.session.query(func.min(WordRelation.order)).filter(
+                WordRelation.book_id == book_id,
+                WordRelation.id != exclude_id
+            ).scalar()
+            if first_order is None:
+                return WordRelation.ORDER_GAP
+            return first_order // 2 if first_order > 1 else first_order - WordRelation.ORDER_GAP
+
+        prev_order = db.session.query(WordRelation.order).filter_by(
+            book_id=book_id,
+            word_id=after_word_id
+        ).scalar()
+        if prev_order is None:
+            raise ValueError('Target word not found in book')
+
+        next_order = db.session.query(func.min(WordRelation.order)).filter(
+            WordRelation.book_id == book_id,
+            WordRelation.order > prev_order,
+            WordRelation.id != exclude_id
+        ).scalar()
+
+        if next_order is None:
+            return prev_order + WordRelation.ORDER_GAP
+        if next_order - prev_order < 2:
+            return None
+        return (prev_order + next_order) // 2
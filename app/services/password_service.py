@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+_hasher_lock = threading.Lock()
+
+class PasswordHasherBusy(Exception):
+    """密码哈希线程池排队已满"""
+
+
+class PasswordService:
+    """密码哈希服务
+
+    哈希计算放到有界线程池中执行（hashlib 计算时释放 GIL），每个进程同时进行的哈希数不超过
+    PASSWORD_HASH_WORKERS（默认 2），多个 worker 同时处理大量登录、注册请求时也不会占满全部 CPU；
+    排队超过 PASSWORD_HASH_QUEUE 时等待 PASSWORD_HASH_TIMEOUT 秒，仍无空位则抛出 PasswordHasherBusy。
+    哈希算法和强度由 PASSWORD_HASH_METHOD 配置，旧算法的哈希在登录成功后重新生成。
+    """
+
+    @staticmethod
+    def hash(password: str) -> str:
+        """生成密码哈希"""
+        if not _configured():
+            return generate_password_hash(password)
+        method = current_app.config['PASSWORD_HASH_METHOD']
+        return _hasher().run(generate_password_hash, password, method)
+
+    @staticmethod
+    def verify(password_hash: str, password: str) -> bool:
+        """验证密码"""
+        if not password_hash:
+            return False
+        if not _configured():
+            return check_password_hash(password_hash, password)
+        return _hasher().run(check_password_hash, password_hash, password)
+
+    @staticmethod
+    def needs_rehash(password_hash: str) -> bool:
+        """哈希的算法或强度与当前配置不同时需要重新生成"""
+        if not password_hash or not _configured():
+            return False
+        return password_hash.split('$', 1)[0] != current_app.config['PASSWORD_HASH_METHOD']
+
+
+class _Hasher:
+    """有界的哈希线程池"""
+
+    def __init__(self, workers, queue_size, timeout):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.timeout = timeout
+
+    def run(self, fn, *args):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise PasswordHasherBusy('Too many password hashing requests')
+        try:
+            return self.executor.submit(fn, *args).result()
+        finally:
+            self.slots.release()
+
+
+def _configured():
+    """在本应用中运行时使用配置的算法和线程池，否则直接用 werkzeug 默认设置"""
+    return has_app_context() and 'PASSWORD_HASH_METHOD' in current_app.config
+
+
+def _hasher():
+    """当前应用的哈希线程池"""
+    hasher = current_app.extensions.get('password_hasher')
+    if hasher is None:
+        with _hasher_lock:
+            hasher = current_app.extensions.get('password_hasher')
+            if hasher is None:
+                config = current_app.config
+                hasher = _Hasher(config['PASSWORD_HASH_WORKERS'], config['PASSWORD_HASH_QUEUE'],
+                                 config['PASSWORD_HASH_TIMEOUT'])
+                current_app.extensions['password_hasher'] = hasher
+    return hasher
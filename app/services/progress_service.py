@@ -0,0 +1,272 @@
+from typing import Dict, Tuple, Iterable, Any
+from datetime import datetime
+from sqlalchemy import event, inspect, func, case, select, update, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models.learning_record import LearningRecord
+from app.models.vocabulary import VocabularyBook
+from app.models.user_book_progress import UserBookProgress
+
+UPSERT_DIALECTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}  # 支持 ON CONFLICT DO NOTHING
+
+class ProgressService:
+    """学习进度计数服务
+
+    用户在词书上写入第一条学习记录时由学习记录聚合生成进度行，与学习记录在同一事务中提交；
+    之后随学习记录的插入、状态变化和删除增量更新。没有学习记录的词书在读取时生成全零的进度行。
+
+    计数按学习记录的 book_id 归属词书：同一单词属于多本词书时，只计入记录所在的那本，
+    不计入包含该单词的其他词书。
+    """
+
+    @staticmethod
+    def get_progress(user_id: int, book_id: int) -> UserBookProgress:
+        """获取用户在词书上的进度计数，缺失时聚合生成，见 get_progress_batch
+
+        Args:
+            user_id: 用户ID
+            book_id: 词书ID
+
+        Returns:
+            进度计数行
+        """
+        return ProgressService.get_progress_batch(user_id, [book_id])[book_id]
+
+    @staticmethod
+    def get_progress_batch(user_id: int, book_ids: Iterable[int]) -> Dict[int, UserBookProgress]:
+        """批量获取用户在多本词书上的进度计数
+
+        已有进度行一次查询读取，缺失的进度行一次聚合生成并在当前事务中插入，由调用方提交；
+        并发请求同时插入同一进度行时保留先插入的一行。
+
+        Args:
+            user_id: 用户ID
+            book_ids: 词书ID列表
+
+        Returns:
+            词书ID到进度计数行的映射
+        """
+        book_ids = set(book_ids)
+        if not book_ids:
+            return {}
+
+        rows = UserBookProgress.query.filter(
+            UserBookProgress.user_id == user_id,
+            UserBookProgress.book_id.in_(book_ids)
+        ).all()
+        progress = {row.book_id: row for row in rows}
+
+        missing = book_ids - progress.keys()
+        if missing:
+            built = ProgressService._build(user_id, missing)
+            _insert_missing([
+                _row_values(built.get((user_id, book_id), UserBookProgress(user_id=user_id, book_id=book_id)))
+                for book_id in sorted(missing)
+            ])
+            for row in UserBookProgress.query.filter(
+                UserBookProgress.user_id == user_id,
+                UserBookProgress.book_id.in_(missing)
+            ):
+                progress[row.book_id] = row
+
+        return progress
+
+    @staticmethod
+    def resolve(user_id: int, items: Iterable[Any]) -> Dict[int, Dict[str, Any]]:
+        """为计划、目标等带 book_id 的对象批量计算进度
+
+        Args:
+            user_id: 用户ID
+            items: 带 book_id 属性的对象列表
+
+        Returns:
+            词书ID到进度字典的映射
+        """
+        book_ids = {item.book_id for item in items}
+        if not book_ids:
+            return {}
+
+        books = {
+            book.id: book for book in db.session.query(
+                VocabularyBook.id,
+                VocabularyBook.name,
+                VocabularyBook.total_words
+            ).filter(VocabularyBook.id.in_(book_ids))
+        }
+        rows = ProgressService.get_progress_batch(user_id, book_ids)
+
+        result = {}
+        for book_id in book_ids:
+            book = books.get(book_id)
+            total_words = (book.total_words if book else 0) or 0
+            data = rows[book_id].to_dict(total_words)
+            data['book_name'] = book.name if book else None
+            data['progress'] = round(data['mastered_words'] / total_words * 100, 2) if total_words > 0 else 0
+            result[book_id] = data
+        return result
+
+    @staticmethod
+    def rebuild(user_id: int = None) -> int:
+        """由学习记录重建进度计数
+
+        Args:
+            user_id: 用户ID（可选，缺省时重建全部用户）
+
+        Returns:
+            重建的进度行数
+        """
+        query = UserBookProgress.query
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        query.delete(synchronize_session=False)
+
+        rows = ProgressService._build(user_id)
+        db.session.add_all(rows.values())
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def _build(user_id: int = None, book_ids: Iterable[int] = None,
+               connection=None) -> Dict[Tuple[int, int], UserBookProgress]:
+        """按用户、词书、状态聚合学习记录，flush 过程中传入 connection"""
+        now = datetime.utcnow()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        query = select(
+            LearningRecord.user_id,
+            LearningRecord.book_id,
+            LearningRecord.status,
+            func.count(LearningRecord.id),
+            func.max(LearningRecord.updated_at),
+            func.sum(case((LearningRecord.created_at >= today_start, 1), else_=0))
+        )
+        if user_id is not None:
+            query = query.where(LearningRecord.user_id == user_id)
+        if book_ids is not None:
+            query = query.where(LearningRecord.book_id.in_(book_ids))
+        query = query.group_by(LearningRecord.user_id, LearningRecord.book_id, LearningRecord.status)
+
+        rows = {}
+        for row_user_id, row_book_id, status, count, last_studied_at, today_count in (connection or db.session).execute(query):
+            progress = rows.get((row_user_id, row_book_id))
+            if progress is None:
+                progress = UserBookProgress(user_id=row_user_id, book_id=row_book_id, today_date=now.date())
+                rows[(row_user_id, row_book_id)] = progress
+            if status in UserBookProgress.STATUSES:
+                setattr(progress, f'{status}_count', count)
+            progress.today_count += today_count or 0
+            if last_studied_at and (not progress.last_studied_at or last_studied_at > progress.last_studied_at):
+                progress.last_studied_at = last_studied_at
+        return rows
+
+
+def _row_values(progress):
+    """聚合结果的列值，created_at 和 updated_at 使用列默认值"""
+    return {
+        column.name: getattr(progress, column.name)
+        for column in UserBookProgress.__table__.columns
+        if column.name not in ('id', 'created_at', 'updated_at')
+    }
+
+
+def _insert_missing(rows, connection=None):
+    """插入缺失的进度行，已被并发请求插入的行保持不变"""
+    table = UserBookProgress.__table__
+    if connection is None:
+        connection = db.session.connection()
+    dialect = connection.dialect.name
+    if dialect in UPSERT_DIALECTS:
+        stmt = UPSERT_DIALECTS[dialect](table).on_conflict_do_nothing(index_elements=['user_id', 'book_id'])
+        connection.execute(stmt, rows)
+        return
+    for row in rows:
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(table), row)
+        except IntegrityError:
+            pass
+
+
+def _mark_missing(target):
+    """记录没有进度行的用户和词书，flush 结束后由学习记录聚合生成"""
+    object_session(target).info.setdefault('progress_missing', set()).add((target.user_id, target.book_id))
+
+
+def _apply(connection, user_id, book_id, **values):
+    """在 flush 过程中更新进度行，返回是否存在进度行"""
+    table = UserBookProgress.__table__
+    result = connection.execute(
+        update(table).where(
+            table.c.user_id == user_id,
+            table.c.book_id == book_id
+        ).values(updated_at=datetime.utcnow(), **values)
+    )
+    return result.rowcount > 0
+
+
+def _delta(status, amount):
+    if status not in UserBookProgress.STATUSES:
+        return {}
+    column = UserBookProgress.__table__.c[f'{status}_count']
+    return {column.name: column + amount}
+
+
+@event.listens_for(LearningRecord, 'after_insert')
+def _record_inserted(mapper, connection, target):
+    table = UserBookProgress.__table__
+    now = datetime.utcnow()
+    today = now.date()
+    values = dict(
+        last_studied_at=now,
+        today_count=case((table.c.today_date == today, table.c.today_count + 1), else_=1),
+        today_date=today,
+        **_delta(target.status, 1)
+    )
+    if not _apply(connection, target.user_id, target.book_id, **values):
+        _mark_missing(target)
+
+
+@event.listens_for(LearningRecord, 'after_update')
+def _record_updated(mapper, connection, target):
+    history = inspect(target).attrs.status.history
+    values = {'last_studied_at': datetime.utcnow()}
+    if history.has_changes():
+        for old_status in history.deleted or ():
+            values.update(_delta(old_status, -1))
+        values.update(_delta(target.status, 1))
+    if not _apply(connection, target.user_id, target.book_id, **values):
+        _mark_missing(target)
+
+
+@event.listens_for(LearningRecord, 'after_delete')
+def _record_deleted(mapper, connection, target):
+    values = _delta(target.status, -1)
+    if values and not _apply(connection, target.user_id, target.book_id, **values):
+        _mark_missing(target)
+
+
+@event.listens_for(Session, 'after_flush')
+def _insert_flushed(session, flush_context):
+    """为本次 flush 中没有进度行的用户和词书生成进度行，与学习记录在同一事务中提交
+
+    同一批插入的 after_insert 在整批写入后才触发，在单条记录的事件中聚合会重复计入同批的其他记录，
+    所以在全部记录写入后按用户和词书各聚合一次。
+    """
+    missing = session.info.pop('progress_missing', None)
+    if not missing:
+        return
+    connection = session.connection()
+    table = UserBookProgress.__table__
+    # 先插入空行：并发事务已插入同一行时等待其提交，之后的聚合同时包含双方的学习记录
+    _insert_missing([{'user_id': user_id, 'book_id': book_id} for user_id, book_id in sorted(missing)], connection)
+    for user_id, book_id in sorted(missing):
+        built = ProgressService._build(user_id, [book_id], connection=connection)
+        values = _row_values(built.get((user_id, book_id), UserBookProgress(user_id=user_id, book_id=book_id)))
+        connection.execute(
+            update(table).where(
+                table.c.user_id == user_id,
+                table.c.book_id == book_id
+            ).values(updated_at=datetime.utcnow(), **values)
+        )
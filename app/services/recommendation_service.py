@@ -1,23 +1,27 @@
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import func, update, insert
+from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models.vocabulary import VocabularyBook, WordRelation
 from app.models.word import Word
-from app.models.learning import LearningRecord
+from app.models.learning import LearningRecord, LearningFrontier
 from app.models.assessment import UserLevelAssessment
+from app.services.progress_service import UPSERT_DIALECTS
 
 class RecommendationService:
     """推荐服务"""
     
     @staticmethod
-    def get_recommended_words(user_id: int, book_id: int = None, limit: int = 20) -> List[Dict[str, Any]]:
+    def get_recommended_words(user_id: int, book_id: int = None, limit: int = 20,
+                              use_frontier: bool = False) -> List[Dict[str, Any]]:
         """获取推荐单词
         
         Args:
             user_id: 用户ID
             book_id: 词书ID（可选）
             limit: 返回数量限制
+            use_frontier: 是否使用新词推进位置（仅在指定词书时生效），推进位置在当前事务中写入，由调用方提交
             
         Returns:
             推荐单词列表
@@ -31,21 +35,34 @@ class RecommendationService:
         if not assessment:
             raise ValueError('No assessment found for the user')
             
-        # 获取已学习的单词ID列表
-        learned_word_ids = db.session.query(LearningRecord.word_id).filter_by(
-            user_id=user_id
-        ).all()
-        learned_word_ids = [w[0] for w in learned_word_ids]
-        
-        # 查询新单词
-        query = Word.query
-        if book_id:
-            query = query.join(WordRelation).filter(WordRelation.book_id == book_id)
-        if learned_word_ids:
-            query = query.filter(~Word.id.in_(learned_word_ids))
-            
-        words = query.limit(limit).all()
-        return [word.to_dict() for word in words]
+        # 已学习的单词用 NOT EXISTS 反连接排除，避免把全部单词ID传回数据库
+        learned = db.session.query(LearningRecord.id).filter(
+            LearningRecord.user_id == user_id,
+            LearningRecord.word_id == Word.id
+        ).exists()
+        query = Word.query.filter(~learned)
+
+        if not book_id:
+            words = query.order_by(Word.id).limit(limit).all()
+            return [word.to_dict() for word in words]
+
+        query = query.join(WordRelation).filter(WordRelation.book_id == book_id)
+
+        frontier = None
+        if use_frontier:
+            frontier = LearningFrontier.query.filter_by(user_id=user_id, book_id=book_id).first()
+            if frontier:
+                query = query.filter(WordRelation.order > frontier.last_order)
+
+        rows = query.add_columns(WordRelation.order).order_by(
+            WordRelation.order, Word.id
+        ).limit(limit).all()
+
+        # 第一个未学单词之前的单词都已学过，推进位置随之前移
+        if use_frontier and rows and rows[0][1] is not None:
+            _advance_frontier(user_id, book_id, rows[0][1] - 1)
+
+        return [word.to_dict() for word, _ in rows]
     
     @staticmethod
     def get_review_words(user_id: int, book_id: int = None) -> List[Dict[str, Any]]:
@@ -111,7 +128,7 @@ class RecommendationService:
         ).count()
         
         # 获取词书信息
-        book = VocabularyBook.query.get_or_404(book_id)
+        book = VocabularyBook.get_active_or_404(book_id)
         
         return {
             'book_name': book.name,
@@ -119,4 +136,36 @@ class RecommendationService:
             'review_words': review_count,
             'learned_today': learned_today,
             'remaining_today': max(20 - learned_today, 0)  # 假设每日目标20个单词
-        } 
\ No newline at end of file
+        }
+
+
+def _advance_frontier(user_id, book_id, last_order):
+    """把推进位置前移到 last_order，只前移不后退；并发请求同时插入时不违反唯一约束"""
+    table = LearningFrontier.__table__
+    now = datetime.utcnow()
+    dialect = db.session.get_bind().dialect.name
+    if dialect in UPSERT_DIALECTS:
+        stmt = UPSERT_DIALECTS[dialect](table).values(
+            user_id=user_id, book_id=book_id, last_order=last_order, created_at=now, updated_at=now
+        )
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id', 'book_id'],
+            set_={'last_order': stmt.excluded.last_order, 'updated_at': stmt.excluded.updated_at},
+            where=table.c.last_order < stmt.excluded.last_order
+        ))
+        return
+    result = db.session.execute(
+        update(table).where(
+            table.c.user_id == user_id,
+            table.c.book_id == book_id,
+            table.c.last_order < last_order
+        ).values(last_order=last_order, updated_at=now)
+    )
+    if result.rowcount == 0:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(table).values(
+                    user_id=user_id, book_id=book_id, last_order=last_order, created_at=now, updated_at=now
+                ))
+        except IntegrityError:
+            pass
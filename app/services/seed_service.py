@@ -0,0 +1,376 @@
+import random
+from typing import Dict, Any, List, Callable
+from datetime import datetime, timedelta
+from itertools import islice
+from operator import itemgetter
+from sqlalchemy import insert, select, Integer, Float, String, Boolean, DateTime
+from app import db
+from app.models.user import User
+from app.models.word import Word
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.learning_record import LearningRecord
+from app.models.learning import LearningFrontier
+from app.models.test import Test, TestQuestion, TestRecord, TestAnswer
+from app.services.password_service import PasswordService
+from app.services.progress_service import ProgressService
+
+SYLLABLES = (
+    'ab', 'ac', 'al', 'an', 'ar', 'at', 'ba', 'be', 'bi', 'bo', 'ca', 'ce', 'ci', 'co', 'da', 'de', 'di', 'do',
+    'el', 'en', 'er', 'es', 'fa', 'fe', 'fi', 'fo', 'ga', 'ge', 'gi', 'go', 'ha', 'he', 'hi', 'ho', 'il', 'in',
+    'is', 'it', 'la', 'le', 'li', 'lo', 'ma', 'me', 'mi', 'mo', 'na', 'ne', 'ni', 'no', 'ol', 'on', 'or', 'os',
+    'pa', 'pe', 'pi', 'po', 'ra', 're', 'ri', 'ro', 'sa', 'se', 'si', 'so', 'ta', 'te', 'ti', 'to', 'un', 'ur',
+    'va', 've', 'vi', 'vo', 'za', 'ze', 'zi', 'zo', 'tion', 'ment', 'ness', 'ity', 'ous', 'ive', 'able', 'ly'
+)
+PARTS_OF_SPEECH = ('n.', 'v.', 'adj.', 'adv.')
+LEVELS = ('beginner', 'intermediate', 'advanced')
+REVIEW_INTERVALS = (1, 2, 4, 7, 15, 30, 60, 120)  # 第 n 次复习后的间隔天数
+MASTERED_REVIEWS = 6  # 复习次数达到该值视为已掌握
+SEED_PASSWORD = 'password123'
+
+class SeedService:
+    """合成数据生成服务
+
+    用于压测和基准测试：生成用户、词书、学习记录和测试，全部分块批量插入。
+    相同的 seed 和参数在空库上生成完全相同的数据，时间以当天零点为基准。
+    每个用户按随机顺序学习若干词书，在每本词书中学习开头的连续单词；越早学习的单词复习次数越多，
+    下次复习时间按间隔 1、2、4、7、15、30... 天分布，部分记录已过复习时间。
+    """
+
+    CHUNK_SIZE = 10000
+
+    @staticmethod
+    def seed(seed: int = 42, users: int = 100, books: int = 10, min_words: int = 1000, max_words: int = 50000,
+             records: int = 1000000, tests_per_user: int = 2, questions_per_test: int = 20,
+             prefix: str = 'seed', chunk_size: int = CHUNK_SIZE, now: datetime = None,
+             on_progress: Callable[[str, int], None] = None) -> Dict[str, int]:
+        """生成合成数据
+
+        Args:
+            seed: 随机种子
+            users: 用户数，用户名为 <prefix>_user_<n>，密码为 password123
+            books: 词书数，属于随机用户
+            min_words: 每本词书最少单词数
+            max_words: 每本词书最多单词数，也是单词总数
+            records: 学习记录总数，平均分配给用户，词书单词不足时按实际数量
+            tests_per_user: 每个用户的测试数，约 80% 已完成并有答题记录
+            questions_per_test: 每个测试的题目数
+            prefix: 用户名和词书名前缀
+            chunk_size: 每批插入行数
+            now: 时间基准，默认为当天零点
+            on_progress: 每批完成后的回调，参数为表名和该表累计行数
+
+        Returns:
+            各表插入的行数
+
+        Raises:
+            ValueError: 参数无效或该前缀的用户已存在
+        """
+        if users <= 0 or books <= 0 or not 0 < min_words <= max_words:
+            raise ValueError('users and books must be positive and 0 < min_words <= max_words')
+        if db.session.query(User.id).filter(User.username.like(f'{prefix}\\_user\\_%', escape='\\')).first():
+            raise ValueError(f'Users with prefix {prefix!r} already exist')
+
+        rng = random.Random(seed)
+        now = now or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        stats = {}
+        ctx = {'rng': rng, 'now': now, 'chunk_size': chunk_size, 'stats': stats, 'on_progress': on_progress}
+
+        user_ids = _seed_users(ctx, prefix, users)
+        words = _seed_words(ctx, max_words)
+        book_words = _seed_books(ctx, prefix, books, user_ids, words, min_words, max_words)
+        studied = _seed_records(ctx, user_ids, book_words, records)
+        _seed_tests(ctx, user_ids, studied, words, tests_per_user, questions_per_test)
+        db.session.commit()
+
+        for user_id in user_ids:
+            ProgressService.rebuild(user_id)
+        return stats
+
+
+def _insert(ctx, model, rows, returning=None):
+    """分块插入，returning 为列名时按插入顺序返回该列的值"""
+    table = model.__table__
+    stats, ids = ctx['stats'], []
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, ctx['chunk_size']))
+        if not chunk:
+            break
+        if returning:
+            statement = insert(table).returning(table.c[returning], sort_by_parameter_order=True)
+            ids.extend(db.session.execute(statement, chunk).scalars())
+        else:
+            _executemany(table, chunk)
+        stats[table.name] = stats.get(table.name, 0) + len(chunk)
+        if ctx['on_progress']:
+            ctx['on_progress'](table.name, stats[table.name])
+    return ids
+
+
+def _executemany(table, rows):
+    """批量插入不需要返回值的行
+
+    简单类型的列直接交给驱动 executemany，跳过 SQLAlchemy 的逐行参数处理，百万行时快数倍；
+    其他情况使用 Core 插入。
+    """
+    connection = db.session.connection()
+    dialect = connection.dialect
+    columns = list(rows[0])
+    types = [table.c[column].type for column in columns]
+    if (dialect.paramstyle not in ('qmark', 'format', 'pyformat')
+            or not all(isinstance(type_, (Integer, Float, String, Boolean, DateTime)) for type_ in types)):
+        db.session.execute(insert(table), rows)
+        return
+
+    quote = dialect.identifier_preparer.quote
+    placeholder = '?' if dialect.paramstyle == 'qmark' else '%s'
+    sql = (f'INSERT INTO {quote(table.name)} ({", ".join(quote(column) for column in columns)}) '
+           f'VALUES ({", ".join([placeholder] * len(columns))})')
+
+    getter = itemgetter(*columns)
+    params = [getter(row) for row in rows] if len(columns) > 1 else [(row[columns[0]],) for row in rows]
+    if dialect.name == 'sqlite':
+        # 与 SQLAlchemy 的 SQLite DateTime 存储格式一致：带微秒的 ISO 字符串
+        indexes = [i for i, type_ in enumerate(types) if isinstance(type_, DateTime)]
+        if indexes:
+            params = [_format_datetimes(values, indexes) for values in params]
+    connection.exec_driver_sql(sql, params)
+
+
+def _format_datetimes(values, indexes):
+    values = list(values)
+    for i in indexes:
+        if values[i] is not None:
+            values[i] = values[i].isoformat(' ', 'microseconds')
+    return tuple(values)
+
+
+def _seed_users(ctx, prefix, count):
+    now = ctx['now']
+    # 所有用户共用一个哈希，避免生成时逐个计算
+    password_hash = PasswordService.hash(SEED_PASSWORD)
+    rows = ({
+        'username': f'{prefix}_user_{n}',
+        'email': f'{prefix}_user_{n}@example.com',
+        'password_hash': password_hash,
+        'created_at': now - timedelta(days=365),
+        'updated_at': now
+    } for n in range(1, count + 1))
+    return _insert(ctx, User, rows, returning='id')
+
+
+def _seed_words(ctx, count):
+    """生成 count 个不重复的伪单词，已存在的单词直接复用，返回 [(id, text, definition)]"""
+    rng, now = ctx['rng'], ctx['now']
+    texts, seen = [], set()
+    while len(texts) < count:
+        text = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if text not in seen:
+            seen.add(text)
+            texts.append(text)
+    definitions = [f'{rng.choice(PARTS_OF_SPEECH)} {text} 的释义' for text in texts]
+
+    table = Word.__table__
+    existing = {}
+    for start in range(0, count, 500):
+        existing.update(db.session.execute(
+            select(table.c.text_key, table.c.id).where(table.c.text_key.in_(texts[start:start + 500]))
+        ).all())
+
+    new = [i for i, text in enumerate(texts) if text not in existing]
+    ids = _insert(ctx, Word, ({
+        'text': texts[i],
+        'text_key': texts[i],
+        'phonetic': f'/{texts[i]}/',
+        'definition': definitions[i],
+        'example': f'This is an example of {texts[i]}.',
+        'difficulty_level': round(rng.uniform(1, 5), 1),
+        'created_at': now,
+        'updated_at': now
+    } for i in new), returning='id')
+    existing.update(zip((texts[i] for i in new), ids))
+    return [(existing[text], text, definition) for text, definition in zip(texts, definitions)]
+
+
+def _seed_books(ctx, prefix, count, user_ids, words, min_words, max_words):
+    """生成词书和单词关联，返回 {book_id: [(word_id, order), ...]}"""
+    rng, now = ctx['rng'], ctx['now']
+    sizes = [rng.randint(min_words, max_words) for _ in range(count)]
+    book_ids = _insert(ctx, VocabularyBook, ({
+        'name': f'{prefix} book {n}',
+        'description': f'Synthetic book with {size} words',
+        'level': rng.choice(LEVELS),
+        'total_words': size,
+        'user_id': rng.choice(user_ids),
+        'created_at': now - timedelta(days=400),
+        'updated_at': now
+    } for n, size in enumerate(sizes, 1)), returning='id')
+
+    book_words = {}
+    for book_id, size in zip(book_ids, sizes):
+        indexes = rng.sample(range(len(words)), size)
+        book_words[book_id] = [(words[i][0], (position + 1) * WordRelation.ORDER_GAP)
+                               for position, i in enumerate(indexes)]
+    _insert(ctx, WordRelation, ({
+        'word_id': word_id,
+        'book_id': book_id,
+        'order': order,
+        'created_at': now,
+        'updated_at': now
+    } for book_id, entries in book_words.items() for word_id, order in entries))
+    return book_words
+
+
+def _seed_records(ctx, user_ids, book_words, total):
+    """生成学习记录和新词推进位置，返回 {user_id: [(book_id, [word_id, ...]), ...]}"""
+    rng = ctx['rng']
+    studied = {}
+    plans = []
+    per_user, remainder = divmod(total, len(user_ids))
+    for n, user_id in enumerate(user_ids):
+        budget = per_user + (1 if n < remainder else 0)
+        order = list(book_words)
+        rng.shuffle(order)
+        studied[user_id] = []
+        for book_id in order:
+            if budget <= 0:
+                break
+            entries = book_words[book_id][:budget]
+            budget -= len(entries)
+            studied[user_id].append((book_id, [word_id for word_id, _ in entries]))
+            plans.append((user_id, book_id, entries, rng.uniform(7, 365)))
+
+    def rows():
+        for user_id, book_id, entries, span_days in plans:
+            yield from _record_rows(ctx, user_id, book_id, entries, span_days)
+
+    _insert(ctx, LearningRecord, rows())
+    now = ctx['now']
+    _insert(ctx, LearningFrontier, ({
+        'user_id': user_id,
+        'book_id': book_id,
+        'last_order': entries[-1][1],
+        'created_at': now,
+        'updated_at': now
+    } for user_id, book_id, entries, _ in plans))
+    return studied
+
+
+def _record_rows(ctx, user_id, book_id, entries, span_days):
+    """一个用户在一本词书中的学习记录，前面的单词学得早、复习多"""
+    rng, now = ctx['rng'], ctx['now']
+    count = len(entries)
+    for position, (word_id, _) in enumerate(entries):
+        age = span_days * (1 - position / count) + rng.random()
+        created_at = now - timedelta(days=age)
+        reviews = min(int(rng.random() * (age / 7 + 1)), len(REVIEW_INTERVALS))
+        if reviews == 0:
+            status, last_review, next_review = 'learning', None, created_at + timedelta(days=1)
+        else:
+            interval = REVIEW_INTERVALS[reviews - 1]
+            # 上次复习距今在 1.5 个间隔内，约三分之一的复习中记录已过复习时间
+            last_review = now - timedelta(days=min(age, rng.uniform(0, 1.5 * interval)))
+            next_review = last_review + timedelta(days=interval)
+            status = 'mastered' if reviews >= MASTERED_REVIEWS else 'reviewing'
+        yield {
+            'user_id': user_id,
+            'book_id': book_id,
+            'word_id': word_id,
+            'status': status,
+            'created_at': created_at,
+            'updated_at': last_review or created_at,
+            'last_review_time': last_review,
+            'next_review_time': next_review,
+            'review_count': reviews,
+            'mastery_level': round(min(1.0, reviews / MASTERED_REVIEWS), 2),
+            'study_time': round(rng.uniform(5, 60) * (reviews + 1), 1)
+        }
+
+
+def _seed_tests(ctx, user_ids, studied, words, tests_per_user, questions_per_test):
+    """生成测试、题目，以及已完成测试的答题记录"""
+    rng, now = ctx['rng'], ctx['now']
+    definitions = {word_id: definition for word_id, _, definition in words}
+    texts = {word_id: text for word_id, text, _ in words}
+    all_definitions = [definition for _, _, definition in words]
+
+    tests: List[Dict[str, Any]] = []
+    questions: List[List[Dict[str, Any]]] = []
+    for user_id in user_ids:
+        for n in range(tests_per_user):
+            if not studied[user_id]:
+                break
+            book_id, word_ids = rng.choice(studied[user_id])
+            chosen = rng.sample(word_ids, min(questions_per_test, len(word_ids)))
+            start = now - timedelta(days=rng.uniform(0, 90))
+            completed = rng.random() < 0.8
+
+            items = []
+            for word_id in chosen:
+                answer = definitions[word_id]
+                options = rng.sample(all_definitions, 3) + [answer]
+                rng.shuffle(options)
+                correct = completed and rng.random() < 0.7
+                items.append({
+                    'word_id': word_id,
+                    'question_type': 'choice',
+                    'question': f'{texts[word_id]} 的释义是？',
+                    'options': options,
+                    'correct_answer': answer,
+                    'user_answer': (answer if correct else rng.choice(options)) if completed else None,
+                    'is_correct': correct,
+                    'score': 1,
+                    'created_at': start,
+                    'updated_at': start
+                })
+            correct_count = sum(item['is_correct'] for item in items)
+            tests.append({
+                'user_id': user_id,
+                'book_id': book_id,
+                'name': f'Test {n + 1}',
+                'test_type': 'choice',
+                'duration': 10,
+                'total_questions': len(items),
+                'score': round(correct_count / len(items) * 100, 1) if completed else None,
+                'correct_answers': correct_count,
+                'start_time': start if completed else None,
+                'end_time': start + timedelta(minutes=rng.uniform(2, 10)) if completed else None,
+                'completed_at': start + timedelta(minutes=10) if completed else None,
+                'status': 'completed' if completed else 'pending',
+                'created_at': start,
+                'updated_at': start
+            })
+            questions.append(items)
+
+    test_ids = _insert(ctx, Test, tests, returning='id')
+    for test_id, items in zip(test_ids, questions):
+        for item in items:
+            item['test_id'] = test_id
+    question_ids = _insert(ctx, TestQuestion, (item for items in questions for item in items), returning='id')
+
+    completed = [(test_id, test, items) for test_id, test, items in zip(test_ids, tests, questions)
+                 if test['status'] == 'completed']
+    record_ids = _insert(ctx, TestRecord, ({
+        'test_id': test_id,
+        'user_id': test['user_id'],
+        'start_time': test['start_time'],
+        'end_time': test['end_time'],
+        'score': int(test['score']),
+        'correct_count': test['correct_answers'],
+        'status': 'completed',
+        'created_at': test['start_time'],
+        'updated_at': test['end_time']
+    } for test_id, test, _ in completed), returning='id')
+
+    question_id_iter = iter(question_ids)
+    question_ids_by_test = {test_id: [next(question_id_iter) for _ in items]
+                            for test_id, items in zip(test_ids, questions)}
+    _insert(ctx, TestAnswer, ({
+        'record_id': record_id,
+        'question_id': question_id,
+        'answer': item['user_answer'],
+        'is_correct': item['is_correct'],
+        'created_at': test['end_time'],
+        'updated_at': test['end_time']
+    } for record_id, (test_id, test, items) in zip(record_ids, completed)
+        for question_id, item in zip(question_ids_by_test[test_id], items)))
@@ -5,6 +5,7 @@ from app.models.test import Test, TestQuestion
 from app.models.word import Word
 from app.models.vocabulary import VocabularyBook, WordRelation
 from app.models.learning import LearningRecord
+from app.services.progress_service import ProgressService
 
 class TestService:
     @staticmethod
@@ -25,7 +26,7 @@ class TestService:
             raise ValueError(f'Invalid test type. Must be one of {valid_types}')
         
         # 获取词书信息
-        book = VocabularyBook.query.get_or_404(book_id)
+        book = VocabularyBook.get_active_or_404(book_id)
         
         # 创建测试记录
         test = Test(
@@ -196,20 +197,13 @@ class TestService:
         Returns:
             dict: 学习进度统计
         """
-        book = VocabularyBook.query.get_or_404(book_id)
+        book = VocabularyBook.get_active_or_404(book_id)
         total_words = book.total_words
         
-        # 获取已掌握的单词数
-        mastered_words = LearningRecord.query.filter_by(
-            user_id=user_id,
-            status='mastered'
-        ).join(Word).join(WordRelation).filter(WordRelation.book_id == book_id).count()
-        
-        # 获取正在学习的单词数
-        learning_words = LearningRecord.query.filter_by(
-            user_id=user_id,
-            status='learning'
-        ).join(Word).join(WordRelation).filter(WordRelation.book_id == book_id).count()
+        # 获取已掌握和正在学习的单词数
+        progress = ProgressService.get_progress(user_id, book_id)
+        mastered_words = progress.mastered_count
+        learning_words = progress.learning_count
         
         # 获取最近一次测试成绩
         latest_test = Test.query.filter_by(
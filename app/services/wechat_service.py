@@ -1,42 +1,211 @@
-import requests
+import time
+import threading
 from flask import current_app
+from app.extensions import kv_cache
+from app.utils.http_client import HttpClient
+from app.utils.singleflight import SingleFlight
+
+_client_lock = threading.Lock()
+_flight = SingleFlight()
+
+TOKEN_KEY = 'wechat:token:{}'
+REFRESH_TOKEN_KEY = 'wechat:refresh_token:{}'
+USERINFO_KEY = 'wechat:userinfo:{}'
+USERINFO_LOCK_KEY = 'wechat:userinfo:lock:{}'
 
 class WeChatService:
+    """微信开放平台接口
+
+    请求通过共享的 HttpClient 发出：连接复用、有超时和重试，微信接口持续失败时熔断。
+    网络错误和熔断抛出 UpstreamError，微信返回的业务错误（errcode）原样返回。
+
+    每个 openid 的 access_token、refresh_token 和用户信息缓存在 Redis 中；
+    同一授权码或同一用户信息的并发请求合并为一次上游调用。
+    """
+
     @staticmethod
     def get_access_token(code):
-        """获取微信access_token"""
-        url = 'https://api.weixin.qq.com/sns/oauth2/access_token'
+        """获取微信access_token，授权码只能使用一次，失败时不重试"""
         params = {
             'appid': current_app.config['WECHAT_APP_ID'],
             'secret': current_app.config['WECHAT_APP_SECRET'],
             'code': code,
             'grant_type': 'authorization_code'
         }
-        
-        response = requests.get(url, params=params)
-        return response.json()
+        return _client().get_json('/sns/oauth2/access_token', params=params)
+
+    @staticmethod
+    def refresh_access_token(refresh_token):
+        """用refresh_token刷新access_token"""
+        params = {
+            'appid': current_app.config['WECHAT_APP_ID'],
+            'grant_type': 'refresh_token',
+            'refresh_token': refresh_token
+        }
+        return _client().get_json('/sns/oauth2/refresh_token', params=params, idempotent=True)
     
     @staticmethod
     def get_user_info(access_token, openid):
         """获取微信用户信息"""
-        url = 'https://api.weixin.qq.com/sns/userinfo'
         params = {
             'access_token': access_token,
             'openid': openid,
             'lang': 'zh_CN'
         }
-        
-        response = requests.get(url, params=params)
-        return response.json()
+        return _client().get_json('/sns/userinfo', params=params, idempotent=True)
     
     @staticmethod
     def validate_access_token(access_token, openid):
-        """验证access_token是否有效"""
-        url = 'https://api.weixin.qq.com/sns/auth'
+        """验证access_token是否有效，与缓存中未过期的令牌一致时不请求微信"""
+        cached = kv_cache.get(TOKEN_KEY.format(openid))
+        if cached and cached['access_token'] == access_token:
+            return True
+
         params = {
             'access_token': access_token,
             'openid': openid
         }
-        
-        response = requests.get(url, params=params)
-        return response.json().get('errcode') == 0 
\ No newline at end of file
+        return _client().get_json('/sns/auth', params=params, idempotent=True).get('errcode') == 0
+
+    @staticmethod
+    def login(code):
+        """授权码登录
+
+        Args:
+            code: 微信授权码
+
+        Returns:
+            微信用户信息，失败时为包含 errcode 的微信错误
+
+        Raises:
+            UpstreamError: 微信接口不可用
+        """
+        # 客户端重复提交同一授权码时只兑换一次，授权码只能使用一次
+        token = _flight.do(f'code:{code}', lambda: WeChatService.get_access_token(code))
+        if 'errcode' in token:
+            return token
+        WeChatService.cache_token(token)
+        return WeChatService.get_cached_user_info(token['openid'], token['access_token'])
+
+    @staticmethod
+    def cache_token(token):
+        """缓存access_token和refresh_token，过期时间取自expires_in"""
+        config = current_app.config
+        openid = token['openid']
+        ttl = token.get('expires_in', 7200) - config['WECHAT_TOKEN_EXPIRY_MARGIN']
+        if ttl > 0:
+            kv_cache.set(TOKEN_KEY.format(openid), {'access_token': token['access_token']}, ttl)
+        if token.get('refresh_token'):
+            kv_cache.set(REFRESH_TOKEN_KEY.format(openid), token['refresh_token'], config['WECHAT_REFRESH_TOKEN_TTL'])
+
+    @staticmethod
+    def get_valid_access_token(openid):
+        """获取openid的有效access_token，过期时用refresh_token刷新
+
+        Returns:
+            access_token，没有可用令牌时返回 None
+        """
+        cached = kv_cache.get(TOKEN_KEY.format(openid))
+        if cached:
+            return cached['access_token']
+
+        refresh_token = kv_cache.get(REFRESH_TOKEN_KEY.format(openid))
+        if not refresh_token:
+            return None
+        token = _flight.do(f'refresh:{openid}', lambda: WeChatService.refresh_access_token(refresh_token))
+        if 'errcode' in token:
+            kv_cache.delete(REFRESH_TOKEN_KEY.format(openid))
+            return None
+        WeChatService.cache_token(token)
+        return token['access_token']
+
+    @staticmethod
+    def get_cached_user_info(openid, access_token):
+        """获取用户信息，优先使用缓存
+
+        缓存时间超过 WECHAT_USERINFO_REFRESH_AHEAD 比例后仍返回缓存，同时在后台刷新。
+
+        Args:
+            openid: 用户openid
+            access_token: 缓存未命中时请求微信使用的令牌
+
+        Returns:
+            微信用户信息，失败时为包含 errcode 的微信错误
+        """
+        config = current_app.config
+        entry = kv_cache.get(USERINFO_KEY.format(openid))
+        if entry is None:
+            return _flight.do(f'userinfo:{openid}', lambda: _load_user_info(openid, access_token))
+
+        age = time.time() - entry['fetched_at']
+        if age >= config['WECHAT_USERINFO_TTL'] * config['WECHAT_USERINFO_REFRESH_AHEAD']:
+            _refresh_user_info_in_background(openid)
+        return entry['data']
+
+
+def _client():
+    """当前应用共享的微信接口客户端"""
+    client = current_app.extensions.get('wechat_client')
+    if client is None:
+        with _client_lock:
+            client = current_app.extensions.get('wechat_client')
+            if client is None:
+                client = HttpClient.from_config(current_app.config, 'WECHAT')
+                current_app.extensions['wechat_client'] = client
+    return client
+
+
+def _fetch_user_info(openid, access_token):
+    """请求微信用户信息并写入缓存"""
+    data = WeChatService.get_user_info(access_token, openid)
+    if 'errcode' not in data:
+        kv_cache.set(USERINFO_KEY.format(openid), {'data': data, 'fetched_at': time.time()},
+                     current_app.config['WECHAT_USERINFO_TTL'])
+    return data
+
+
+def _load_user_info(openid, access_token):
+    """缓存未命中时获取用户信息
+
+    先抢占跨进程的锁，抢到的进程请求微信；没抢到的等待缓存被填充，超时后自行请求。
+    """
+    lock_key = USERINFO_LOCK_KEY.format(openid)
+    wait = current_app.config['WECHAT_COALESCE_WAIT']
+    if kv_cache.add(lock_key, 1, wait + current_app.config['WECHAT_READ_TIMEOUT']):
+        try:
+            return _fetch_user_info(openid, access_token)
+        finally:
+            kv_cache.delete(lock_key)
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = kv_cache.get(USERINFO_KEY.format(openid))
+        if entry is not None:
+            return entry['data']
+    return _fetch_user_info(openid, access_token)
+
+
+def _refresh_user_info_in_background(openid):
+    """在后台线程刷新用户信息，同一时间每个用户只刷新一次"""
+    lock_key = USERINFO_LOCK_KEY.format(openid)
+    config = current_app.config
+    if not kv_cache.add(lock_key, 1, config['WECHAT_COALESCE_WAIT'] + config['WECHAT_READ_TIMEOUT']):
+        return None
+
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                access_token = WeChatService.get_valid_access_token(openid)
+                if access_token:
+                    _fetch_user_info(openid, access_token)
+            except Exception:
+                app.logger.exception('Failed to refresh WeChat user info for %s', openid)
+            finally:
+                kv_cache.delete(lock_key)
+
+    thread = threading.Thread(target=run, name=f'wechat-userinfo-{openid}', daemon=True)
+    thread.start()
+    return thread
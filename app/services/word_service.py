@@ -0,0 +1,199 @@
+from typing import Dict, Optional
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import select, update, delete
+from app import db
+from app.models.word import Word
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.learning_record import LearningRecord
+from app.models.learning import ReviewPlan, LearningFrontier
+from app.models.assessment import AssessmentQuestion
+from app.models.test import TestQuestion
+from app.models.word_bitset import WordBitset
+from app.utils.lru import LRUCache
+from app.utils.metrics import record_cache
+
+STATUS_RANK = {'learning': 0, 'reviewing': 1, 'mastered': 2}  # 合并学习记录时保留更靠后的状态
+
+class WordService:
+    """单词词典服务
+
+    单词按规范化文本 text_key 唯一，查找走唯一索引，并在进程内缓存规范化文本到单词ID的映射。
+    """
+
+    @staticmethod
+    def find_by_text(text: str) -> Optional[Word]:
+        """按规范化文本查找单词
+
+        Args:
+            text: 单词文本
+
+        Returns:
+            单词，不存在时返回 None
+        """
+        key = Word.normalize(text)
+        cache = _cache()
+
+        word_id = cache.get(key)
+        record_cache('word_key', word_id is not None)
+        if word_id is not None:
+            word = db.session.get(Word, word_id)
+            if word is not None:
+                return word
+            # 单词已被删除或合并
+            cache.pop(key)
+
+        word = Word.query.filter_by(text_key=key).first()
+        if word is not None:
+            cache.set(key, word.id)
+        return word
+
+    @staticmethod
+    def get_or_create(text: str, definition: str, phonetic: str = None, example: str = None) -> Word:
+        """查找单词，不存在时创建
+
+        Args:
+            text: 单词文本
+            definition: 释义
+            phonetic: 音标（可选）
+            example: 例句（可选）
+
+        Returns:
+            单词
+        """
+        word = WordService.find_by_text(text)
+        if word is None:
+            word = Word(text=text, definition=definition, phonetic=phonetic, example=example)
+            db.session.add(word)
+            db.session.flush()
+            _cache().set(word.text_key, word.id)
+        return word
+
+    @staticmethod
+    def dedupe() -> Dict[str, int]:
+        """合并规范化文本相同的重复单词
+
+        重复单词的词书关联、学习记录、复习计划和题目改为指向保留的单词，
+        同一词书关联已存在时删除重复的一条，同一学习记录已存在时合并为一条。
+
+        Returns:
+            合并的单词数、删除的词书关联数和合并的学习记录数
+        """
+        groups = defaultdict(list)
+        for word_id, text, text_key in db.session.query(Word.id, Word.text, Word.text_key).order_by(Word.id):
+            groups[Word.normalize(text)].append((word_id, text_key))
+
+        merges = []
+        keys = []
+        for key, words in groups.items():
+            # 优先保留已占用规范化文本的单词，否则保留ID最小的
+            canonical = next((word_id for word_id, text_key in words if text_key == key), words[0][0])
+            merges.extend((word_id, canonical) for word_id, _ in words if word_id != canonical)
+            if all(text_key != key for _, text_key in words):
+                keys.append({'word_id': canonical, 'key': key})
+
+        stats = {'merged': len(merges), 'relations': 0, 'records': 0}
+        users = set()
+        for duplicate, canonical in merges:
+            stats['relations'] += _merge_relations(duplicate, canonical)
+            removed, user_ids = _merge_records(duplicate, canonical)
+            stats['records'] += removed
+            users.update(user_ids)
+            for model in (ReviewPlan, AssessmentQuestion, TestQuestion):
+                table = model.__table__
+                db.session.execute(update(table).where(table.c.word_id == duplicate).values(word_id=canonical))
+
+        words = Word.__table__
+        if merges:
+            db.session.execute(delete(words).where(words.c.id.in_([duplicate for duplicate, _ in merges])))
+        for item in keys:
+            db.session.execute(update(words).where(words.c.id == item['word_id']).values(text_key=item['key']))
+
+        if merges:
+            # 单词ID变化后位图和进度计数由学习记录重新生成，推进位置之前可能出现未学的单词
+            from app.services.progress_service import ProgressService
+            db.session.execute(delete(WordBitset.__table__))
+            db.session.execute(delete(LearningFrontier.__table__))
+            db.session.commit()
+            for user_id in users:
+                ProgressService.rebuild(user_id)
+
+        db.session.commit()
+        db.session.expire_all()
+        _cache().clear()
+        return stats
+
+
+def _cache():
+    """当前应用的单词缓存"""
+    cache = current_app.extensions.get('word_key_cache')
+    if cache is None:
+        cache = LRUCache(current_app.config.get('WORD_CACHE_SIZE', 10000))
+        current_app.extensions['word_key_cache'] = cache
+    return cache
+
+
+def _merge_relations(duplicate, canonical):
+    """把重复单词的词书关联改为保留的单词，返回删除的关联数"""
+    table = WordRelation.__table__
+    books = VocabularyBook.__table__
+    existing = select(table.c.book_id).where(table.c.word_id == canonical)
+    conflicts = db.session.execute(
+        select(table.c.id, table.c.book_id).where(
+            table.c.word_id == duplicate,
+            table.c.book_id.in_(existing)
+        )
+    ).all()
+
+    if conflicts:
+        db.session.execute(delete(table).where(table.c.id.in_([row.id for row in conflicts])))
+        for row in conflicts:
+            db.session.execute(
+                update(books).where(books.c.id == row.book_id, books.c.total_words > 0)
+                .values(total_words=books.c.total_words - 1)
+            )
+    db.session.execute(update(table).where(table.c.word_id == duplicate).values(word_id=canonical))
+    return len(conflicts)
+
+
+def _merge_records(duplicate, canonical):
+    """把重复单词的学习记录改为保留的单词，返回合并的记录数和涉及的用户
+
+    同一用户同一词书两个单词都有记录时合并为保留单词的一条：
+    取更靠后的状态、较大的复习次数和掌握度、较晚的上次复习时间和较早的下次复习时间，学习时长相加。
+    """
+    table = LearningRecord.__table__
+    other = table.alias()
+    conflicts = db.session.execute(
+        select(table, other.c.id.label('canonical_id')).join(
+            other,
+            (other.c.word_id == canonical) & (other.c.user_id == table.c.user_id) &
+            (other.c.book_id == table.c.book_id)
+        ).where(table.c.word_id == duplicate)
+    ).all()
+
+    for row in conflicts:
+        kept = db.session.execute(select(table).where(table.c.id == row.canonical_id)).one()
+        db.session.execute(update(table).where(table.c.id == kept.id).values(_merged_values(kept, row)))
+    if conflicts:
+        db.session.execute(delete(table).where(table.c.id.in_([row.id for row in conflicts])))
+    db.session.execute(update(table).where(table.c.word_id == duplicate).values(word_id=canonical))
+    return len(conflicts), {row.user_id for row in conflicts}
+
+
+def _merged_values(kept, removed):
+    """两条学习记录合并后的字段值"""
+    def pick(func, *values):
+        values = [value for value in values if value is not None]
+        return func(values) if values else None
+
+    return {
+        'status': max(kept.status, removed.status, key=lambda status: STATUS_RANK.get(status, 0)),
+        'review_count': pick(max, kept.review_count, removed.review_count),
+        'mastery_level': pick(max, kept.mastery_level, removed.mastery_level),
+        'last_review_time': pick(max, kept.last_review_time, removed.last_review_time),
+        'next_review_time': pick(min, kept.next_review_time, removed.next_review_time),
+        'created_at': pick(min, kept.created_at, removed.created_at),
+        'updated_at': pick(max, kept.updated_at, removed.updated_at),
+        'study_time': (kept.study_time or 0) + (removed.study_time or 0),
+    }
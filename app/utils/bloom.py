@@ -0,0 +1,39 @@
+import math
+import hashlib
+
+
+class BloomFilter:
+    """布隆过滤器
+
+    判断为不存在时一定不存在，判断为存在时有 error_rate 左右的概率误判；
+    用于在访问 Redis 前快速排除绝大多数不在集合中的键。
+
+    Args:
+        capacity: 预计元素个数
+        error_rate: 元素个数达到 capacity 时的误判率
+    """
+
+    def __init__(self, capacity=10000, error_rate=0.01):
+        capacity = max(int(capacity), 1)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # 双重哈希：由一次 blake2b 的两个 64 位整数生成 k 个位置
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self):
+        return self.count
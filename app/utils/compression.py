@@ -0,0 +1,107 @@
+import zlib
+from flask import current_app, request
+from app.utils.lru import LRUCache
+from app.utils.metrics import record_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 未安装 brotli 时只提供 gzip
+    brotli = None
+
+
+class _BrotliStream:
+    """与 zlib 压缩对象接口一致的 brotli 流式压缩"""
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class Compressor:
+    """响应压缩
+
+    按 Accept-Encoding 协商 br 或 gzip，只压缩 COMPRESS_MIMETYPES 中的类型且不小于 COMPRESS_MIN_SIZE 的响应；
+    流式响应逐块压缩。带 ETag 的响应内容由版本决定，压缩结果按 ETag 缓存，同一版本只压缩一次。
+    """
+
+    def __init__(self, app=None):
+        self.cache = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.cache = LRUCache(app.config['COMPRESS_CACHE_SIZE'])
+        app.extensions['compressor'] = self
+        app.after_request(self.after_request)
+
+    def encodings(self):
+        """服务端支持的编码，按优先顺序"""
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def after_request(self, response):
+        config = current_app.config
+
+        if (not config['COMPRESS_ENABLED']
+                or response.mimetype not in config['COMPRESS_MIMETYPES']
+                or not 200 <= response.status_code < 300
+                or response.status_code == 204
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(self.encodings())
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            # 压缩对象在请求上下文中创建，生成器迭代时可能已离开上下文
+            response.response = self._stream(response.iter_encoded(), self._open(encoding))
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config['COMPRESS_MIN_SIZE']:
+                return response
+            response.set_data(self._compress_cached(response, data, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        # 压缩后的字节不同，强 ETag 降为弱 ETag
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        """一次性压缩"""
+        stream = self._open(encoding)
+        return stream.compress(data) + stream.flush()
+
+    def _compress_cached(self, response, data, encoding):
+        etag, _ = response.get_etag()
+        if not etag:
+            return self.compress(data, encoding)
+
+        key = (etag, encoding, len(data))
+        body = self.cache.get(key)
+        record_cache('compressed_body', body is not None)
+        if body is None:
+            body = self.compress(data, encoding)
+            self.cache.set(key, body)
+        return body
+
+    def _stream(self, chunks, stream):
+        for chunk in chunks:
+            data = stream.compress(chunk)
+            if data:
+                yield data
+        yield stream.flush()
+
+    def _open(self, encoding):
+        if encoding == 'br':
+            return _BrotliStream(current_app.config['COMPRESS_BROTLI_QUALITY'])
+        return zlib.compressobj(current_app.config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
@@ -0,0 +1,27 @@
+from flask import Response, stream_with_context
+from app.services.export_service import ExportService
+
+def stream_export(rows, fmt, columns, filename, compress=False):
+    """构造流式导出响应
+
+    Args:
+        rows: 行字典迭代器
+        fmt: 输出格式（ndjson 或 csv）
+        columns: 输出列
+        filename: 下载文件名（不含扩展名）
+        compress: 是否 gzip 压缩
+
+    Returns:
+        流式响应
+    """
+    body = ExportService.encode(rows, fmt, columns)
+    filename = f'{filename}.{fmt}'
+    mimetype = ExportService.FORMATS[fmt]
+    if compress:
+        body = ExportService.gzip(body)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
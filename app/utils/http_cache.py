@@ -0,0 +1,61 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+from flask import current_app, request
+
+class Validators(NamedTuple):
+    """条件请求的校验值"""
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def make_validators(*version, last_modified: datetime = None) -> Validators:
+    """由资源版本生成校验值
+
+    版本通常是一次聚合查询得到的行数和 updated_at 最大值，请求路径和查询参数也计入 ETag，
+    同一资源的不同分页、筛选结果互不影响。
+
+    Args:
+        version: 能标识资源内容的值
+        last_modified: 资源最后修改时间（UTC），删除无法反映到该时间时传 None
+
+    Returns:
+        校验值
+    """
+    source = repr((request.path, request.query_string, version)).encode('utf-8')
+    etag = hashlib.sha1(source).hexdigest()
+    if last_modified is not None:
+        # HTTP 日期精确到秒
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+    return Validators(etag, last_modified)
+
+
+def not_modified(validators: Validators):
+    """客户端缓存仍然有效时返回 304 响应，否则返回 None
+
+    同时带 If-None-Match 和 If-Modified-Since 时只比较 ETag。
+    """
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(validators.etag)
+    elif request.if_modified_since and validators.last_modified:
+        matched = validators.last_modified <= request.if_modified_since
+    else:
+        matched = False
+
+    if not matched:
+        return None
+    return with_validators(current_app.response_class(status=304), validators)
+
+
+def with_validators(response, validators: Validators):
+    """为响应设置 ETag 和 Last-Modified
+
+    响应按用户区分，只允许客户端缓存，每次使用前都要重新验证。
+    """
+    response.set_etag(validators.etag, weak=True)
+    if validators.last_modified is not None:
+        response.last_modified = validators.last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Authorization')
+    return response
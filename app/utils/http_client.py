@@ -0,0 +1,138 @@
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+class UpstreamError(Exception):
+    """上游服务请求失败"""
+
+
+class CircuitOpenError(UpstreamError):
+    """熔断器打开，暂停请求上游服务"""
+
+
+class CircuitBreaker:
+    """熔断器
+
+    连续失败达到阈值后打开，reset_timeout 秒内的请求直接失败；
+    超时后放行一个试探请求（半开），成功则关闭，失败则重新打开。
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def before_request(self):
+        """请求前检查，熔断时抛出 CircuitOpenError"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return
+            if state == 'half-open' and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError('Circuit breaker is open')
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class HttpClient:
+    """带连接池、超时、重试和熔断的 JSON HTTP 客户端
+
+    所有请求共用一个 Session，连接保持复用；连接池满时等待空闲连接而不是新建连接。
+    幂等请求在连接失败、超时和 5xx 响应时按指数退避加随机抖动重试，重试用尽计为一次失败；
+    非幂等请求（如一次性授权码换取令牌）可能已被上游处理，不重试。
+    """
+
+    def __init__(self, base_url, connect_timeout=3.0, read_timeout=5.0, retries=2, backoff=0.2,
+                 pool_size=10, breaker=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_config(cls, config, prefix):
+        """按配置项前缀创建客户端，如 WECHAT_API_BASE、WECHAT_CONNECT_TIMEOUT"""
+        return cls(
+            config[f'{prefix}_API_BASE'],
+            connect_timeout=config[f'{prefix}_CONNECT_TIMEOUT'],
+            read_timeout=config[f'{prefix}_READ_TIMEOUT'],
+            retries=config[f'{prefix}_RETRIES'],
+            backoff=config[f'{prefix}_RETRY_BACKOFF'],
+            pool_size=config[f'{prefix}_POOL_SIZE'],
+            breaker=CircuitBreaker(config[f'{prefix}_BREAKER_THRESHOLD'], config[f'{prefix}_BREAKER_RESET']),
+        )
+
+    def get_json(self, path, params=None, idempotent=False):
+        """GET 请求并解析 JSON
+
+        Args:
+            path: 相对 base_url 的路径
+            params: 查询参数
+            idempotent: 重复请求是否安全，只有幂等请求失败时重试
+
+        Returns:
+            响应 JSON
+
+        Raises:
+            CircuitOpenError: 熔断中
+            UpstreamError: 重试用尽仍失败，或响应不是 JSON
+        """
+        self.breaker.before_request()
+        url = self.base_url + path
+        retries = self.retries if idempotent else 0
+
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code >= 500:
+                    raise UpstreamError(f'{url} returned HTTP {response.status_code}')
+                data = response.json()
+            except ValueError as e:
+                # 响应不是 JSON 或请求参数无效，重试没有意义
+                self.breaker.record_failure()
+                raise UpstreamError(f'{url}: {e}') from e
+            except (requests.RequestException, UpstreamError) as e:
+                if attempt < retries:
+                    # 全抖动退避，避免大量请求同时重试
+                    time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+                    continue
+                self.breaker.record_failure()
+                raise UpstreamError(str(e)) from e
+
+            self.breaker.record_success()
+            return data
+
+    def close(self):
+        self.session.close()
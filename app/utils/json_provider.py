@@ -0,0 +1,80 @@
+import json
+import uuid
+import dataclasses
+from datetime import date, datetime, time
+from decimal import Decimal
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 未安装 orjson 时退回标准库
+    orjson = None
+
+
+def _default(o):
+    """序列化 JSON 不直接支持的类型"""
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, (Decimal, uuid.UUID)):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+class FastJSONProvider(JSONProvider):
+    """基于 orjson 的 JSON 提供者
+
+    datetime/date 由 orjson 直接输出为 ISO 8601 字符串，与模型 to_dict 的 isoformat() 结果一致，
+    响应体直接使用 orjson 生成的 bytes。未安装 orjson，或遇到 orjson 不支持的值（如超过 64 位的整数）时
+    退回标准库 json。
+    """
+
+    mimetype = 'application/json'
+    # 与 DefaultJSONProvider 相同：None 表示调试模式下缩进输出
+    compact = None
+    sort_keys = False
+
+    def dumps_bytes(self, obj, **kwargs) -> bytes:
+        """序列化为 UTF-8 编码的 bytes"""
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.dumps(obj, default=_default, option=self._orjson_options())
+            except orjson.JSONEncodeError:
+                pass
+
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        if self._indent():
+            kwargs.setdefault('indent', 2)
+        else:
+            kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(obj, **kwargs).encode('utf-8')
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+    def _indent(self) -> bool:
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def _orjson_options(self) -> int:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self._indent():
+            option |= orjson.OPT_INDENT_2
+        return option
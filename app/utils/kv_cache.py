@@ -0,0 +1,96 @@
+import json
+import time
+import threading
+import redis
+from flask import current_app
+from app.utils.lru import LRUCache
+from app.utils.http_client import CircuitBreaker, CircuitOpenError
+from app.utils.metrics import observe_redis, record_cache
+
+_UNAVAILABLE = object()
+
+class KVCache:
+    """JSON 键值缓存
+
+    优先使用 Redis，多进程共享；Redis 出错时退回进程内缓存并暂停访问 Redis 一段时间，
+    缓存不可用不会影响请求本身。
+    """
+
+    def __init__(self):
+        self.local = None
+        self.breaker = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.local = LRUCache(app.config['LOCAL_CACHE_SIZE'])
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=app.config['REDIS_RETRY_INTERVAL'])
+        app.extensions['kv_cache'] = self
+
+    def get(self, key):
+        """读取缓存，不存在时返回 None"""
+        value = self._redis(lambda client: client.get(key))
+        if value is _UNAVAILABLE:
+            value = self._local_get(key)
+            record_cache('kv', value is not None)
+            return value
+        record_cache('kv', value is not None)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        """写入缓存，ttl 为秒"""
+        data = json.dumps(value)
+        if self._redis(lambda client: client.set(key, data, ex=max(int(ttl), 1))) is _UNAVAILABLE:
+            self.local.set(key, (time.monotonic() + ttl, value))
+
+    def add(self, key, value, ttl):
+        """键不存在时写入，返回是否写入成功，可用作短时锁"""
+        data = json.dumps(value)
+        added = self._redis(lambda client: client.set(key, data, ex=max(int(ttl), 1), nx=True))
+        if added is not _UNAVAILABLE:
+            return bool(added)
+        with self._lock:
+            if self._local_get(key) is not None:
+                return False
+            self.local.set(key, (time.monotonic() + ttl, value))
+            return True
+
+    def delete(self, key):
+        self._redis(lambda client: client.delete(key))
+        self.local.pop(key)
+
+    def _local_get(self, key):
+        entry = self.local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.local.pop(key)
+            return None
+        return value
+
+    def _redis(self, operation):
+        """执行 Redis 操作，Redis 不可用时返回 _UNAVAILABLE"""
+        try:
+            self.breaker.before_request()
+        except CircuitOpenError:
+            return _UNAVAILABLE
+        try:
+            with observe_redis('kv_cache'):
+                result = operation(get_redis())
+        except redis.RedisError as e:
+            self.breaker.record_failure()
+            current_app.logger.warning('Redis unavailable, using local cache: %s', e)
+            return _UNAVAILABLE
+        self.breaker.record_success()
+        return result
+
+
+def get_redis():
+    """当前应用的 Redis 客户端"""
+    if not hasattr(current_app, 'redis_client'):
+        current_app.redis_client = redis.from_url(
+            current_app.config['REDIS_URL'],
+            socket_timeout=current_app.config['REDIS_SOCKET_TIMEOUT'],
+            socket_connect_timeout=current_app.config['REDIS_SOCKET_TIMEOUT']
+        )
+    return current_app.redis_client
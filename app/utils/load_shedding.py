@@ -0,0 +1,80 @@
+import math
+import time
+import threading
+from collections import deque
+from flask import current_app, jsonify, request
+from sqlalchemy.pool import QueuePool
+
+
+class PoolWaitMonitor:
+    """记录最近一段时间内从连接池取得连接的耗时"""
+
+    def __init__(self, maxlen=1024):
+        self._samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, wait, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._samples.append((now, wait))
+
+    def average(self, window, now=None):
+        """最近 window 秒内的平均等待秒数，没有样本时为 0"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._samples and self._samples[0][0] < now - window:
+                self._samples.popleft()
+            if not self._samples:
+                return 0.0
+            return sum(wait for _, wait in self._samples) / len(self._samples)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+pool_wait_monitor = PoolWaitMonitor()
+
+
+class MonitoredQueuePool(QueuePool):
+    """记录取连接耗时的 QueuePool，连接池耗尽时的排队时间会体现在耗时中，等待超时也计入"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_wait_monitor.record(time.perf_counter() - start)
+
+
+class LoadShedder:
+    """过载保护
+
+    最近 LOADSHED_WINDOW 秒内取数据库连接的平均等待超过 LOADSHED_POOL_WAIT 时，
+    新请求直接返回 503 和 Retry-After，不再排队占用连接；窗口内没有新的慢样本后自动恢复。
+    """
+
+    def __init__(self, monitor=pool_wait_monitor):
+        self.monitor = monitor
+
+    def init_app(self, app):
+        options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+        # SQLite 内存库使用单连接池，只为其他数据库替换连接池
+        if app.config['LOADSHED_ENABLED'] and not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+            options.setdefault('poolclass', MonitoredQueuePool)
+        app.extensions['load_shedder'] = self
+        app.before_request(self.before_request)
+
+    def overloaded(self):
+        config = current_app.config
+        return self.monitor.average(config['LOADSHED_WINDOW']) > config['LOADSHED_POOL_WAIT']
+
+    def before_request(self):
+        config = current_app.config
+        if (not config['LOADSHED_ENABLED'] or request.method == 'OPTIONS'
+                or request.endpoint in config['LOADSHED_EXEMPT_ENDPOINTS'] or not self.overloaded()):
+            return None
+        response = jsonify({'code': 503003, 'message': '服务繁忙，请稍后再试'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(max(1, math.ceil(config['LOADSHED_WINDOW'])))
+        return response
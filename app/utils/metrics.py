@@ -0,0 +1,105 @@
+"""Prometheus 指标
+
+请求延迟直方图和状态码计数按端点名（而不是路径）统计，避免路径参数造成标签爆炸。
+gunicorn 等多进程部署时设置环境变量 PROMETHEUS_MULTIPROC_DIR 为一个空目录，
+/metrics 汇总所有进程写入该目录的指标；并在 gunicorn 配置的 child_exit 中调用
+prometheus_client.multiprocess.mark_process_dead(worker.pid)。
+未安装 prometheus_client 时不注册 /metrics，记录指标的函数为空操作。
+"""
+import os
+import time
+from contextlib import contextmanager
+from flask import Response, g, request
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - 未安装时不提供指标
+    prometheus_client = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REDIS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram('http_request_duration_seconds', '请求处理耗时',
+                                ['method', 'endpoint'], buckets=LATENCY_BUCKETS)
+    REQUEST_COUNT = Counter('http_requests_total', '请求数', ['method', 'endpoint', 'status'])
+    DB_POOL_SIZE = Gauge('db_pool_size', '连接池容量', multiprocess_mode='livesum')
+    DB_POOL_CHECKED_OUT = Gauge('db_pool_checked_out', '已取出的连接数', multiprocess_mode='livesum')
+    DB_POOL_OVERFLOW = Gauge('db_pool_overflow', '超出容量新建的连接数', multiprocess_mode='livesum')
+    REDIS_LATENCY = Histogram('redis_command_duration_seconds', 'Redis 调用耗时',
+                              ['component'], buckets=REDIS_BUCKETS)
+    REDIS_ERRORS = Counter('redis_errors_total', 'Redis 调用失败数', ['component'])
+    CACHE_REQUESTS = Counter('cache_requests_total', '缓存查询数，命中率为 hit / (hit + miss)',
+                             ['cache', 'result'])
+
+
+def record_cache(cache, hit):
+    """记录一次缓存查询"""
+    if prometheus_client is not None:
+        CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+@contextmanager
+def observe_redis(component):
+    """记录 with 块内 Redis 调用的耗时，抛出异常时计为失败"""
+    if prometheus_client is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        REDIS_ERRORS.labels(component).inc()
+        raise
+    finally:
+        REDIS_LATENCY.labels(component).observe(time.perf_counter() - start)
+
+
+class Metrics:
+    """请求指标和 /metrics 端点"""
+
+    def __init__(self):
+        self.db = None
+
+    def init_app(self, app, db):
+        app.extensions['metrics'] = self
+        if not app.config['METRICS_ENABLED']:
+            return
+        if prometheus_client is None:
+            app.logger.warning('prometheus_client is not installed, /metrics is disabled')
+            return
+        self.db = db
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.add_url_rule(app.config['METRICS_PATH'], 'metrics', self.metrics_view)
+
+    def before_request(self):
+        g._metrics_start = time.perf_counter()
+
+    def after_request(self, response):
+        start = g.pop('_metrics_start', None)
+        if start is None or request.endpoint == 'metrics':
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        REQUEST_LATENCY.labels(request.method, endpoint).observe(time.perf_counter() - start)
+        REQUEST_COUNT.labels(request.method, endpoint, str(response.status_code)).inc()
+        self._update_pool_gauges()
+        return response
+
+    def _update_pool_gauges(self):
+        pool = self.db.engine.pool
+        # SQLite 内存库等单连接池没有这些统计
+        if hasattr(pool, 'checkedout'):
+            DB_POOL_SIZE.set(pool.size())
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    def metrics_view(self):
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = prometheus_client.REGISTRY
+        return Response(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,118 @@
+import json
+import time
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import current_app, g, request
+from sqlalchemy import event
+
+_current = ContextVar('query_stats', default=None)
+
+
+class QueryStats:
+    """一段代码执行的 SQL 语句数和数据库耗时
+
+    嵌套统计时语句同时计入外层，测试中包住整个请求也能得到请求内的全部语句。
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0  # 秒
+        self.statements = Counter()
+
+    def record(self, statement, duration):
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.duration += duration
+            stats.statements[statement] += 1
+            stats = stats.parent
+
+    def duplicates(self, threshold):
+        """重复执行不少于 threshold 次的语句，疑似 N+1 查询，按次数降序"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+@contextmanager
+def track_queries():
+    """统计 with 块内执行的 SQL 语句"""
+    stats = QueryStats(_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info['query_start'].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+def instrument_engine(engine):
+    """为引擎注册语句统计事件，重复调用不会重复注册"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+class QueryProfiler:
+    """按请求统计 SQL
+
+    每个请求的语句数和数据库耗时写入 Server-Timing 响应头和一条 JSON 日志；
+    同一语句在一个请求内执行不少于 QUERY_N_PLUS_ONE_THRESHOLD 次时记录警告，提示可能存在 N+1 查询。
+    """
+
+    def init_app(self, app, db):
+        with app.app_context():
+            instrument_engine(db.engine)
+        app.extensions['query_profiler'] = self
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+    def before_request(self):
+        if current_app.config['QUERY_STATS_ENABLED']:
+            g._query_tracker = track_queries()
+            g.query_stats = g._query_tracker.__enter__()
+
+    def after_request(self, response):
+        stats = g.get('query_stats')
+        if stats is None:
+            return response
+        config = current_app.config
+
+        if config['QUERY_SERVER_TIMING']:
+            timing = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+            existing = response.headers.get('Server-Timing')
+            response.headers['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+
+        duplicates = stats.duplicates(config['QUERY_N_PLUS_ONE_THRESHOLD'])
+        if current_app.logger.isEnabledFor(logging.INFO):
+            current_app.logger.info(json.dumps({
+                'event': 'request_queries',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'queries': stats.count,
+                'db_ms': round(stats.duration * 1000, 2),
+                'duplicates': len(duplicates),
+            }, ensure_ascii=False))
+        for statement, count in duplicates:
+            current_app.logger.warning('Possible N+1 query in %s: %d executions of %s',
+                                       request.endpoint, count, ' '.join(statement.split())[:300])
+        return response
+
+    def teardown_request(self, exc):
+        tracker = g.pop('_query_tracker', None)
+        if tracker is not None:
+            tracker.__exit__(None, None, None)
@@ -0,0 +1,176 @@
+import re
+import math
+import time
+import threading
+from typing import NamedTuple
+import redis
+from flask import current_app, request, jsonify
+from flask_jwt_extended import decode_token
+from app.utils.lru import LRUCache
+from app.utils.http_client import CircuitBreaker, CircuitOpenError
+from app.utils.kv_cache import get_redis
+from app.utils.metrics import observe_redis
+
+# 令牌桶：按距上次请求的时间补充令牌，余量不足时返回需要等待的秒数。
+# Lua 数字返回给 Redis 时会截断为整数，小数以字符串返回。
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+_LIMIT_PATTERN = re.compile(r'^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$')
+
+
+class Limit(NamedTuple):
+    """限流规则：容量为 capacity 的令牌桶，每秒补充 rate 个令牌"""
+    capacity: int
+    rate: float
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+def parse_limit(value):
+    """解析 '5/minute'、'100/10 seconds' 形式的限流规则
+
+    Raises:
+        ValueError: 格式不正确
+    """
+    match = _LIMIT_PATTERN.match(value)
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f'Invalid rate limit: {value!r}')
+    count, multiplier, period = match.groups()
+    seconds = _PERIODS[period] * int(multiplier or 1)
+    return Limit(int(count), int(count) / seconds)
+
+
+class RateLimiter:
+    """请求限流
+
+    按 RATELIMIT_RULES 为端点（如 auth.login）或蓝图（如 auth）配置令牌桶，端点规则优先，
+    都未配置时使用 RATELIMIT_DEFAULT；已登录用户按用户ID计数，其余按客户端 IP 计数。
+    令牌桶保存在 Redis 中由所有进程共享，Redis 不可用时退回进程内令牌桶，此时限额按进程计算。
+    """
+
+    def __init__(self):
+        self.local = None
+        self.breaker = None
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.local = LRUCache(app.config['LOCAL_CACHE_SIZE'])
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=app.config['REDIS_RETRY_INTERVAL'])
+        app.extensions['rate_limiter'] = self
+        app.before_request(self.before_request)
+
+    def before_request(self):
+        config = current_app.config
+        if not config['RATELIMIT_ENABLED'] or request.method == 'OPTIONS' or request.endpoint is None:
+            return None
+
+        rule = self.rule_for(request.endpoint)
+        if rule is None:
+            return None
+        name, limit = rule
+
+        decision = self.hit(f'ratelimit:{name}:{self.identity()}', limit)
+        if decision.allowed:
+            return None
+        response = jsonify({'code': 429001, 'message': '请求过于频繁，请稍后再试'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(max(1, math.ceil(decision.retry_after)))
+        return response
+
+    def rule_for(self, endpoint):
+        """返回 (规则名, Limit)，没有适用的规则时返回 None"""
+        rules = current_app.config['RATELIMIT_RULES']
+        blueprint = endpoint.rpartition('.')[0]
+        for name in (endpoint, blueprint):
+            if name and rules.get(name):
+                return name, self._parse(rules[name])
+        default = current_app.config['RATELIMIT_DEFAULT']
+        if default:
+            return 'default', self._parse(default)
+        return None
+
+    def identity(self):
+        """限流主体：令牌有效时为用户ID，否则为客户端 IP"""
+        auth_header = request.headers.get('Authorization', '')
+        scheme, _, token = auth_header.partition(' ')
+        if token and scheme == current_app.config['JWT_HEADER_TYPE']:
+            try:
+                return f"user:{decode_token(token)['sub']}"
+            except Exception:
+                # 令牌无效或已过期，视图会返回 401，这里按 IP 计数
+                pass
+        return f'ip:{request.remote_addr}'
+
+    def hit(self, key, limit, cost=1):
+        """消耗令牌
+
+        Args:
+            key: 令牌桶的键
+            limit: Limit
+            cost: 消耗的令牌数
+
+        Returns:
+            Decision
+        """
+        try:
+            self.breaker.before_request()
+        except CircuitOpenError:
+            return self.hit_local(key, limit, cost)
+        try:
+            script = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+            with observe_redis('rate_limit'):
+                allowed, tokens, retry_after = script(keys=[key], args=[limit.rate, limit.capacity, time.time(), cost])
+        except redis.RedisError as e:
+            self.breaker.record_failure()
+            current_app.logger.warning('Redis unavailable, using local rate limiter: %s', e)
+            return self.hit_local(key, limit, cost)
+        self.breaker.record_success()
+        return Decision(bool(allowed), int(float(tokens)), float(retry_after))
+
+    def hit_local(self, key, limit, cost=1, now=None):
+        """进程内令牌桶，算法与 Lua 脚本相同"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, ts = self.local.get(key) or (limit.capacity, now)
+            tokens = min(limit.capacity, tokens + max(0.0, now - ts) * limit.rate)
+            if tokens >= cost:
+                self.local.set(key, (tokens - cost, now))
+                return Decision(True, int(tokens - cost), 0.0)
+            self.local.set(key, (tokens, now))
+            return Decision(False, int(tokens), (cost - tokens) / limit.rate)
+
+    def _parse(self, value):
+        limit = self._limits.get(value)
+        if limit is None:
+            limit = self._limits[value] = parse_limit(value)
+        return limit
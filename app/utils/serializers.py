@@ -0,0 +1,87 @@
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+class RowSerializer:
+    """行序列化器
+
+    按列清单生成专用的转换函数，把查询得到的行元组直接转换为字典，
+    不构造 ORM 对象，也不逐个调用 isoformat()，日期时间交给 JSON 提供者输出。
+    """
+
+    _cache: Dict[Tuple[type, Tuple[str, ...]], 'RowSerializer'] = {}
+
+    def __init__(self, columns: Sequence):
+        self.columns = tuple(columns)
+        self.keys = tuple(column.key for column in self.columns)
+        self._convert = _compile(self.keys)
+
+    @classmethod
+    def for_model(cls, model, fields: Sequence[str] = None) -> 'RowSerializer':
+        """获取模型的序列化器，同一模型和列清单只生成一次
+
+        Args:
+            model: 模型类
+            fields: 输出字段，缺省为模型的 SERIALIZE_FIELDS
+
+        Returns:
+            序列化器
+        """
+        fields = tuple(fields or model.SERIALIZE_FIELDS)
+        key = (model, fields)
+        serializer = cls._cache.get(key)
+        if serializer is None:
+            serializer = cls([getattr(model, field) for field in fields])
+            cls._cache[key] = serializer
+        return serializer
+
+    def to_dict(self, row) -> dict:
+        """转换一行"""
+        return self._convert(row)
+
+    def to_dicts(self, rows: Iterable) -> List[dict]:
+        """转换多行"""
+        convert = self._convert
+        return [convert(row) for row in rows]
+
+
+def parse_fields(model, args: Mapping, exclude: Sequence[str] = ()) -> Tuple[str, ...]:
+    """解析稀疏字段参数
+
+    ?fields=id,text 指定输出字段，?view=lean 使用模型的 LEAN_FIELDS，缺省输出全部字段。
+    字段按 SERIALIZE_FIELDS 的顺序输出，总是包含 id。
+
+    Args:
+        model: 模型类
+        args: 请求参数
+        exclude: 不允许输出的字段
+
+    Returns:
+        输出字段
+
+    Raises:
+        ValueError: 字段或视图不存在
+    """
+    allowed = [field for field in model.SERIALIZE_FIELDS if field not in exclude]
+    fields = args.get('fields')
+    if fields:
+        requested = {field.strip() for field in fields.split(',') if field.strip()}
+        unknown = requested.difference(allowed)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        requested.add('id')
+    else:
+        view = args.get('view', 'full')
+        if view == 'lean':
+            requested = set(model.LEAN_FIELDS)
+        elif view == 'full':
+            requested = set(allowed)
+        else:
+            raise ValueError(f'Unknown view: {view}')
+    return tuple(field for field in allowed if field in requested)
+
+
+def _compile(keys):
+    """生成 row -> dict 的转换函数，字典字面量比 dict(zip()) 更快"""
+    body = ', '.join(f'{key!r}: row[{index}]' for index, key in enumerate(keys))
+    namespace = {}
+    exec(f'def convert(row):\n    return {{{body}}}\n', namespace)
+    return namespace['convert']
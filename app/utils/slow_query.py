@@ -0,0 +1,137 @@
+import json
+import time
+import random
+import threading
+from collections import deque
+from datetime import datetime
+from flask import current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+
+MAX_STATEMENT_LENGTH = 2000
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')  # 其他语句（DDL、PRAGMA 等）不获取执行计划
+
+
+def parameters_shape(parameters, executemany=False):
+    """参数的类型结构，不包含参数值"""
+    if executemany:
+        rows = list(parameters)
+        return {'rows': len(rows), 'row': parameters_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def explain(conn, cursor, statement, parameters, analyze=False):
+    """用当前连接获取执行计划，返回每行一个字符串的列表；不支持的数据库或语句返回 None
+
+    直接使用 DBAPI 游标执行，不触发引擎事件。ANALYZE 会再次执行语句，只用于 SELECT。
+    """
+    keyword = statement.split(None, 1)[0].upper() if statement.strip() else ''
+    if keyword not in EXPLAINABLE:
+        return None
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    elif dialect == 'postgresql':
+        analyze = analyze and keyword == 'SELECT'
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if analyze else 'EXPLAIN '
+    else:
+        return None
+
+    explain_cursor = cursor.connection.cursor()
+    try:
+        if dialect == 'postgresql':
+            # EXPLAIN 失败会中止 PostgreSQL 事务，用保存点隔离
+            explain_cursor.execute('SAVEPOINT slow_query_explain')
+            try:
+                explain_cursor.execute(prefix + statement, parameters)
+                rows = explain_cursor.fetchall()
+            except Exception:
+                explain_cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                raise
+            finally:
+                explain_cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+            return [row[0] for row in rows]
+
+        explain_cursor.execute(prefix + statement, parameters)
+        # SQLite 每行为 (id, parent, notused, detail)，按父节点缩进
+        depth = {0: -1}
+        plan = []
+        for node, parent, _, detail in explain_cursor.fetchall():
+            depth[node] = depth.get(parent, -1) + 1
+            plan.append('  ' * depth[node] + detail)
+        return plan
+    finally:
+        explain_cursor.close()
+
+
+class SlowQueryLog:
+    """慢查询日志
+
+    执行时间不少于 SLOW_QUERY_THRESHOLD 秒的语句按 SLOW_QUERY_SAMPLE_RATE 抽样，
+    记录语句、参数类型结构、所在端点和执行计划（SLOW_QUERY_EXPLAIN_ANALYZE 时 PostgreSQL 使用 EXPLAIN ANALYZE），
+    写入一条 JSON 警告日志，并保存在最近 SLOW_QUERY_BUFFER_SIZE 条的环形缓冲区中，供管理接口查看。
+    """
+
+    def __init__(self):
+        self.entries = deque()
+        self.sequence = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db):
+        self.entries = deque(maxlen=app.config['SLOW_QUERY_BUFFER_SIZE'])
+        self.sequence = 0
+        app.extensions['slow_query_log'] = self
+        with app.app_context():
+            engine = db.engine
+        if not event.contains(engine, 'after_cursor_execute', self._after_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def recent(self, limit=None):
+        """最近的慢查询，新的在前"""
+        with self._lock:
+            entries = list(self.entries)
+        entries.reverse()
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('slow_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info['slow_query_start'].pop()
+        if not has_app_context():
+            return
+        config = current_app.config
+        if not config['SLOW_QUERY_ENABLED'] or duration < config['SLOW_QUERY_THRESHOLD']:
+            return
+        if random.random() >= config['SLOW_QUERY_SAMPLE_RATE']:
+            return
+
+        entry = {
+            'time': datetime.utcnow().isoformat(),
+            'duration_ms': round(duration * 1000, 2),
+            'statement': ' '.join(statement.split())[:MAX_STATEMENT_LENGTH],
+            'parameters': parameters_shape(parameters, executemany),
+            'endpoint': request.endpoint if has_request_context() else None,
+            'method': request.method if has_request_context() else None,
+            'plan': None,
+        }
+        if config['SLOW_QUERY_EXPLAIN'] and not executemany:
+            try:
+                entry['plan'] = explain(conn, cursor, statement, parameters,
+                                        analyze=config['SLOW_QUERY_EXPLAIN_ANALYZE'])
+            except Exception as e:
+                entry['explain_error'] = str(e)
+
+        with self._lock:
+            self.sequence += 1
+            entry['id'] = self.sequence
+            self.entries.append(entry)
+        current_app.logger.warning(json.dumps({'event': 'slow_query', **entry}, ensure_ascii=False))
@@ -0,0 +1,135 @@
+import time
+import threading
+import redis
+from flask import current_app
+from app.utils.bloom import BloomFilter
+from app.utils.http_client import CircuitBreaker, CircuitOpenError
+from app.utils.kv_cache import get_redis
+from app.utils.metrics import observe_redis
+
+REVOKED_KEY = 'jwt:revoked'  # 有序集合：成员为 jti，分值为令牌过期时间戳
+
+_UNAVAILABLE = object()
+
+
+class TokenBlocklist:
+    """已撤销令牌
+
+    撤销的 jti 保存在 Redis 有序集合中，分值为令牌过期时间，过期后清理。
+    每个进程持有一个布隆过滤器，每 JWT_REVOCATION_REFRESH 秒从 Redis 重建一次：
+    过滤器判断不存在的令牌（绝大多数请求）不访问 Redis，判断可能存在时再查 Redis 确认。
+    其他进程撤销的令牌最多在 JWT_REVOCATION_REFRESH 秒后生效；本进程撤销的立即生效。
+    Redis 不可用时撤销记录保存在进程内，过滤器命中的令牌按已撤销处理。
+    """
+
+    def __init__(self):
+        self.breaker = None
+        self.bloom = None
+        self.refreshed_at = None
+        self.pending = {}  # 未能写入 Redis 的撤销记录 jti -> exp
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=app.config['REDIS_RETRY_INTERVAL'])
+        self.bloom = None
+        self.refreshed_at = None
+        self.pending = {}
+        app.extensions['token_blocklist'] = self
+
+    def revoke(self, jwt_payload):
+        """撤销令牌，记录保留到令牌过期"""
+        # 未设置过期时间的令牌永久撤销
+        jti, exp = jwt_payload['jti'], jwt_payload.get('exp', float('inf'))
+        if self._redis(lambda client: client.zadd(REVOKED_KEY, {jti: exp})) is _UNAVAILABLE:
+            with self._lock:
+                self.pending[jti] = exp
+        with self._lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def is_revoked(self, jwt_payload):
+        """令牌是否已撤销，供 token_in_blocklist_loader 调用"""
+        config = current_app.config
+        if not config['JWT_BLACKLIST_ENABLED'] or jwt_payload.get('type') not in config['JWT_BLACKLIST_TOKEN_CHECKS']:
+            return False
+
+        jti = jwt_payload['jti']
+        if jti not in self._filter():
+            return False
+        score = self._redis(lambda client: client.zscore(REVOKED_KEY, jti))
+        if score is _UNAVAILABLE:
+            return True
+        if score is not None:
+            return score > time.time()
+        with self._lock:
+            return self.pending.get(jti, 0) > time.time()
+
+    def refresh(self):
+        """从 Redis 重建布隆过滤器，Redis 不可用时保留当前过滤器"""
+        now = time.time()
+
+        def load(client):
+            self._flush_pending(client)
+            client.zremrangebyscore(REVOKED_KEY, '-inf', now)
+            return client.zrangebyscore(REVOKED_KEY, now, '+inf')
+
+        members = self._redis(load)
+        with self._lock:
+            if members is _UNAVAILABLE:
+                if self.bloom is None:
+                    self.bloom = self._build(self.pending)
+            else:
+                self.bloom = self._build([member.decode('utf-8') for member in members] + list(self.pending))
+            self.refreshed_at = time.monotonic()
+
+    def _filter(self):
+        interval = current_app.config['JWT_REVOCATION_REFRESH']
+        if self.bloom is None:
+            with self._refresh_lock:
+                if self.bloom is None:
+                    self.refresh()
+        elif time.monotonic() - self.refreshed_at >= interval and self._refresh_lock.acquire(blocking=False):
+            # 只有一个请求负责重建，其余请求继续使用旧过滤器
+            try:
+                self.refresh()
+            finally:
+                self._refresh_lock.release()
+        return self.bloom
+
+    def _build(self, jtis):
+        config = current_app.config
+        bloom = BloomFilter(max(config['JWT_REVOCATION_BLOOM_CAPACITY'], 2 * len(jtis)),
+                            config['JWT_REVOCATION_BLOOM_ERROR_RATE'])
+        for jti in jtis:
+            bloom.add(jti)
+        return bloom
+
+    def _flush_pending(self, client):
+        """Redis 恢复后补写进程内的撤销记录"""
+        with self._lock:
+            pending, now = dict(self.pending), time.time()
+        pending = {jti: exp for jti, exp in pending.items() if exp > now}
+        if pending:
+            client.zadd(REVOKED_KEY, pending)
+        with self._lock:
+            for jti in pending:
+                self.pending.pop(jti, None)
+            for jti in [jti for jti, exp in self.pending.items() if exp <= now]:
+                del self.pending[jti]
+
+    def _redis(self, operation):
+        """执行 Redis 操作，Redis 不可用时返回 _UNAVAILABLE"""
+        try:
+            self.breaker.before_request()
+        except CircuitOpenError:
+            return _UNAVAILABLE
+        try:
+            with observe_redis('token_blocklist'):
+                result = operation(get_redis())
+        except redis.RedisError as e:
+            self.breaker.record_failure()
+            current_app.logger.warning('Redis unavailable, using local token blocklist: %s', e)
+            return _UNAVAILABLE
+        self.breaker.record_success()
+        return result
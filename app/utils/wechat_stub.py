@@ -0,0 +1,187 @@
+"""本地微信接口替身
+
+模拟 /sns/oauth2/access_token、/sns/oauth2/refresh_token、/sns/userinfo 和 /sns/auth，用于离线压测 wechat_login 和测试 WeChatService：
+授权码 <name> 或 <name>.<序号> 换得的 openid 为 openid_<name>，同一用户可以多次登录；
+以 invalid 开头的授权码返回 40029。指定 app_id、app_secret 时像微信一样校验 appid（40013）和 secret（40125）；
+grant_type 不正确返回 40002。每个路径最近一次请求的参数记录在 last_params 中。
+
+用法：python -m app.utils.wechat_stub --port 8081 --latency 0.05 --app-id <appid> --app-secret <secret>
+然后设置 WECHAT_API_BASE=http://127.0.0.1:8081
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+class WeChatStubServer:
+    """本地微信接口替身服务
+
+    Args:
+        host: 监听地址
+        port: 监听端口，0 表示随机端口
+        latency: 每个请求的延迟（秒）
+        error_rate: 返回 503 的请求比例
+        app_id: 期望的 appid，None 表示不校验
+        app_secret: 期望的 secret，None 表示不校验
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, app_id=None, app_secret=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.requests = 0
+        self.calls = Counter()  # 按路径统计的请求数
+        self.last_params = {}  # 路径 -> 最近一次请求的参数
+        self.tokens = {}  # access_token -> openid
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        name='wechat-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def handle(self, path, params):
+        """返回 (状态码, 响应 JSON)"""
+        with self._lock:
+            self.requests += 1
+            self.calls[path] += 1
+            self.last_params[path] = dict(params)
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            return 503, {'errcode': -1, 'errmsg': 'system error'}
+
+        if path == '/sns/oauth2/access_token':
+            error = self._check_app(params, 'authorization_code', check_secret=True)
+            if error:
+                return 200, error
+            code = params.get('code', '')
+            if not code or code.startswith('invalid'):
+                return 200, {'errcode': 40029, 'errmsg': 'invalid code'}
+            return 200, self._issue_token(code)
+
+        if path == '/sns/oauth2/refresh_token':
+            error = self._check_app(params, 'refresh_token')
+            if error:
+                return 200, error
+            refresh_token = params.get('refresh_token', '')
+            if not refresh_token.startswith('refresh_'):
+                return 200, {'errcode': 40030, 'errmsg': 'invalid refresh_token'}
+            return 200, self._issue_token(refresh_token[len('refresh_'):])
+
+        openid = params.get('openid')
+        if self.tokens.get(params.get('access_token')) != openid:
+            return 200, {'errcode': 40001, 'errmsg': 'invalid credential'}
+
+        if path == '/sns/userinfo':
+            return 200, {
+                'openid': openid,
+                'nickname': f'wx_{openid[-8:]}',
+                'sex': 0,
+                'province': '',
+                'city': '',
+                'country': 'CN',
+                'headimgurl': f'https://example.com/avatar/{openid}.png',
+                'privilege': []
+            }
+        if path == '/sns/auth':
+            return 200, {'errcode': 0, 'errmsg': 'ok'}
+        return 404, {'errcode': 404, 'errmsg': 'not found'}
+
+    def _check_app(self, params, grant_type, check_secret=False):
+        """校验 appid、secret 和 grant_type，返回错误响应或 None"""
+        if self.app_id is not None and params.get('appid') != self.app_id:
+            return {'errcode': 40013, 'errmsg': 'invalid appid'}
+        if check_secret and self.app_secret is not None and params.get('secret') != self.app_secret:
+            return {'errcode': 40125, 'errmsg': 'invalid appsecret'}
+        if params.get('grant_type') != grant_type:
+            return {'errcode': 40002, 'errmsg': 'invalid grant_type'}
+        return None
+
+    def _issue_token(self, code):
+        """为授权码签发新的 access_token"""
+        name = code.split('.')[0]
+        openid = f'openid_{name}'
+        token = f'token_{name}_{time.monotonic_ns()}'
+        with self._lock:
+            self.tokens[token] = openid
+        return {
+            'access_token': token,
+            'expires_in': 7200,
+            'refresh_token': f'refresh_{name}',
+            'openid': openid,
+            'scope': 'snsapi_userinfo'
+        }
+
+
+def _make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # 支持连接保持
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+            status, data = stub.handle(parts.path, params)
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            try:
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # 客户端已超时断开
+                self.close_connection = True
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地微信接口替身')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', type=float, default=0.0, help='每个请求的延迟（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回 503 的请求比例')
+    parser.add_argument('--app-id', help='校验请求中的 appid')
+    parser.add_argument('--app-secret', help='校验请求中的 secret')
+    args = parser.parse_args()
+
+    stub = WeChatStubServer(args.host, args.port, args.latency, args.error_rate, args.app_id, args.app_secret)
+    print(f'WeChat stub listening on {stub.url}')
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
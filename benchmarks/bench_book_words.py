@@ -0,0 +1,109 @@
+"""单词列表序列化基准
+
+对比 1000 个单词的 /books/<id>/words 页面：
+  - orm:  查询 ORM 对象 + to_dict() + Flask 默认 JSON 提供者（旧实现）
+  - rows: 查询行元组 + RowSerializer + FastJSONProvider（当前实现）
+  - api:  通过测试客户端请求整个接口
+
+用法：python benchmarks/bench_book_words.py [--words 1000] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.utils.json_provider import FastJSONProvider
+from app.utils.serializers import RowSerializer
+
+
+def seed(count):
+    """创建一本包含 count 个单词的词书"""
+    user = User(username='bench', email='bench@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Bench Book', user_id=user.id, total_words=count)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [
+        Word(text=f'word{i}', definition=f'definition of word {i}', phonetic=f'/wɜːd{i}/', example=f'This is word {i}.')
+        for i in range(count)
+    ]
+    db.session.add_all(words)
+    db.session.flush()
+    db.session.add_all(
+        WordRelation(word_id=word.id, book_id=book.id, order=(i + 1) * WordRelation.ORDER_GAP)
+        for i, word in enumerate(words)
+    )
+    db.session.commit()
+    return user.id, book.id
+
+
+def page_orm(app, book_id, count):
+    words = db.session.query(Word).join(WordRelation).filter(
+        WordRelation.book_id == book_id
+    ).order_by(WordRelation.order).limit(count).all()
+    return DefaultJSONProvider(app).dumps({'items': [word.to_dict() for word in words]})
+
+
+def page_rows(app, book_id, count):
+    serializer = RowSerializer.for_model(Word)
+    rows = db.session.query(*serializer.columns).join(
+        WordRelation, WordRelation.word_id == Word.id
+    ).filter(WordRelation.book_id == book_id).order_by(WordRelation.order).limit(count).all()
+    return FastJSONProvider(app).dumps_bytes({'items': serializer.to_dicts(rows)})
+
+
+def timeit(func, repeat):
+    """返回最快一次和中位数耗时（毫秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+        # 每次都重新加载 ORM 对象，避免命中会话中的已加载实例
+        db.session.expunge_all()
+    timings.sort()
+    return timings[0], timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        user_id, book_id = seed(args.words)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+        client = app.test_client()
+        url = f'/api/v1/vocabulary/books/{book_id}/words?per_page={args.words}'
+
+        results = {
+            'orm': timeit(lambda: page_orm(app, book_id, args.words), args.repeat),
+            'rows': timeit(lambda: page_rows(app, book_id, args.words), args.repeat),
+            'api': timeit(lambda: client.get(url, headers=headers), args.repeat),
+        }
+
+        print(f'{args.words} words, {args.repeat} runs')
+        print(f"{'case':<6}{'min ms':>10}{'median ms':>12}")
+        for name, (best, median) in results.items():
+            print(f'{name:<6}{best:>10.2f}{median:>12.2f}')
+        print(f"speedup (median orm/rows): {results['orm'][1] / results['rows'][1]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""热点接口基准与回归检查
+
+用 SeedService 在 SQLite 内存库中生成合成数据，通过测试客户端依次请求热点接口：
+复习列表/提交、词书单词列表、单词搜索、测试生成/提交、学习统计和测试统计。
+每个接口记录中位数和 p95 延迟、顺序请求吞吐，以及每次请求执行的 SQL 语句数（取最大值）。
+
+--update 把结果写入基线文件；否则与基线比较，中位数延迟超过基线 (1 + --tolerance) 倍，
+或语句数超过基线 --query-tolerance 条时以退出码 1 结束。基线与机器相关，换机器后需重新生成；
+数据集参数与基线不一致时不比较，以退出码 2 结束。
+
+用法：python benchmarks/bench_endpoints.py [--records 50000] [--repeat 30] [--tolerance 0.25]
+      python benchmarks/bench_endpoints.py --update
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from typing import Callable, NamedTuple, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.vocabulary import VocabularyBook
+from app.models.learning_record import LearningRecord
+from app.models.test import Test, TestQuestion
+from app.services.seed_service import SeedService
+from app.utils.query_stats import track_queries
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'endpoints.json')
+DATASET_ARGS = ('seed', 'users', 'books', 'min_words', 'max_words', 'records', 'tests', 'questions')
+
+
+class Case(NamedTuple):
+    """一个被测接口，request(n) 发出第 n 次请求并返回响应"""
+    name: str
+    request: Callable
+
+
+def build_cases(client, headers):
+    """选取拥有最大词书的用户，构造各接口的请求"""
+    book = VocabularyBook.query.order_by(VocabularyBook.total_words.desc(), VocabularyBook.id).first()
+    book_id, user_id = book.id, book.user_id
+    headers = headers(user_id)
+
+    records = [record_id for record_id, in db.session.query(LearningRecord.id).filter(
+        LearningRecord.user_id == user_id,
+        LearningRecord.status == 'learning'
+    ).order_by(LearningRecord.id)]
+    test = Test.query.filter_by(user_id=user_id).order_by(Test.id).first()
+    answers = [{'question_id': question_id, 'answer': answer}
+               for question_id, answer in db.session.query(TestQuestion.id, TestQuestion.correct_answer)
+               .filter_by(test_id=test.id).order_by(TestQuestion.id)] if test else []
+    db.session.remove()
+
+    def get(url):
+        return lambda n: client.get(url, headers=headers)
+
+    def review_submit(n):
+        return client.post('/api/v1/learning/review/submit', headers=headers,
+                           json={'record_id': records[n % len(records)], 'result': 'correct'})
+
+    cases = [
+        Case('review_list', get('/api/v1/learning/review/list')),
+        Case('book_words', get(f'/api/v1/vocabulary/books/{book_id}/words?per_page=50')),
+        Case('search_words', get(f'/api/v1/vocabulary/words/search?keyword=ba&book_id={book_id}')),
+        Case('learning_statistics', get('/api/v1/learning/statistics')),
+        Case('test_statistics', get('/api/v1/tests/statistics')),
+        Case('test_generate', lambda n: client.post('/api/v1/tests/generate', headers=headers, json={
+            'book_id': book_id, 'question_count': 20, 'test_type': 'choice'})),
+    ]
+    if test:
+        cases.append(Case('test_submit', lambda n: client.post(
+            f'/api/v1/tests/{test.id}/submit', headers=headers, json={'answers': answers})))
+    # 提交会改变复习列表，放在最后
+    if records:
+        cases.append(Case('review_submit', review_submit))
+    return cases
+
+
+def measure(case, repeat, warmup):
+    """返回中位数和 p95 延迟（毫秒）、每秒请求数和单次请求的最大语句数"""
+    for n in range(warmup):
+        check(case, case.request(n))
+
+    timings = []
+    queries = 0
+    for n in range(warmup, warmup + repeat):
+        with track_queries() as stats:
+            start = time.perf_counter()
+            response = case.request(n)
+            timings.append((time.perf_counter() - start) * 1000)
+        check(case, response)
+        queries = max(queries, stats.count)
+
+    ordered = sorted(timings)
+    return {
+        'median_ms': round(ordered[len(ordered) // 2], 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'rps': round(len(timings) / (sum(timings) / 1000), 1),
+        'queries': queries
+    }
+
+
+def check(case, response):
+    if response.status_code != 200:
+        raise SystemExit(f'{case.name}: HTTP {response.status_code} {response.get_data(as_text=True)[:200]}')
+
+
+def compare(results, baseline, tolerance, query_tolerance):
+    """返回回归列表，每项为 (接口名, 原因)"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['median_ms'] > base['median_ms'] * (1 + tolerance):
+            regressions.append((name, f"median {result['median_ms']:.2f} ms > "
+                                      f"{base['median_ms']:.2f} ms * {1 + tolerance:.2f}"))
+        if result['queries'] > base['queries'] + query_tolerance:
+            regressions.append((name, f"{result['queries']} queries > {base['queries']} + {query_tolerance}"))
+    return regressions
+
+
+def report(results, baseline):
+    print(f"{'endpoint':<22}{'median ms':>11}{'p95 ms':>10}{'req/s':>9}{'queries':>9}{'vs base':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = f"{result['median_ms'] / base['median_ms'] - 1:+.0%}" if base else '-'
+        print(f"{name:<22}{result['median_ms']:>11.2f}{result['p95_ms']:>10.2f}"
+              f"{result['rps']:>9.1f}{result['queries']:>9}{change:>10}")
+
+
+def load_baseline(path) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--books', type=int, default=4)
+    parser.add_argument('--min-words', type=int, default=500)
+    parser.add_argument('--max-words', type=int, default=5000)
+    parser.add_argument('--records', type=int, default=50000)
+    parser.add_argument('--tests', type=int, default=5, help='每个用户的测试数')
+    parser.add_argument('--questions', type=int, default=20, help='每个测试的题目数')
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线 JSON 文件')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='中位数延迟允许的相对增幅')
+    parser.add_argument('--query-tolerance', type=int, default=0, help='语句数允许增加的条数')
+    parser.add_argument('--update', action='store_true', help='把本次结果写入基线文件')
+    args = parser.parse_args()
+    dataset = {name: getattr(args, name) for name in DATASET_ARGS}
+
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    # 语句数已在结果中，不逐个请求输出 N+1 警告
+    app.logger.setLevel(logging.ERROR)
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        stats = SeedService.seed(seed=args.seed, users=args.users, books=args.books, min_words=args.min_words,
+                                 max_words=args.max_words, records=args.records, tests_per_user=args.tests,
+                                 questions_per_test=args.questions)
+        print(f"seeded {stats['learning_records']} records in {time.perf_counter() - start:.1f}s, "
+              f"{args.repeat} runs per endpoint")
+
+        client = app.test_client()
+        cases = build_cases(client, lambda user_id: {
+            'Authorization': f'Bearer {create_access_token(identity=user_id)}'})
+        results = {case.name: measure(case, args.repeat, args.warmup) for case in cases}
+
+    saved = load_baseline(args.baseline)
+    baseline = saved['endpoints'] if saved and saved['dataset'] == dataset else {}
+    report(results, baseline)
+
+    if args.update:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'dataset': dataset,
+                'repeat': args.repeat,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'endpoints': results
+            }, f, indent=2)
+            f.write('\n')
+        print(f'baseline written to {args.baseline}')
+        return
+    if saved is None:
+        print(f'no baseline at {args.baseline}, run with --update to create one')
+        return
+    if not baseline:
+        print(f"baseline dataset {saved['dataset']} differs from {dataset}, not comparing")
+        sys.exit(2)
+
+    regressions = compare(results, baseline, args.tolerance, args.query_tolerance)
+    for name, reason in regressions:
+        print(f'REGRESSION {name}: {reason}')
+    if regressions:
+        sys.exit(1)
+    print(f'no regressions (tolerance {args.tolerance:.0%}, {args.query_tolerance} extra queries)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""密码校验吞吐基准
+
+在 --threads 个并发请求线程下测量每秒可完成的密码校验次数（即登录吞吐上限），
+分别给出直接在请求线程中计算和经有界线程池计算的结果，并折算为每核吞吐。
+
+用法：python benchmarks/bench_password.py [--method pbkdf2:sha256:600000] [--threads 8] [--seconds 3]
+"""
+import argparse
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import check_password_hash, generate_password_hash
+from app import create_app
+from app.config import Config
+from app.services.password_service import PasswordService
+
+
+def measure(app, threads, seconds, verify):
+    """多个线程持续校验密码，返回每秒校验次数"""
+    password_hash = generate_password_hash('password123', method=app.config['PASSWORD_HASH_METHOD'])
+    deadline = time.perf_counter() + seconds
+    counts = [0] * threads
+
+    def worker(index):
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                verify(password_hash, 'password123')
+                counts[index] += 1
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--method', default=Config.PASSWORD_HASH_METHOD)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    app.config['PASSWORD_HASH_METHOD'] = args.method
+    cores = os.cpu_count() or 1
+    workers = app.config['PASSWORD_HASH_WORKERS']
+
+    results = {
+        'inline': measure(app, args.threads, args.seconds, check_password_hash),
+        'pool': measure(app, args.threads, args.seconds, PasswordService.verify),
+    }
+
+    print(f'{args.method}, {args.threads} request threads, {workers} hash workers, {cores} cores')
+    print(f"{'case':<8}{'logins/s':>12}{'per core':>12}")
+    for name, rate in results.items():
+        print(f'{name:<8}{rate:>12.1f}{rate / cores:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
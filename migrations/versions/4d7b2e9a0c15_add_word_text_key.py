@@ -0,0 +1,44 @@
+"""Add normalized word text key
+
+Revision ID: 4d7b2e9a0c15
+Revises: e5a18c3b7f92
+Create Date: 2026-10-19 15:20:48.731902
+
+"""
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d7b2e9a0c15'
+down_revision = 'e5a18c3b7f92'
+branch_labels = None
+depends_on = None
+
+
+def normalize(text):
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def upgrade():
+    op.add_column('words', sa.Column('text_key', sa.String(length=100), nullable=True))
+
+    # 每个规范化文本只回填ID最小的单词，其余重复单词留空，由 flask words dedupe 合并
+    words = sa.table('words', sa.column('id', sa.Integer), sa.column('text', sa.String), sa.column('text_key', sa.String))
+    connection = op.get_bind()
+    seen = set()
+    for word_id, text in connection.execute(sa.select(words.c.id, words.c.text).order_by(words.c.id)).all():
+        key = normalize(text)
+        if key in seen:
+            continue
+        seen.add(key)
+        connection.execute(words.update().where(words.c.id == word_id).values(text_key=key))
+
+    op.create_index('ix_words_text_key', 'words', ['text_key'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_words_text_key', table_name='words')
+    with op.batch_alter_table('words') as batch_op:
+        batch_op.drop_column('text_key')
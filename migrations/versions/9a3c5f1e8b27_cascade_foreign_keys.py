@@ -0,0 +1,67 @@
+"""Add ON DELETE CASCADE to owned foreign keys
+
+Revision ID: 9a3c5f1e8b27
+Revises: 4d7b2e9a0c15
+Create Date: 2026-10-19 16:41:09.284517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3c5f1e8b27'
+down_revision = '4d7b2e9a0c15'
+branch_labels = None
+depends_on = None
+
+# (表, 外键列, 引用表)
+FOREIGN_KEYS = [
+    ('review_plans', 'user_id', 'users'),
+    ('vocabulary_books', 'user_id', 'users'),
+    ('learning_goals', 'book_id', 'vocabulary_books'),
+    ('learning_goals', 'user_id', 'users'),
+    ('learning_plans', 'book_id', 'vocabulary_books'),
+    ('learning_plans', 'user_id', 'users'),
+    ('learning_records', 'book_id', 'vocabulary_books'),
+    ('learning_records', 'user_id', 'users'),
+    ('tests', 'book_id', 'vocabulary_books'),
+    ('tests', 'user_id', 'users'),
+    ('user_level_assessments', 'book_id', 'vocabulary_books'),
+    ('user_level_assessments', 'user_id', 'users'),
+    ('word_relations', 'book_id', 'vocabulary_books'),
+    ('assessment_questions', 'assessment_id', 'user_level_assessments'),
+    ('test_questions', 'test_id', 'tests'),
+    ('test_records', 'test_id', 'tests'),
+    ('test_records', 'user_id', 'users'),
+    ('test_answers', 'question_id', 'test_questions'),
+    ('test_answers', 'record_id', 'test_records'),
+    ('learning_frontiers', 'book_id', 'vocabulary_books'),
+    ('learning_frontiers', 'user_id', 'users'),
+    ('user_book_progress', 'book_id', 'vocabulary_books'),
+    ('user_book_progress', 'user_id', 'users'),
+]
+
+# SQLite 反射出的外键没有名字，批量模式下按约定命名后才能删除
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def _replace_foreign_keys(ondelete):
+    tables = {}
+    for table, column, referred in FOREIGN_KEYS:
+        tables.setdefault(table, []).append((column, referred))
+
+    for table, columns in tables.items():
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for column, referred in columns:
+                name = f'{table}_{column}_fkey'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade():
+    _replace_foreign_keys(None)
@@ -0,0 +1,28 @@
+"""Add deleted_at to vocabulary books
+
+Revision ID: b6e0c4a2d8f1
+Revises: 9a3c5f1e8b27
+Create Date: 2026-10-19 13:02:41.274810
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e0c4a2d8f1'
+down_revision = '9a3c5f1e8b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('vocabulary_books', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_vocabulary_books_deleted_at'), ['deleted_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('vocabulary_books', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_vocabulary_books_deleted_at'))
+        batch_op.drop_column('deleted_at')
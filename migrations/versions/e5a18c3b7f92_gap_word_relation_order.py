@@ -0,0 +1,34 @@
+"""Spread word relation order values with gaps
+
+Revision ID: e5a18c3b7f92
+Revises: c27a9e4f1d36
+Create Date: 2026-10-19 14:02:37.215604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a18c3b7f92'
+down_revision = 'c27a9e4f1d36'
+branch_labels = None
+depends_on = None
+
+ORDER_GAP = 1024
+
+
+def upgrade():
+    # 已有顺序值按间隔放大，新词推进位置同步放大以保持含义不变
+    op.execute(sa.text(f'UPDATE word_relations SET "order" = "order" * {ORDER_GAP}'))
+    op.execute(sa.text(f'UPDATE learning_frontiers SET last_order = last_order * {ORDER_GAP}'))
+
+
+def downgrade():
+    op.execute(sa.text(
+        'UPDATE word_relations SET "order" = ('
+        'SELECT COUNT(*) FROM word_relations AS w '
+        'WHERE w.book_id = word_relations.book_id '
+        'AND (w."order" < word_relations."order" OR (w."order" = word_relations."order" AND w.id <= word_relations.id)))'
+    ))
+    op.execute(sa.text('DELETE FROM learning_frontiers'))
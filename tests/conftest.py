@@ -169,4 +169,28 @@ def test_word(db_setup, test_book):
 @pytest.fixture(scope='function')
 def runner(app):
     """测试命令行"""
-    return app.test_cli_runner() 
\ No newline at end of file
+    return app.test_cli_runner() 
+
+@pytest.fixture
+def query_budget():
+    """限制代码块内执行的 SQL 语句数
+
+    用法：
+        with query_budget(3):
+            client.get('/api/v1/...')
+    """
+    from contextlib import contextmanager
+    from app.utils.query_stats import track_queries
+
+    @contextmanager
+    def budget(max_queries, max_repeats=None):
+        with track_queries() as stats:
+            yield stats
+        statements = '\n'.join(f'{count}x {statement}' for statement, count in stats.statements.most_common())
+        assert stats.count <= max_queries, \
+            f'Executed {stats.count} queries, budget is {max_queries}:\n{statements}'
+        if max_repeats is not None:
+            repeated = stats.duplicates(max_repeats + 1)
+            assert not repeated, f'Statements repeated more than {max_repeats} times (N+1?):\n{statements}'
+
+    return budget
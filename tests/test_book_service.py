@@ -0,0 +1,98 @@
+import pytest
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.word_bitset import WordBitset
+from app.services.book_service import BookService
+from app.services.coverage_service import CoverageService
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    other = User(username='other_user', email='other@example.com')
+    other.set_password('password123')
+    db.session.add_all([user, other])
+    db.session.flush()
+
+    book = VocabularyBook(name='CET4', description='四级词汇', level='intermediate', user_id=user.id,
+                          tags=['exam'], total_words=3)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'definition{i}') for i in range(3)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=(3 - i) * WordRelation.ORDER_GAP))
+    db.session.commit()
+
+    return {'user': user, 'other': other, 'book': book, 'words': words}
+
+def test_clone(init_database, app):
+    """测试复制词书保留单词顺序"""
+    data = init_database
+    book = data['book']
+    CoverageService.get_book_bitsets([book.id])
+
+    clone = BookService.clone(book, data['user'].id)
+
+    assert clone.id != book.id
+    assert clone.name == 'CET4 (副本)'
+    assert clone.tags == 'exam'
+    assert clone.total_words == 3
+
+    def ordered(book_id):
+        return [(word_id, order) for word_id, order in db.session.query(
+            WordRelation.word_id, WordRelation.order
+        ).filter_by(book_id=book_id).order_by(WordRelation.order)]
+
+    assert ordered(clone.id) == ordered(book.id)
+    # 词书位图一并复制
+    assert WordBitset.query.filter_by(kind=WordBitset.KIND_BOOK, owner_id=clone.id).count() == 1
+    assert CoverageService.get_book_bitsets([clone.id])[clone.id] == CoverageService.get_book_bitsets([book.id])[book.id]
+
+def test_clone_api(init_database, app):
+    """测试复制词书接口"""
+    data = init_database
+    client = app.test_client()
+
+    response = client.post(
+        f"/api/v1/vocabulary/books/{data['book'].id}/clone",
+        json={'name': 'My CET4'},
+        headers={'Authorization': f"Bearer {create_access_token(identity=data['user'].id)}"}
+    )
+    assert response.status_code == 201
+    result = response.get_json()['data']
+    assert result['name'] == 'My CET4'
+    assert result['word_count'] == 3
+
+    response = client.post(
+        f"/api/v1/vocabulary/books/{data['book'].id}/clone",
+        headers={'Authorization': f"Bearer {create_access_token(identity=data['other'].id)}"}
+    )
+    assert response.status_code == 403
+    assert response.get_json()['code'] == 403001
+
+    response = client.post(
+        f"/api/v1/vocabulary/books/{data['book'].id + 100}/clone",
+        headers={'Authorization': f"Bearer {create_access_token(identity=data['user'].id)}"}
+    )
+    assert response.get_json()['code'] == 404001
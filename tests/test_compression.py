@@ -0,0 +1,130 @@
+import gzip
+import json
+import pytest
+from app import db
+from app.extensions import compressor
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningRecord
+from app.utils import compression
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=50)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'definition of word {i}') for i in range(50)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=(i + 1) * WordRelation.ORDER_GAP))
+        db.session.add(LearningRecord(user_id=user.id, book_id=book.id, word_id=word.id))
+    db.session.commit()
+
+    return {
+        'book_id': book.id,
+        'headers': {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+    }
+
+def test_gzip_response(init_database, app):
+    """测试按 Accept-Encoding 压缩大响应"""
+    client = app.test_client()
+    url = f"/api/v1/vocabulary/books/{init_database['book_id']}/words?per_page=50"
+
+    plain = client.get(url, headers=init_database['headers'])
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    response = client.get(url, headers={**init_database['headers'], 'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(response.data) < len(plain.data)
+    assert gzip.decompress(response.data) == plain.data
+
+def test_small_response_not_compressed(init_database, app):
+    """测试小于阈值的响应不压缩"""
+    client = app.test_client()
+
+    response = client.get(
+        f"/api/v1/vocabulary/books/{init_database['book_id']}",
+        headers={**init_database['headers'], 'Accept-Encoding': 'gzip'}
+    )
+
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+
+def test_brotli_preferred(init_database, app):
+    """测试客户端同时支持时优先使用 brotli"""
+    brotli = pytest.importorskip('brotli')
+    client = app.test_client()
+    url = f"/api/v1/vocabulary/books/{init_database['book_id']}/words?per_page=50"
+
+    plain = client.get(url, headers=init_database['headers'])
+    response = client.get(url, headers={**init_database['headers'], 'Accept-Encoding': 'gzip, br'})
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == plain.data
+
+def test_gzip_only_without_brotli(init_database, app, monkeypatch):
+    """测试未安装 brotli 时退回 gzip"""
+    monkeypatch.setattr(compression, 'brotli', None)
+    client = app.test_client()
+
+    response = client.get(
+        f"/api/v1/vocabulary/books/{init_database['book_id']}/words?per_page=50",
+        headers={**init_database['headers'], 'Accept-Encoding': 'br, gzip'}
+    )
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+def test_streamed_response(init_database, app):
+    """测试流式导出逐块压缩"""
+    client = app.test_client()
+
+    response = client.get('/api/v1/learning/records/export?format=ndjson',
+                          headers={**init_database['headers'], 'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+    assert len(lines) == 50
+    assert json.loads(lines[0])['status'] == 'learning'
+
+def test_compressed_body_cached_by_etag(init_database, app, monkeypatch):
+    """测试同一 ETag 的响应只压缩一次"""
+    client = app.test_client()
+    url = f"/api/v1/vocabulary/books/{init_database['book_id']}/words?per_page=50"
+    headers = {**init_database['headers'], 'Accept-Encoding': 'gzip'}
+
+    calls = []
+    original = compressor.compress
+    monkeypatch.setattr(compressor, 'compress', lambda data, encoding: calls.append(encoding) or original(data, encoding))
+
+    first = client.get(url, headers=headers)
+    second = client.get(url, headers=headers)
+
+    assert calls == ['gzip']
+    assert first.data == second.data
+    assert first.headers['ETag'] == second.headers['ETag']
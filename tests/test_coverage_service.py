@@ -0,0 +1,203 @@
+import pytest
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.word_bitset import WordBitset
+from app.models.learning import LearningRecord
+from app.services.coverage_service import CoverageService
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+    
+    words = [Word(text=f'word{i}', definition=f'definition{i}') for i in range(6)]
+    db.session.add_all(words)
+    db.session.flush()
+    
+    # 两本词书共享 word2、word3
+    book_a = VocabularyBook(name='Book A', user_id=user.id)
+    book_b = VocabularyBook(name='Book B', user_id=user.id)
+    db.session.add_all([book_a, book_b])
+    db.session.flush()
+    
+    for i, word in enumerate(words[:4]):
+        db.session.add(WordRelation(word_id=word.id, book_id=book_a.id, order=i + 1))
+    for i, word in enumerate(words[2:]):
+        db.session.add(WordRelation(word_id=word.id, book_id=book_b.id, order=i + 1))
+    db.session.commit()
+    
+    return {'user': user, 'words': words, 'book_a': book_a, 'book_b': book_b}
+
+def _coverage_by_book(user_id):
+    return {item['book_id']: item for item in CoverageService.get_coverage(user_id)}
+
+def test_bitset_encoding():
+    """测试位图编解码"""
+    value = WordBitset.from_ids([1, 9, 200])
+    assert value.bit_count() == 3
+    assert WordBitset.decode(WordBitset.encode(value)) == value
+    assert WordBitset.from_ids([]) == 0
+
+def test_get_coverage(init_database, app):
+    """测试计算词书覆盖率"""
+    data = init_database
+    user_id = data['user'].id
+    
+    for word in data['words'][1:3]:
+        db.session.add(LearningRecord(
+            user_id=user_id,
+            book_id=data['book_a'].id,
+            word_id=word.id,
+            status='mastered'
+        ))
+    db.session.commit()
+    
+    coverage = _coverage_by_book(user_id)
+    assert coverage[data['book_a'].id]['total_words'] == 4
+    assert coverage[data['book_a'].id]['mastered_words'] == 2
+    assert coverage[data['book_a'].id]['coverage'] == 50.0
+    # word2 在 Book B 中也算已掌握
+    assert coverage[data['book_b'].id]['mastered_words'] == 1
+    assert coverage[data['book_b'].id]['coverage'] == 25.0
+
+def test_coverage_follows_status_changes(init_database, app):
+    """测试学习状态变化时位图同步更新"""
+    data = init_database
+    user_id = data['user'].id
+    word = data['words'][3]
+    
+    # 同一单词在两本词书中都已掌握
+    records = [
+        LearningRecord(user_id=user_id, book_id=book.id, word_id=word.id, status='mastered')
+        for book in (data['book_a'], data['book_b'])
+    ]
+    db.session.add_all(records)
+    db.session.commit()
+    assert _coverage_by_book(user_id)[data['book_a'].id]['mastered_words'] == 1
+    
+    # 仍有一条已掌握记录时保持已掌握
+    records[0].status = 'learning'
+    db.session.commit()
+    assert _coverage_by_book(user_id)[data['book_a'].id]['mastered_words'] == 1
+    
+    db.session.delete(records[1])
+    db.session.commit()
+    assert _coverage_by_book(user_id)[data['book_a'].id]['mastered_words'] == 0
+    assert CoverageService.get_mastered_bitset(user_id) == 0
+
+def test_book_bitset_invalidated_on_word_change(init_database, app):
+    """测试词书单词变化后位图重建"""
+    data = init_database
+    book_id = data['book_a'].id
+    
+    assert _coverage_by_book(data['user'].id)[book_id]['total_words'] == 4
+    
+    db.session.add(WordRelation(word_id=data['words'][5].id, book_id=book_id, order=5))
+    db.session.commit()
+    
+    assert _coverage_by_book(data['user'].id)[book_id]['total_words'] == 5
+
+def test_coverage_api(init_database, app):
+    """测试覆盖率接口"""
+    data = init_database
+    db.session.add(LearningRecord(
+        user_id=data['user'].id,
+        book_id=data['book_a'].id,
+        word_id=data['words'][0].id,
+        status='mastered'
+    ))
+    db.session.commit()
+    
+    headers = {'Authorization': f'Bearer {create_access_token(identity=data["user"].id)}'}
+    response = app.test_client().get('/api/v1/vocabulary/books/coverage', headers=headers)
+    
+    assert response.status_code == 200
+    items = response.get_json()['data']['items']
+    assert len(items) == 2
+    assert items[0]['book_id'] == data['book_a'].id
+    assert items[0]['mastered_words'] == 1
+    assert items[0]['coverage'] == 25.0
+
+def test_mastered_bitset_concurrent_create(init_database, app, monkeypatch):
+    """测试构建位图期间其他请求已插入位图时，在其位图上修改单个位而不是覆盖"""
+    from app.services import coverage_service
+    data = init_database
+    user_id = data['user'].id
+    other, word = data['words'][0], data['words'][1]
+    mastered_value = coverage_service._mastered_value
+
+    def value_after_other_request(connection, user_id):
+        connection.execute(WordBitset.__table__.insert().values(
+            kind=WordBitset.KIND_MASTERED, owner_id=user_id, bits=WordBitset.encode(1 << other.id)
+        ))
+        return mastered_value(connection, user_id)
+
+    monkeypatch.setattr(coverage_service, '_mastered_value', value_after_other_request)
+    db.session.add(LearningRecord(user_id=user_id, book_id=data['book_a'].id, word_id=word.id, status='mastered'))
+    db.session.commit()
+
+    assert CoverageService.get_mastered_bitset(user_id) == (1 << other.id) | (1 << word.id)
+    assert WordBitset.query.filter_by(kind=WordBitset.KIND_MASTERED).count() == 1
+
+def test_rebuild_user_overwrites(init_database, app):
+    """测试重建已有位图时覆盖原值"""
+    data = init_database
+    user_id = data['user'].id
+    db.session.add(WordBitset(kind=WordBitset.KIND_MASTERED, owner_id=user_id, bits=WordBitset.encode(0b111)))
+    db.session.commit()
+
+    assert CoverageService.rebuild_user(user_id) == 0
+    assert CoverageService.get_mastered_bitset(user_id) == 0
+
+def test_coverage_read_does_not_commit(init_database, app):
+    """测试首次读取只在当前事务中插入位图，由调用方提交"""
+    data = init_database
+    db.session.add(LearningRecord(user_id=data['user'].id, book_id=data['book_a'].id,
+                                  word_id=data['words'][0].id, status='mastered'))
+    db.session.flush()
+    WordBitset.query.delete()
+    db.session.commit()
+
+    assert _coverage_by_book(data['user'].id)[data['book_a'].id]['mastered_words'] == 1
+    assert WordBitset.query.count() == 3
+    db.session.rollback()
+
+    assert WordBitset.query.count() == 0
+
+def test_book_bitset_concurrent_create(init_database, app, monkeypatch):
+    """测试其他请求已插入同一词书位图时不违反唯一约束"""
+    from app.services import coverage_service
+    data = init_database
+    book_id = data['book_a'].id
+    create = coverage_service._create
+
+    def create_after_other_request(connection, kind, owner_id, value):
+        create(connection, kind, owner_id, value)
+        return create(connection, kind, owner_id, value)
+
+    monkeypatch.setattr(coverage_service, '_create', create_after_other_request)
+
+    bitsets = CoverageService.get_book_bitsets([book_id])
+
+    assert bitsets[book_id].bit_count() == 4
+    assert WordBitset.query.filter_by(kind=WordBitset.KIND_BOOK, owner_id=book_id).count() == 1
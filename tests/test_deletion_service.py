@@ -0,0 +1,166 @@
+import time
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningRecord, LearningGoal, LearningFrontier
+from app.models.learning_plan import LearningPlan
+from app.models.test import Test, TestQuestion, TestRecord, TestAnswer
+from app.models.user_book_progress import UserBookProgress
+from app.models.word_bitset import WordBitset
+from app.services.coverage_service import CoverageService
+from app.services.deletion_service import DeletionService
+from app.services.progress_service import ProgressService
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        # 测试配置默认不检查外键，这里开启以验证级联删除
+        db.session.execute(text('PRAGMA foreign_keys=ON'))
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=5)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'definition{i}') for i in range(5)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=(i + 1) * WordRelation.ORDER_GAP))
+        db.session.add(LearningRecord(user_id=user.id, book_id=book.id, word_id=word.id, status='mastered'))
+
+    db.session.add(LearningPlan(user_id=user.id, book_id=book.id, daily_words=10, start_date=datetime.utcnow().date()))
+    db.session.add(LearningGoal(user_id=user.id, book_id=book.id, daily_word_count=10, target_date=datetime.utcnow()))
+    db.session.add(LearningFrontier(user_id=user.id, book_id=book.id, last_order=WordRelation.ORDER_GAP))
+
+    test = Test(user_id=user.id, book_id=book.id, name='Test', test_type='multiple_choice')
+    db.session.add(test)
+    db.session.flush()
+    question = TestQuestion(test_id=test.id, word_id=words[0].id, question_type='multiple_choice',
+                            question='?', correct_answer='definition0')
+    record = TestRecord(test_id=test.id, user_id=user.id, start_time=datetime.utcnow())
+    db.session.add_all([question, record])
+    db.session.flush()
+    db.session.add(TestAnswer(record_id=record.id, question_id=question.id, answer='definition0'))
+    db.session.commit()
+
+    ProgressService.get_progress(user.id, book.id)
+    CoverageService.get_coverage(user.id)
+
+    return {'user_id': user.id, 'book_id': book.id}
+
+def assert_book_gone(book_id, user_id):
+    """词书及全部关联数据都已删除"""
+    assert db.session.get(VocabularyBook, book_id) is None
+    for model in (WordRelation, LearningRecord, LearningPlan, LearningGoal, LearningFrontier,
+                  Test, TestQuestion, TestRecord, TestAnswer, UserBookProgress):
+        assert model.query.count() == 0, model.__name__
+    # 单词本身保留
+    assert Word.query.count() == 5
+    assert WordBitset.query.count() == 0
+    assert CoverageService.get_mastered_bitset(user_id) == 0
+
+def test_delete_book_cascades(init_database, app):
+    """测试删除词书由数据库级联删除关联数据"""
+    data = init_database
+    client = app.test_client()
+
+    response = client.delete(
+        f"/api/v1/vocabulary/books/{data['book_id']}",
+        headers={'Authorization': f"Bearer {create_access_token(identity=data['user_id'])}"}
+    )
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert_book_gone(data['book_id'], data['user_id'])
+
+def test_purge_book(init_database, app):
+    """测试分批删除词书"""
+    data = init_database
+
+    DeletionService.purge_book(data['book_id'], chunk_size=2)
+
+    db.session.expire_all()
+    assert_book_gone(data['book_id'], data['user_id'])
+
+def test_delete_large_book_in_background(init_database, app):
+    """测试大词书在后台删除"""
+    data = init_database
+    app.config['BOOK_DELETE_CHUNK_THRESHOLD'] = 3
+    client = app.test_client()
+
+    response = client.delete(
+        f"/api/v1/vocabulary/books/{data['book_id']}",
+        headers={'Authorization': f"Bearer {create_access_token(identity=data['user_id'])}"}
+    )
+    assert response.status_code == 202
+
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        db.session.expire_all()
+        if db.session.get(VocabularyBook, data['book_id']) is None:
+            break
+        time.sleep(0.05)
+    assert_book_gone(data['book_id'], data['user_id'])
+
+def test_purge_user_command(init_database, app):
+    """测试分批删除用户命令"""
+    data = init_database
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['purge', 'user', str(data['user_id']), '--chunk-size', '2'])
+
+    assert result.exit_code == 0
+    db.session.expire_all()
+    assert db.session.get(User, data['user_id']) is None
+    assert VocabularyBook.query.count() == 0
+    assert LearningRecord.query.count() == 0
+
+def test_background_delete_marked_and_resumable(init_database, app, monkeypatch):
+    """测试后台删除先标记词书，重复删除不再启动，进程退出后可用命令继续"""
+    data = init_database
+    app.config['BOOK_DELETE_CHUNK_THRESHOLD'] = 3
+    started = []
+    # 模拟后台线程启动后进程被终止
+    monkeypatch.setattr(DeletionService, 'purge_book_in_background', started.append)
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {create_access_token(identity=data['user_id'])}"}
+    url = f"/api/v1/vocabulary/books/{data['book_id']}"
+
+    assert client.delete(url, headers=headers).status_code == 202
+    assert client.delete(url, headers=headers).status_code == 202
+    assert started == [data['book_id']]
+
+    assert client.get(url, headers=headers).status_code == 404
+    assert client.get('/api/v1/vocabulary/books', headers=headers).get_json()['data']['total'] == 0
+    assert DeletionService.pending_books() == [data['book_id']]
+
+    result = app.test_cli_runner().invoke(args=['purge', 'pending', '--chunk-size', '2'])
+
+    assert result.exit_code == 0
+    assert '共删除 1 本词书' in result.output
+    db.session.expire_all()
+    assert_book_gone(data['book_id'], data['user_id'])
+    assert DeletionService.pending_books() == []
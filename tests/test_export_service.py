@@ -0,0 +1,128 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningRecord
+from app.services.export_service import ExportService, BOOK_COLUMNS
+from app.services.import_service import ImportService
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=3)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'释义{i}') for i in range(3)]
+    db.session.add_all(words)
+    db.session.flush()
+    # 顺序与插入顺序相反
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=3 - i))
+    db.session.add(LearningRecord(user_id=user.id, book_id=book.id, word_id=words[0].id, status='mastered'))
+    db.session.commit()
+
+    headers = {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+    return {'user': user, 'book': book, 'headers': headers}
+
+def test_encode_csv_roundtrip(init_database, app):
+    """测试导出的 CSV 可以重新导入"""
+    book_id = init_database['book'].id
+    text = ''.join(ExportService.encode(ExportService.book_rows(book_id), 'csv', BOOK_COLUMNS))
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [row['text'] for row in rows] == ['word2', 'word1', 'word0']
+
+    other = VocabularyBook(name='Copy', user_id=init_database['user'].id)
+    db.session.add(other)
+    db.session.commit()
+    stats = ImportService.import_words(other.id, ImportService.iter_rows(io.StringIO(text), 'csv'))
+    assert stats['added'] == 3
+    assert stats['created'] == 0
+
+def test_gzip(init_database, app):
+    """测试流式 gzip 压缩"""
+    chunks = [f'line{i}\n' for i in range(20000)]
+    data = b''.join(ExportService.gzip(chunks))
+
+    assert gzip.decompress(data).decode('utf-8') == ''.join(chunks)
+
+def test_export_book_api(init_database, app):
+    """测试导出词书接口"""
+    client = app.test_client()
+    response = client.get(
+        f"/api/v1/vocabulary/books/{init_database['book'].id}/export",
+        headers=init_database['headers']
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['order'] for line in lines] == [1, 2, 3]
+    assert lines[0]['definition'] == '释义2'
+
+def test_export_records_api(init_database, app):
+    """测试导出学习记录接口"""
+    client = app.test_client()
+    response = client.get(
+        '/api/v1/learning/records/export?format=csv&gzip=1',
+        headers=init_database['headers']
+    )
+
+    assert response.status_code == 200
+    assert 'learning-records' in response.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.get_data()).decode('utf-8'))))
+    assert len(rows) == 1
+    assert rows[0]['text'] == 'word0'
+    assert rows[0]['status'] == 'mastered'
+
+    response = client.get('/api/v1/learning/records/export?format=xml', headers=init_database['headers'])
+    assert response.status_code == 400
+    assert response.json['code'] == 400001
+
+def test_export_book_api_errors(init_database, app):
+    """测试导出不存在或他人的词书"""
+    other = User(username='other_user', email='other@example.com')
+    other.set_password('password123')
+    db.session.add(other)
+    db.session.commit()
+    client = app.test_client()
+    book_id = init_database['book'].id
+
+    response = client.get(f'/api/v1/vocabulary/books/{book_id + 1}/export', headers=init_database['headers'])
+    assert response.status_code == 404
+    assert response.json['code'] == 404001
+
+    headers = {'Authorization': f'Bearer {create_access_token(identity=other.id)}'}
+    response = client.get(f'/api/v1/vocabulary/books/{book_id}/export', headers=headers)
+    assert response.status_code == 403
+    assert response.json['code'] == 403001
+
+    response = client.get(f'/api/v1/vocabulary/books/{book_id}/export?format=xml', headers=init_database['headers'])
+    assert response.status_code == 400
+    assert response.json['code'] == 400001
@@ -0,0 +1,137 @@
+import pytest
+import time
+from datetime import datetime, date, timedelta
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningRecord
+from app.models.learning_plan import LearningPlan
+from app.services.forecast_service import ForecastService
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=10)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'definition{i}') for i in range(10)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=i + 1))
+
+    # 两个单词正在学习，明天复习
+    tomorrow = datetime.utcnow() + timedelta(days=1)
+    for word in words[:2]:
+        db.session.add(LearningRecord(
+            user_id=user.id, book_id=book.id, word_id=word.id,
+            status='learning', review_count=1, next_review_time=tomorrow
+        ))
+
+    plan = LearningPlan(
+        user_id=user.id,
+        book_id=book.id,
+        daily_words=4,
+        start_date=datetime.utcnow().date()
+    )
+    db.session.add(plan)
+    db.session.commit()
+
+    return {'user': user, 'book': book, 'plan': plan}
+
+def test_simulate_introduction_and_reviews():
+    """测试新词引入和复习排期"""
+    start = date(2024, 1, 1)
+    result = ForecastService.simulate(80, 20, start_date=start)
+
+    assert result['daily_new_words'][:5] == [20, 20, 20, 20, 0]
+    assert result['introduction_end_date'] == '2024-01-04'
+    # 第二天开始复习第一天的新词
+    assert result['daily_reviews'][1] == 20
+    assert result['peak_workload'] > 20
+    # 最后一批单词经过全部复习间隔后才算完成
+    assert result['completion_date'] == (start + timedelta(days=3 + sum([1, 2, 4, 7, 15, 30, 60]))).isoformat()
+    assert sum(result['daily_reviews']) == 80 * 7
+
+def test_simulate_daily_load_limit():
+    """测试每日学习量上限推迟新词引入"""
+    unlimited = ForecastService.simulate(200, 20, start_date=date(2024, 1, 1))
+    limited = ForecastService.simulate(200, 20, start_date=date(2024, 1, 1), max_daily_load=30)
+
+    # 复习优先，新词只占用剩余额度
+    for new, reviews in zip(limited['daily_new_words'], limited['daily_reviews']):
+        assert new <= max(30 - reviews, 0)
+    assert limited['introduction_end_date'] > unlimited['introduction_end_date']
+
+def test_simulate_retention():
+    """测试遗忘的单词次日重新复习"""
+    perfect = ForecastService.simulate(100, 20, start_date=date(2024, 1, 1))
+    forgetful = ForecastService.simulate(100, 20, start_date=date(2024, 1, 1), retention=0.8)
+
+    assert sum(forgetful['daily_reviews']) > sum(perfect['daily_reviews'])
+
+def test_simulate_invalid_daily_words():
+    """测试每日单词数必须为正"""
+    with pytest.raises(ValueError):
+        ForecastService.simulate(100, 0)
+
+def test_simulate_speed():
+    """测试一万词一年的模拟耗时"""
+    start = time.perf_counter()
+    ForecastService.simulate(10000, 30, horizon_days=365)
+    assert time.perf_counter() - start < 0.05
+
+def test_forecast_plan(init_database, app):
+    """测试根据学习进度预测计划"""
+    result = ForecastService.forecast_plan(init_database['plan'])
+
+    # 剩余 8 个新词，每天 4 个
+    assert result['daily_new_words'][:3] == [4, 4, 0]
+    # 明天到期的复习计入工作量
+    assert result['daily_reviews'][1] >= 2
+    assert result['completion_date'] is not None
+
+def test_plan_api_invalid_daily_load(init_database, app):
+    """测试 max_daily_load 不是正整数时返回 400 且不保存计划"""
+    from flask_jwt_extended import create_access_token
+    data = init_database
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=data["user"].id)}'}
+    payload = {'book_id': data['book'].id, 'daily_words': 5, 'start_date': '2024-01-01'}
+
+    for value in ('abc', 0, -3, 2.5, True):
+        response = client.post('/api/v1/learning/plans', headers=headers, json={**payload, 'max_daily_load': value})
+        assert response.status_code == 400
+        assert response.json['code'] == 400001
+    assert LearningPlan.query.count() == 1
+
+    response = client.post('/api/v1/learning/plans', headers=headers, json={**payload, 'max_daily_load': 30})
+    assert response.status_code == 200
+    assert response.json['data']['forecast']
+
+    plan_id = data['plan'].id
+    response = client.put(f'/api/v1/learning/plans/{plan_id}', headers=headers,
+                          json={'daily_words': 9, 'max_daily_load': 'x'})
+    assert response.status_code == 400
+    assert db.session.get(LearningPlan, plan_id).daily_words == 4
@@ -0,0 +1,142 @@
+import pytest
+from datetime import datetime, timedelta
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningGoal
+from app.models.test import Test, TestQuestion
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=3)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'definition{i}') for i in range(3)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=(i + 1) * WordRelation.ORDER_GAP))
+
+    test = Test(user_id=user.id, book_id=book.id, name='Test', test_type='multiple_choice')
+    db.session.add(test)
+    db.session.flush()
+    db.session.add(TestQuestion(test_id=test.id, word_id=words[0].id, question_type='multiple_choice',
+                                question='?', correct_answer='definition0'))
+    db.session.add(LearningGoal(user_id=user.id, book_id=book.id, daily_word_count=10,
+                                target_date=datetime.utcnow() + timedelta(days=30)))
+    db.session.commit()
+
+    return {
+        'book_id': book.id,
+        'test_id': test.id,
+        'word_ids': [word.id for word in words],
+        'headers': {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+    }
+
+def revalidate(client, url, headers, response):
+    """带上一次响应的 ETag 再次请求"""
+    return client.get(url, headers={**headers, 'If-None-Match': response.headers['ETag']})
+
+def test_book_words_not_modified(init_database, app):
+    """测试单词列表未变化时返回 304，增删改后返回新内容"""
+    client = app.test_client()
+    headers = init_database['headers']
+    url = f"/api/v1/vocabulary/books/{init_database['book_id']}/words"
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.headers['ETag'].startswith('W/')
+    assert 'Last-Modified' in response.headers
+    assert 'no-cache' in response.headers['Cache-Control']
+
+    cached = revalidate(client, url, headers, response)
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert cached.headers['ETag'] == response.headers['ETag']
+
+    # 不同分页使用不同的 ETag
+    assert revalidate(client, url + '?page=2', headers, response).status_code == 200
+
+    word = db.session.get(Word, init_database['word_ids'][0])
+    word.definition = 'changed'
+    db.session.commit()
+    changed = revalidate(client, url, headers, response)
+    assert changed.status_code == 200
+    assert changed.get_json()['data']['items'][0]['definition'] == 'changed'
+
+    response = client.delete(f"{url}/{init_database['word_ids'][1]}", headers=headers)
+    assert response.status_code == 200
+    deleted = revalidate(client, url, headers, changed)
+    assert deleted.status_code == 200
+    assert deleted.get_json()['data']['total'] == 2
+
+def test_book_detail_if_modified_since(init_database, app):
+    """测试按 Last-Modified 判断词书是否变化"""
+    client = app.test_client()
+    headers = init_database['headers']
+    url = f"/api/v1/vocabulary/books/{init_database['book_id']}"
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['data']['word_count'] == 3
+
+    cached = client.get(url, headers={**headers, 'If-Modified-Since': response.headers['Last-Modified']})
+    assert cached.status_code == 304
+
+    earlier = (datetime.utcnow() - timedelta(days=1)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+    assert client.get(url, headers={**headers, 'If-Modified-Since': earlier}).status_code == 200
+
+def test_test_detail_not_modified(init_database, app):
+    """测试测试详情在题目变化后失效"""
+    client = app.test_client()
+    headers = init_database['headers']
+    url = f"/api/v1/tests/{init_database['test_id']}"
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert revalidate(client, url, headers, response).status_code == 304
+
+    question = TestQuestion.query.first()
+    question.question = 'changed?'
+    db.session.commit()
+    assert revalidate(client, url, headers, response).status_code == 200
+
+def test_learning_goals_not_modified(init_database, app):
+    """测试学习目标列表只使用 ETag"""
+    client = app.test_client()
+    headers = init_database['headers']
+    url = '/api/v1/learning/goals'
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response.headers
+    assert revalidate(client, url, headers, response).status_code == 304
+
+    LearningGoal.query.delete()
+    db.session.commit()
+    response = revalidate(client, url, headers, response)
+    assert response.status_code == 200
+    assert response.get_json()['data']['items'] == []
@@ -0,0 +1,150 @@
+import io
+import json
+import pytest
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.services.import_service import ImportService
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=1)
+    db.session.add(book)
+    db.session.flush()
+
+    # 词库中已有 apple，且已在词书中
+    word = Word(text='apple', definition='苹果')
+    db.session.add(word)
+    db.session.flush()
+    db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=1))
+    # 词库中已有 banana，但不在词书中
+    db.session.add(Word(text='banana', definition='香蕉'))
+    db.session.commit()
+
+    return {'user': user, 'book': book}
+
+def test_import_csv(init_database, app):
+    """测试导入 CSV 并去重"""
+    book_id = init_database['book'].id
+    data = io.StringIO(
+        'text,definition,phonetic\n'
+        'apple,苹果,\n'
+        'banana,香蕉,\n'
+        'cherry,樱桃,/ˈtʃeri/\n'
+        'cherry,重复,\n'
+        'nodef,,\n'
+    )
+
+    progress = []
+    stats = ImportService.import_words(book_id, ImportService.iter_rows(data, 'csv'), chunk_size=2,
+                                       on_progress=progress.append)
+
+    assert stats == {'processed': 5, 'created': 1, 'added': 2, 'skipped': 3}
+    assert len(progress) == 3
+    assert Word.query.filter_by(text='banana').count() == 1
+    assert Word.query.filter_by(text='cherry').first().phonetic == '/ˈtʃeri/'
+
+    orders = [order for order, in db.session.query(WordRelation.order).filter_by(book_id=book_id).order_by(WordRelation.order)]
+    assert orders == [1, 1 + WordRelation.ORDER_GAP, 1 + 2 * WordRelation.ORDER_GAP]
+    assert db.session.get(VocabularyBook, book_id).total_words == 3
+
+def test_import_invalid_format(init_database, app):
+    """测试不支持的文件格式"""
+    with pytest.raises(ValueError):
+        list(ImportService.iter_rows(io.StringIO(''), 'xml'))
+
+def test_import_command(init_database, app, tmp_path):
+    """测试导入命令"""
+    path = tmp_path / 'words.jsonl'
+    path.write_text('\n'.join(
+        json.dumps({'text': f'word{i}', 'definition': f'definition{i}'}) for i in range(5)
+    ), encoding='utf-8')
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['words', 'import', str(init_database['book'].id), str(path), '--chunk-size', '2'])
+
+    assert result.exit_code == 0
+    assert '加入 5' in result.output
+    assert WordRelation.query.filter_by(book_id=init_database['book'].id).count() == 6
+
+def test_import_api(init_database, app):
+    """测试导入接口"""
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {create_access_token(identity=init_database['user'].id)}"}
+
+    response = client.post(
+        f"/api/v1/vocabulary/books/{init_database['book'].id}/import",
+        data={'file': (io.BytesIO('text,definition\ncherry,樱桃\n'.encode('utf-8')), 'words.csv')},
+        headers=headers,
+        content_type='multipart/form-data'
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['added'] == 1
+
+    response = client.post(
+        f"/api/v1/vocabulary/books/{init_database['book'].id}/import?format=xml",
+        data=b'',
+        headers=headers
+    )
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 400001
+
+    response = client.post(f"/api/v1/vocabulary/books/{init_database['book'].id + 100}/import", data=b'', headers=headers)
+    assert response.status_code == 404
+    assert response.get_json()['code'] == 404001
+
+def test_iter_rows_invalid_values():
+    """测试非对象行和非字符串字段报出行号，数字按文本处理"""
+    rows = ImportService.iter_rows(io.StringIO('{"text": 123, "definition": "数字"}\n'), 'jsonl')
+    assert next(rows)['text'] == '123'
+
+    with pytest.raises(ValueError, match='Line 2: expected an object'):
+        list(ImportService.iter_rows(io.StringIO('{"text": "a"}\n["apple"]\n'), 'jsonl'))
+    with pytest.raises(ValueError, match="Line 1: field 'text' must be a string"):
+        list(ImportService.iter_rows(io.StringIO('{"text": ["apple"]}\n'), 'jsonl'))
+    with pytest.raises(ValueError, match='Line 2: invalid JSON'):
+        list(ImportService.iter_rows(io.StringIO('{"text": "a"}\n{oops\n'), 'jsonl'))
+
+def test_import_api_invalid_row(init_database, app, monkeypatch):
+    """测试无效行返回 400，并说明已提交的部分"""
+    monkeypatch.setattr(ImportService, 'CHUNK_SIZE', 2)
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {create_access_token(identity=init_database['user'].id)}"}
+    lines = [json.dumps({'text': f'word{i}', 'definition': f'definition{i}'}) for i in range(3)] + ['["apple"]']
+
+    response = client.post(
+        f"/api/v1/vocabulary/books/{init_database['book'].id}/import?format=jsonl",
+        data='\n'.join(lines).encode('utf-8'),
+        headers=headers
+    )
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['code'] == 400001
+    assert 'Line 4' in body['message']
+    # 第一块已提交，出错的第二块回滚
+    assert body['data']['added'] == 2
+    assert WordRelation.query.filter_by(book_id=init_database['book'].id).count() == 3
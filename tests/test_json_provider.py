@@ -0,0 +1,106 @@
+import json
+import pytest
+from datetime import datetime, date
+from decimal import Decimal
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.test import Test, TestQuestion
+from app.utils import json_provider
+from app.utils.serializers import RowSerializer
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=3)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'释义{i}', phonetic=f'/w{i}/') for i in range(3)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(reversed(words)):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=(i + 1) * WordRelation.ORDER_GAP))
+    db.session.commit()
+
+    return {'user_id': user.id, 'book_id': book.id, 'words': words}
+
+def test_dumps_datetime(app):
+    """测试日期时间与 isoformat 输出一致"""
+    value = {'at': datetime(2024, 1, 2, 3, 4, 5, 678), 'day': date(2024, 1, 2), 'price': Decimal('1.50'), 1: '中文'}
+
+    data = app.json.loads(app.json.dumps(value))
+
+    assert data == {'at': value['at'].isoformat(), 'day': '2024-01-02', 'price': '1.50', '1': '中文'}
+
+def test_dumps_stdlib_fallback(app, monkeypatch):
+    """测试未安装 orjson 时退回标准库，输出相同"""
+    value = {'at': datetime(2024, 1, 2, 3, 4, 5, 678), 'text': '中文', 'items': [1, 2.5, None, True]}
+    fast = app.json.dumps(value)
+
+    monkeypatch.setattr(json_provider, 'orjson', None)
+
+    assert app.json.dumps(value) == fast
+    assert app.json.loads(fast) == json.loads(fast)
+
+def test_dumps_big_integer(app):
+    """测试超过 64 位的整数由标准库序列化"""
+    assert app.json.loads(app.json.dumps({'bits': 1 << 80})) == {'bits': 1 << 80}
+
+def test_serializer_matches_to_dict(init_database, app):
+    """测试行序列化器与 to_dict 输出一致"""
+    serializer = RowSerializer.for_model(Word)
+    rows = db.session.query(*serializer.columns).order_by(Word.id).all()
+
+    assert RowSerializer.for_model(Word) is serializer
+    assert app.json.loads(app.json.dumps(serializer.to_dicts(rows))) == \
+        [word.to_dict() for word in Word.query.order_by(Word.id)]
+
+    test = Test(user_id=init_database['user_id'], book_id=init_database['book_id'], name='Test', test_type='multiple_choice')
+    db.session.add(test)
+    db.session.flush()
+    db.session.add(TestQuestion(test_id=test.id, word_id=init_database['words'][0].id, question_type='multiple_choice',
+                                question='?', options=['a', 'b'], correct_answer='a'))
+    db.session.commit()
+
+    for model in (Test, TestQuestion):
+        serializer = RowSerializer.for_model(model)
+        row = db.session.query(*serializer.columns).one()
+        assert app.json.loads(app.json.dumps(serializer.to_dict(row))) == model.query.one().to_dict()
+
+def test_book_words_api(init_database, app):
+    """测试单词列表接口按词书顺序输出"""
+    client = app.test_client()
+
+    response = client.get(
+        f"/api/v1/vocabulary/books/{init_database['book_id']}/words?per_page=2",
+        headers={'Authorization': f"Bearer {create_access_token(identity=init_database['user_id'])}"}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    data = response.get_json()['data']
+    assert data['total'] == 3
+    assert data['pages'] == 2
+    assert data['items'] == [db.session.get(Word, word_id).to_dict() for word_id in (3, 2)]
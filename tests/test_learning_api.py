@@ -166,6 +166,7 @@ def test_get_learning_plan(client, auth_headers, setup_learning_data):
     assert 'plans' in data['data']
     assert len(data['data']['plans']) > 0
     assert data['data']['plans'][0]['start_date'] == start_date
+    assert 'mastered_words' in data['data']['plans'][0]['progress']
 
 def test_update_learning_plan(client, auth_headers, setup_learning_data):
     """测试更新学习计划"""
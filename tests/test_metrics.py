@@ -0,0 +1,125 @@
+import os
+import sys
+import subprocess
+import pytest
+from app import db, create_app
+from app.config import config, TestingConfig
+from app.models.user import User
+from app.services.word_service import WordService
+from app.extensions import kv_cache
+from flask_jwt_extended import create_access_token
+
+prometheus_client = pytest.importorskip('prometheus_client')
+REGISTRY = prometheus_client.REGISTRY
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['REDIS_URL'] = 'redis://127.0.0.1:1/0'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.commit()
+    return {'headers': {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}}
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_request_metrics(init_database, app):
+    """测试按端点记录请求数和耗时"""
+    client = app.test_client()
+    labels = {'method': 'GET', 'endpoint': 'vocabulary.get_books'}
+    count = sample('http_requests_total', status='200', **labels)
+    observed = sample('http_request_duration_seconds_count', **labels)
+
+    for _ in range(3):
+        assert client.get('/api/v1/vocabulary/books', headers=init_database['headers']).status_code == 200
+
+    assert sample('http_requests_total', status='200', **labels) == count + 3
+    assert sample('http_request_duration_seconds_count', **labels) == observed + 3
+
+def test_unmatched_and_error_status(init_database, app):
+    """测试未匹配路由归为 unmatched，状态码单独计数"""
+    client = app.test_client()
+    unmatched = sample('http_requests_total', method='GET', endpoint='unmatched', status='404')
+    unauthorized = sample('http_requests_total', method='GET', endpoint='vocabulary.get_books', status='401')
+
+    client.get('/no/such/path/123')
+    client.get('/api/v1/vocabulary/books')
+
+    assert sample('http_requests_total', method='GET', endpoint='unmatched', status='404') == unmatched + 1
+    assert sample('http_requests_total', method='GET', endpoint='vocabulary.get_books', status='401') == unauthorized + 1
+
+def test_metrics_endpoint(init_database, app):
+    """测试 /metrics 返回文本格式且不统计自身"""
+    client = app.test_client()
+    client.get('/api/v1/vocabulary/books', headers=init_database['headers'])
+    before = sample('http_requests_total', method='GET', endpoint='metrics', status='200')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    body = response.get_data(as_text=True)
+    assert 'http_request_duration_seconds_bucket{' in body
+    assert 'cache_requests_total' in body
+    assert sample('http_requests_total', method='GET', endpoint='metrics', status='200') == before
+
+def test_cache_and_redis_metrics(app):
+    """测试缓存命中和 Redis 失败计数"""
+    hits = sample('cache_requests_total', cache='word_key', result='hit')
+    misses = sample('cache_requests_total', cache='word_key', result='miss')
+    errors = sample('redis_errors_total', component='kv_cache')
+
+    WordService.get_or_create('apple', 'n. 苹果')
+    WordService.find_by_text('apple')
+    kv_cache.get('missing')
+
+    assert sample('cache_requests_total', cache='word_key', result='miss') == misses + 1
+    assert sample('cache_requests_total', cache='word_key', result='hit') == hits + 1
+    assert sample('redis_errors_total', component='kv_cache') == errors + 1
+
+def test_disabled():
+    """测试关闭指标时不注册 /metrics"""
+    class NoMetricsConfig(TestingConfig):
+        METRICS_ENABLED = False
+
+    config['no_metrics'] = NoMetricsConfig
+    try:
+        assert create_app('no_metrics').test_client().get('/metrics').status_code == 404
+    finally:
+        del config['no_metrics']
+
+def test_multiprocess_mode(tmp_path):
+    """测试多进程模式汇总各进程写入目录的指标"""
+    script = '''
+from app import create_app
+from app.extensions import db
+app = create_app('testing')
+with app.app_context():
+    db.create_all()
+client = app.test_client()
+client.get('/api/v1/vocabulary/books')
+print(client.get('/metrics').get_data(as_text=True))
+'''
+    env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+    result = subprocess.run([sys.executable, '-c', script], cwd=root, env=env,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert 'http_requests_total{endpoint="vocabulary.get_books",method="GET",status="401"} 1.0' in result.stdout
+    assert any(name.endswith('.db') for name in os.listdir(tmp_path))
@@ -0,0 +1,154 @@
+import pytest
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningFrontier
+from app.services.ordering_service import OrderingService
+from flask_jwt_extended import create_access_token
+
+GAP = WordRelation.ORDER_GAP
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'definition{i}') for i in range(4)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=(i + 1) * GAP))
+    db.session.commit()
+
+    return {'user': user, 'book': book, 'words': [word.id for word in words]}
+
+def book_order(book_id):
+    """按顺序返回词书单词ID"""
+    return [word_id for word_id, in db.session.query(WordRelation.word_id).filter_by(
+        book_id=book_id
+    ).order_by(WordRelation.order, WordRelation.id)]
+
+def test_move_after(init_database, app):
+    """测试移动单词到另一个单词之后只修改一行"""
+    book_id = init_database['book'].id
+    w = init_database['words']
+
+    order = OrderingService.move(book_id, w[3], after_word_id=w[0])
+    db.session.commit()
+
+    assert order == GAP + GAP // 2
+    assert book_order(book_id) == [w[0], w[3], w[1], w[2]]
+    # 其他单词的顺序值不变
+    assert db.session.query(WordRelation.order).filter_by(book_id=book_id, word_id=w[1]).scalar() == 2 * GAP
+
+def test_move_to_front_and_end(init_database, app):
+    """测试移动到开头和末尾"""
+    book_id = init_database['book'].id
+    w = init_database['words']
+
+    OrderingService.move(book_id, w[2])
+    OrderingService.move(book_id, w[0], after_word_id=w[3])
+    db.session.commit()
+
+    assert book_order(book_id) == [w[2], w[1], w[3], w[0]]
+
+def test_move_rebalances_when_gap_exhausted(init_database, app):
+    """测试间隔用尽时重新编号"""
+    book_id = init_database['book'].id
+    w = init_database['words']
+    db.session.query(WordRelation).filter_by(book_id=book_id, word_id=w[1]).update({'order': GAP + 1})
+    db.session.commit()
+
+    OrderingService.move(book_id, w[3], after_word_id=w[0])
+    db.session.commit()
+
+    assert book_order(book_id) == [w[0], w[3], w[1], w[2]]
+    orders = [order for order, in db.session.query(WordRelation.order).filter_by(book_id=book_id)]
+    assert len(set(orders)) == 4
+
+def test_move_pulls_back_frontier(init_database, app):
+    """测试移到推进位置之前时推进位置后退"""
+    data = init_database
+    book_id = data['book'].id
+    w = data['words']
+    db.session.add(LearningFrontier(user_id=data['user'].id, book_id=book_id, last_order=2 * GAP))
+    db.session.commit()
+
+    order = OrderingService.move(book_id, w[3], after_word_id=w[0])
+    db.session.commit()
+
+    frontier = LearningFrontier.query.filter_by(book_id=book_id).first()
+    assert frontier.last_order == order - 1
+
+def test_move_invalid(init_database, app):
+    """测试无效移动"""
+    book_id = init_database['book'].id
+    w = init_database['words']
+
+    with pytest.raises(ValueError):
+        OrderingService.move(book_id, w[0], after_word_id=w[0])
+    with pytest.raises(ValueError):
+        OrderingService.move(book_id, 9999)
+
+def test_move_api(init_database, app):
+    """测试移动单词接口"""
+    data = init_database
+    book_id = data['book'].id
+    w = data['words']
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {create_access_token(identity=data['user'].id)}"}
+
+    response = client.put(
+        f'/api/v1/vocabulary/books/{book_id}/words/{w[0]}/move',
+        json={'after_word_id': w[2]},
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    assert book_order(book_id) == [w[1], w[2], w[0], w[3]]
+
+    response = client.put(
+        f'/api/v1/vocabulary/books/{book_id}/words/{w[0]}/move',
+        json={'after_word_id': 9999},
+        headers=headers
+    )
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 400001
+
+    response = client.put(f'/api/v1/vocabulary/books/{book_id + 100}/words/{w[0]}/move', json={}, headers=headers)
+    assert response.get_json()['code'] == 404001
+
+def test_rebalance_command(init_database, app):
+    """测试重新编号命令"""
+    book_id = init_database['book'].id
+    db.session.query(WordRelation).filter_by(book_id=book_id).update({'order': WordRelation.order - GAP + 1})
+    db.session.commit()
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['words', 'rebalance', '--book-id', str(book_id)])
+
+    assert result.exit_code == 0
+    orders = sorted(order for order, in db.session.query(WordRelation.order).filter_by(book_id=book_id))
+    assert orders == [GAP, 2 * GAP, 3 * GAP, 4 * GAP]
@@ -0,0 +1,85 @@
+import threading
+import pytest
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models.user import User
+from app.services.password_service import PasswordService, PasswordHasherBusy, _hasher
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库，用户的密码哈希使用旧算法"""
+    user = User(username='test_user', email='test@example.com')
+    user.password_hash = generate_password_hash('password123', method='pbkdf2:sha256:2000')
+    db.session.add(user)
+    db.session.commit()
+    return {'user_id': user.id}
+
+def test_hash_uses_configured_method(app):
+    """测试按配置的算法生成哈希"""
+    password_hash = PasswordService.hash('secret')
+
+    assert password_hash.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+    assert PasswordService.verify(password_hash, 'secret')
+    assert not PasswordService.verify(password_hash, 'wrong')
+    assert not PasswordService.verify(None, 'secret')
+    assert not PasswordService.needs_rehash(password_hash)
+    assert PasswordService.needs_rehash(generate_password_hash('secret', method='scrypt'))
+
+def test_login_rehashes_legacy_hash(init_database, app):
+    """测试登录成功后把旧哈希升级为当前算法"""
+    client = app.test_client()
+
+    response = client.post('/api/v1/auth/login', json={'username': 'test_user', 'password': 'wrong'})
+    assert response.status_code == 401
+    assert db.session.get(User, init_database['user_id']).password_hash.startswith('pbkdf2:sha256:2000$')
+
+    response = client.post('/api/v1/auth/login', json={'username': 'test_user', 'password': 'password123'})
+    assert response.status_code == 200
+
+    db.session.expire_all()
+    user = db.session.get(User, init_database['user_id'])
+    assert user.password_hash.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+    assert user.check_password('password123')
+
+def test_busy_hasher_returns_503(init_database, app):
+    """测试哈希线程池排队已满时返回 503"""
+    app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0, PASSWORD_HASH_TIMEOUT=0.05)
+    hasher = _hasher()
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    # 占满唯一的哈希线程
+    thread = threading.Thread(target=hasher.run, args=(block,))
+    thread.start()
+    started.wait(5)
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            PasswordService.hash('secret')
+
+        response = app.test_client().post('/api/v1/auth/login',
+                                          json={'username': 'test_user', 'password': 'password123'})
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        release.set()
+        thread.join()
+
+    assert PasswordService.verify(PasswordService.hash('secret'), 'secret')
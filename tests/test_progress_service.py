@@ -0,0 +1,232 @@
+import pytest
+from datetime import datetime
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningRecord
+from app.models.learning_plan import LearningPlan
+from app.models.user_book_progress import UserBookProgress
+from app.services.progress_service import ProgressService
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+    
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=5)
+    db.session.add(book)
+    db.session.flush()
+    
+    words = [Word(text=f'word{i}', definition=f'definition{i}') for i in range(5)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=i + 1))
+    
+    # 已有两条学习记录
+    records = [
+        LearningRecord(user_id=user.id, book_id=book.id, word_id=words[0].id, status='mastered'),
+        LearningRecord(user_id=user.id, book_id=book.id, word_id=words[1].id, status='learning')
+    ]
+    db.session.add_all(records)
+    db.session.commit()
+    
+    return {'user': user, 'book': book, 'words': words, 'records': records}
+
+def test_first_record_creates_row(init_database, app):
+    """测试写入第一批学习记录时生成进度行，与记录一起提交"""
+    data = init_database
+    
+    progress = UserBookProgress.query.filter_by(user_id=data['user'].id, book_id=data['book'].id).one()
+    
+    # 同一次 flush 写入的两条记录只计一次
+    assert progress.mastered_count == 1
+    assert progress.learning_count == 1
+    assert progress.today_count == 2
+
+def test_get_progress_builds_row(init_database, app):
+    """测试没有进度行的已有学习记录在首次读取时聚合生成"""
+    data = init_database
+    UserBookProgress.query.delete()
+    db.session.commit()
+    
+    progress = ProgressService.get_progress(data['user'].id, data['book'].id)
+    
+    assert progress.mastered_count == 1
+    assert progress.learning_count == 1
+    assert progress.reviewing_count == 0
+    assert progress.today_learned == 2
+    assert progress.new_count(data['book'].total_words) == 3
+    assert UserBookProgress.query.count() == 1
+
+def test_progress_follows_record_changes(init_database, app):
+    """测试学习记录变化时增量更新进度"""
+    data = init_database
+    user_id = data['user'].id
+    book_id = data['book'].id
+    ProgressService.get_progress(user_id, book_id)
+    
+    # 新增记录
+    db.session.add(LearningRecord(user_id=user_id, book_id=book_id, word_id=data['words'][2].id))
+    db.session.commit()
+    
+    # 状态变化
+    data['records'][1].status = 'mastered'
+    db.session.commit()
+    
+    # 删除记录
+    db.session.delete(data['records'][0])
+    db.session.commit()
+    
+    progress = UserBookProgress.query.filter_by(user_id=user_id, book_id=book_id).first()
+    db.session.refresh(progress)
+    assert progress.mastered_count == 1
+    assert progress.learning_count == 1
+    assert progress.today_count == 3
+    assert progress.last_studied_at is not None
+
+def test_rebuild(init_database, app):
+    """测试重建进度计数"""
+    data = init_database
+    progress = ProgressService.get_progress(data['user'].id, data['book'].id)
+    
+    # 模拟计数漂移
+    progress.mastered_count = 10
+    db.session.commit()
+    
+    assert ProgressService.rebuild() == 1
+    progress = ProgressService.get_progress(data['user'].id, data['book'].id)
+    assert progress.mastered_count == 1
+    assert progress.learning_count == 1
+
+def test_rebuild_command(init_database, app):
+    """测试重建进度命令"""
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['progress', 'rebuild', '--user-id', str(init_database['user'].id)])
+    
+    assert result.exit_code == 0
+    assert '1' in result.output
+    assert UserBookProgress.query.count() == 1
+
+def test_get_progress_batch(init_database, app):
+    """测试批量获取多本词书进度"""
+    data = init_database
+    user_id = data['user'].id
+    other = VocabularyBook(name='Other Book', user_id=user_id, total_words=0)
+    db.session.add(other)
+    db.session.commit()
+    
+    # 已有进度行直接读取，缺失的一次聚合生成
+    ProgressService.get_progress(user_id, data['book'].id)
+    progress = ProgressService.get_progress_batch(user_id, [data['book'].id, other.id])
+    
+    assert progress[data['book'].id].mastered_count == 1
+    assert progress[other.id].studied_count == 0
+    assert UserBookProgress.query.count() == 2
+
+def test_resolve(init_database, app):
+    """测试为多个计划批量计算进度"""
+    data = init_database
+    plans = [LearningPlan(
+        user_id=data['user'].id,
+        book_id=data['book'].id,
+        daily_words=10,
+        start_date=datetime.utcnow().date()
+    )]
+    
+    progress = ProgressService.resolve(data['user'].id, plans)
+    
+    assert progress[data['book'].id]['book_name'] == 'Test Book'
+    assert progress[data['book'].id]['mastered_words'] == 1
+    assert progress[data['book'].id]['new_words'] == 3
+    assert progress[data['book'].id]['progress'] == 20
+
+def test_get_progress_does_not_commit(init_database, app):
+    """测试首次读取只在当前事务中插入进度行，不提交调用方的其他改动"""
+    data = init_database
+    UserBookProgress.query.delete()
+    db.session.commit()
+    db.session.add(Word(text='pending', definition='未提交'))
+    db.session.flush()
+
+    ProgressService.get_progress(data['user'].id, data['book'].id)
+    db.session.rollback()
+
+    assert Word.query.filter_by(text='pending').count() == 0
+    assert UserBookProgress.query.count() == 0
+
+def test_get_progress_concurrent_insert(init_database, app, monkeypatch):
+    """测试聚合期间其他请求已插入进度行时保留该行，不抛出唯一约束错误"""
+    data = init_database
+    user_id, book_id = data['user'].id, data['book'].id
+    UserBookProgress.query.delete()
+    db.session.commit()
+    build = ProgressService._build
+
+    def build_after_other_request(*args, **kwargs):
+        db.session.execute(UserBookProgress.__table__.insert().values(
+            user_id=user_id, book_id=book_id, mastered_count=1, learning_count=1, today_count=0
+        ))
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(ProgressService, '_build', staticmethod(build_after_other_request))
+
+    progress = ProgressService.get_progress(user_id, book_id)
+
+    assert progress.mastered_count == 1
+    assert UserBookProgress.query.count() == 1
+
+def test_row_created_for_legacy_records(init_database, app):
+    """测试已有记录但没有进度行时，记录变化后由全部记录重新聚合，不只计入变化的一条"""
+    data = init_database
+    user_id, book_id = data['user'].id, data['book'].id
+    UserBookProgress.query.delete()
+    db.session.commit()
+
+    data['records'][1].status = 'mastered'
+    db.session.commit()
+
+    progress = UserBookProgress.query.filter_by(user_id=user_id, book_id=book_id).one()
+    assert progress.mastered_count == 2
+    assert progress.learning_count == 0
+
+def test_flush_concurrent_row(init_database, app, monkeypatch):
+    """测试 flush 期间其他事务已插入进度行时，以重新聚合的计数覆盖"""
+    from app.services import progress_service
+    data = init_database
+    user_id, book_id = data['user'].id, data['book'].id
+    UserBookProgress.query.delete()
+    db.session.commit()
+    insert_missing = progress_service._insert_missing
+
+    def insert_after_other_request(rows, connection=None):
+        connection.execute(UserBookProgress.__table__.insert().values(
+            user_id=user_id, book_id=book_id, mastered_count=5, learning_count=0, today_count=0
+        ))
+        return insert_missing(rows, connection)
+
+    monkeypatch.setattr(progress_service, '_insert_missing', insert_after_other_request)
+    db.session.add(LearningRecord(user_id=user_id, book_id=book_id, word_id=data['words'][2].id))
+    db.session.commit()
+
+    progress = UserBookProgress.query.filter_by(user_id=user_id, book_id=book_id).one()
+    assert progress.mastered_count == 1
+    assert progress.learning_count == 2
@@ -0,0 +1,133 @@
+import logging
+import pytest
+from flask import jsonify
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningRecord
+from app.utils.query_stats import track_queries
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=20)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'definition {i}') for i in range(20)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=(i + 1) * WordRelation.ORDER_GAP))
+        db.session.add(LearningRecord(user_id=user.id, book_id=book.id, word_id=word.id))
+    db.session.commit()
+
+    return {
+        'book_id': book.id,
+        'word_ids': [word.id for word in words],
+        'headers': {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+    }
+
+def test_track_queries_nested(init_database, app):
+    """测试嵌套统计时语句同时计入外层"""
+    with track_queries() as outer:
+        Word.query.count()
+        with track_queries() as inner:
+            Word.query.filter_by(text='word1').first()
+
+    assert inner.count == 1
+    assert outer.count == 2
+    assert outer.duration >= inner.duration > 0
+
+def test_duplicates(init_database, app):
+    """测试重复语句识别为疑似 N+1"""
+    with track_queries() as stats:
+        for word_id in init_database['word_ids'][:6]:
+            Word.query.filter_by(id=word_id).first()
+        Word.query.count()
+
+    duplicates = stats.duplicates(5)
+    assert len(duplicates) == 1
+    assert duplicates[0][1] == 6
+
+def test_server_timing_header(init_database, app):
+    """测试响应头包含语句数和数据库耗时"""
+    client = app.test_client()
+
+    response = client.get(f"/api/v1/vocabulary/books/{init_database['book_id']}/words",
+                          headers=init_database['headers'])
+
+    assert response.status_code == 200
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('db;dur=')
+    assert 'queries"' in timing
+
+def test_disabled(init_database, app):
+    """测试关闭统计"""
+    app.config['QUERY_STATS_ENABLED'] = False
+    client = app.test_client()
+
+    response = client.get(f"/api/v1/vocabulary/books/{init_database['book_id']}", headers=init_database['headers'])
+
+    assert 'Server-Timing' not in response.headers
+
+def test_n_plus_one_logged(init_database, app, caplog):
+    """测试请求内重复语句记录警告和 JSON 日志"""
+    word_ids = init_database['word_ids']
+
+    @app.route('/n-plus-one')
+    def n_plus_one():
+        return jsonify([Word.query.filter_by(id=word_id).first().text for word_id in word_ids])
+
+    app.logger.setLevel(logging.INFO)
+    with caplog.at_level(logging.INFO, logger=app.logger.name):
+        response = app.test_client().get('/n-plus-one')
+
+    assert response.status_code == 200
+    messages = [record.getMessage() for record in caplog.records]
+    assert any('"event": "request_queries"' in message and '"queries": 20' in message for message in messages)
+    assert any(message.startswith('Possible N+1 query in n_plus_one: 20 executions') for message in messages)
+
+def test_book_words_query_budget(init_database, app, query_budget):
+    """测试词书单词列表的语句数不随单词数增长"""
+    client = app.test_client()
+
+    with query_budget(4, max_repeats=1):
+        response = client.get(f"/api/v1/vocabulary/books/{init_database['book_id']}/words?per_page=20",
+                              headers=init_database['headers'])
+    assert response.status_code == 200
+
+def test_learning_records_query_budget(init_database, app, query_budget):
+    """测试学习记录列表的语句数不随记录数增长"""
+    client = app.test_client()
+
+    with query_budget(2, max_repeats=1):
+        response = client.get('/api/v1/learning/records?per_page=20', headers=init_database['headers'])
+    assert response.status_code == 200
+
+def test_query_budget_exceeded(init_database, app, query_budget):
+    """测试超出预算时断言失败并列出语句"""
+    with pytest.raises(AssertionError, match='Executed 2 queries, budget is 1'):
+        with query_budget(1):
+            Word.query.count()
+            Word.query.first()
@@ -0,0 +1,145 @@
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+from app import db
+from app.extensions import rate_limiter, load_shedder
+from app.models.user import User
+from app.utils.rate_limit import Limit, parse_limit
+from app.utils.load_shedding import MonitoredQueuePool, PoolWaitMonitor, pool_wait_monitor
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用，Redis 不可达时使用进程内令牌桶"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['REDIS_URL'] = 'redis://127.0.0.1:1/0'
+    app.config['RATELIMIT_ENABLED'] = True
+    app.config['RATELIMIT_RULES'] = {'auth.login': '2/minute', 'vocabulary': '3/minute'}
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    rate_limiter.local.clear()
+    pool_wait_monitor.clear()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    users = [User(username=f'user{i}', email=f'user{i}@example.com') for i in range(2)]
+    for user in users:
+        user.set_password('password123')
+    db.session.add_all(users)
+    db.session.commit()
+    return [{'Authorization': f'Bearer {create_access_token(identity=user.id)}'} for user in users]
+
+def test_parse_limit():
+    """测试解析限流规则"""
+    assert parse_limit('5/minute') == Limit(5, 5 / 60)
+    assert parse_limit('100 / 10 seconds') == Limit(100, 10.0)
+    with pytest.raises(ValueError):
+        parse_limit('5 per minute')
+
+def test_local_bucket_refill(app):
+    """测试令牌用尽后按速率补充"""
+    limit = Limit(2, 1.0)
+
+    assert rate_limiter.hit_local('bucket', limit, now=0.0).allowed
+    assert rate_limiter.hit_local('bucket', limit, now=0.0).allowed
+    decision = rate_limiter.hit_local('bucket', limit, now=0.0)
+    assert not decision.allowed
+    assert decision.retry_after == pytest.approx(1.0)
+
+    assert rate_limiter.hit_local('bucket', limit, now=1.0).allowed
+    assert not rate_limiter.hit_local('bucket', limit, now=1.0).allowed
+
+def test_login_limited_by_ip(init_database, app):
+    """测试登录接口按 IP 限流"""
+    client = app.test_client()
+    payload = {'username': 'user0', 'password': 'wrong'}
+
+    statuses = [client.post('/api/v1/auth/login', json=payload).status_code for _ in range(3)]
+
+    assert statuses[:2] == [401, 401]
+    assert statuses[2] == 429
+    response = client.post('/api/v1/auth/login', json=payload)
+    assert response.get_json()['code'] == 429001
+    assert int(response.headers['Retry-After']) >= 1
+
+    other = client.post('/api/v1/auth/login', json=payload, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert other.status_code != 429
+
+def test_blueprint_rule_per_user(init_database, app):
+    """测试蓝图级规则按用户分别计数"""
+    client = app.test_client()
+    first, second = init_database
+
+    statuses = [client.get('/api/v1/vocabulary/books', headers=first).status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+
+    assert client.get('/api/v1/vocabulary/books', headers=second).status_code == 200
+
+def test_unlisted_endpoint_not_limited(init_database, app):
+    """测试未配置规则的端点不限流"""
+    client = app.test_client()
+    headers = init_database[0]
+
+    for _ in range(5):
+        assert client.get('/api/v1/learning/goals', headers=headers).status_code != 429
+
+def test_disabled(init_database, app):
+    """测试关闭限流"""
+    app.config['RATELIMIT_ENABLED'] = False
+    client = app.test_client()
+
+    for _ in range(3):
+        assert client.post('/api/v1/auth/login', json={'username': 'user0', 'password': 'x'}).status_code == 401
+
+def test_load_shedding(init_database, app):
+    """测试连接池等待过长时返回 503，窗口过后恢复"""
+    app.config['LOADSHED_ENABLED'] = True
+    app.config['LOADSHED_WINDOW'] = 0.2
+    client = app.test_client()
+    headers = init_database[0]
+
+    for _ in range(3):
+        pool_wait_monitor.record(1.0)
+    response = client.get('/api/v1/learning/goals', headers=headers)
+    assert response.status_code == 503
+    assert response.get_json()['code'] == 503003
+    assert response.headers['Retry-After'] == '1'
+
+    time.sleep(0.25)
+    assert not load_shedder.overloaded()
+    assert client.get('/api/v1/learning/goals', headers=headers).status_code == 200
+
+def test_pool_wait_average():
+    """测试只统计窗口内的样本"""
+    monitor = PoolWaitMonitor()
+    monitor.record(1.0, now=0.0)
+    monitor.record(0.2, now=9.0)
+    monitor.record(0.4, now=10.0)
+
+    assert monitor.average(5.0, now=10.0) == pytest.approx(0.3)
+    assert monitor.average(5.0, now=20.0) == 0.0
+
+def test_monitored_pool_records_checkout(tmp_path):
+    """测试连接池耗尽时记录排队时间，等待超时也计入"""
+    pool_wait_monitor.clear()
+    engine = create_engine(f'sqlite:///{tmp_path}/pool.db', poolclass=MonitoredQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.2)
+
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+        assert pool_wait_monitor.average(60) < 0.2
+        with pytest.raises(TimeoutError):
+            engine.connect()
+
+    # 两个样本：立即取得的连接和等待 0.2 秒后超时
+    assert pool_wait_monitor.average(60) >= 0.1
+    engine.dispose()
+    pool_wait_monitor.clear()
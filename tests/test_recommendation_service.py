@@ -5,8 +5,9 @@ from app.models.user import User
 from app.models.vocabulary import VocabularyBook, WordRelation
 from app.models.word import Word
 from app.models.assessment import UserLevelAssessment
-from app.models.learning import LearningRecord
+from app.models.learning import LearningRecord, LearningFrontier
 from app.services.recommendation_service import RecommendationService
+from flask_jwt_extended import create_access_token
 
 @pytest.fixture
 def app():
@@ -82,6 +83,7 @@ def init_database(app):
     yield {'user': user, 'book': book, 'words': words, 'assessment': assessment}
     
     # 清理数据
+    db.session.query(LearningFrontier).delete()
     db.session.query(LearningRecord).delete()
     db.session.query(UserLevelAssessment).delete()
     db.session.query(WordRelation).delete()
@@ -117,6 +119,106 @@ def test_get_recommended_words(init_database, app):
         # 确保已学习的单词不在推荐列表中
         assert all(w['id'] != data['words'][0].id for w in words)
 
+def test_get_recommended_words_in_book_order(init_database, app):
+    """测试推荐单词按词书顺序返回"""
+    with app.app_context():
+        data = init_database
+        
+        # 学习第二个单词
+        db.session.add(LearningRecord(
+            user_id=data['user'].id,
+            book_id=data['book'].id,
+            word_id=data['words'][1].id
+        ))
+        db.session.commit()
+        
+        words = RecommendationService.get_recommended_words(
+            user_id=data['user'].id,
+            book_id=data['book'].id
+        )
+        
+        assert [w['text'] for w in words] == ['apple', 'computer', 'algorithm']
+
+def test_get_recommended_words_with_frontier(init_database, app):
+    """测试使用新词推进位置获取推荐单词"""
+    with app.app_context():
+        data = init_database
+        user_id = data['user'].id
+        book_id = data['book'].id
+        
+        # 学习前两个单词
+        for word in data['words'][:2]:
+            db.session.add(LearningRecord(user_id=user_id, book_id=book_id, word_id=word.id))
+        db.session.commit()
+        
+        words = RecommendationService.get_recommended_words(
+            user_id=user_id,
+            book_id=book_id,
+            limit=1,
+            use_frontier=True
+        )
+        assert [w['text'] for w in words] == ['computer']
+        
+        frontier = LearningFrontier.query.filter_by(user_id=user_id, book_id=book_id).first()
+        assert frontier.last_order == 2
+        
+        # 学习第三个单词后推进位置继续前移
+        db.session.add(LearningRecord(user_id=user_id, book_id=book_id, word_id=data['words'][2].id))
+        db.session.commit()
+        
+        words = RecommendationService.get_recommended_words(
+            user_id=user_id,
+            book_id=book_id,
+            use_frontier=True
+        )
+        assert [w['text'] for w in words] == ['algorithm']
+        db.session.refresh(frontier)
+        assert frontier.last_order == 3
+        
+        # 推进位置只前移
+        db.session.query(LearningRecord).filter_by(word_id=data['words'][1].id).delete()
+        RecommendationService.get_recommended_words(user_id=user_id, book_id=book_id, use_frontier=True)
+        db.session.refresh(frontier)
+        assert frontier.last_order == 3
+
+def test_recommendations_api(init_database, app):
+    """测试推荐接口使用并保存新词推进位置"""
+    data = init_database
+    user_id = data['user'].id
+    book_id = data['book'].id
+    db.session.add(LearningRecord(user_id=user_id, book_id=book_id, word_id=data['words'][0].id))
+    db.session.commit()
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+
+    response = client.get(f'/api/v1/vocabulary/books/{book_id}/recommendations?limit=2', headers=headers)
+
+    assert response.status_code == 200
+    assert [w['text'] for w in response.json['data']['words']] == ['banana', 'computer']
+    db.session.rollback()
+    assert LearningFrontier.query.filter_by(user_id=user_id, book_id=book_id).one().last_order == 1
+
+    response = client.get(f'/api/v1/vocabulary/books/{book_id}/recommendations?limit=0', headers=headers)
+    assert response.json['code'] == 400001
+    response = client.get(f'/api/v1/vocabulary/books/{book_id + 1}/recommendations', headers=headers)
+    assert response.json['code'] == 404001
+
+def test_frontier_reset_when_records_removed(init_database, app):
+    """测试删除学习记录后清除推进位置"""
+    from app.services.deletion_service import DeletionService
+    data = init_database
+    user_id = data['user'].id
+    book_id = data['book'].id
+    db.session.add(LearningRecord(user_id=user_id, book_id=book_id, word_id=data['words'][0].id))
+    db.session.commit()
+    RecommendationService.get_recommended_words(user_id=user_id, book_id=book_id, use_frontier=True)
+    db.session.commit()
+    assert LearningFrontier.query.count() == 1
+
+    DeletionService.purge_user(user_id, chunk_size=1)
+
+    assert LearningFrontier.query.count() == 0
+
 def test_get_recommended_words_no_assessment(init_database, app):
     """测试无评估记录时获取推荐单词"""
     with app.app_context():
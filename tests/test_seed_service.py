@@ -0,0 +1,143 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import select, func
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.learning_record import LearningRecord
+from app.models.learning import LearningFrontier
+from app.models.user_book_progress import UserBookProgress
+from app.models.test import Test, TestQuestion, TestRecord, TestAnswer
+from app.services.seed_service import SeedService
+
+NOW = datetime(2024, 6, 1)
+PARAMS = dict(seed=7, users=5, books=3, min_words=50, max_words=200, records=600,
+              tests_per_user=2, questions_per_test=5, chunk_size=64, now=NOW)
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def snapshot():
+    """学习记录和测试题目的内容"""
+    table = LearningRecord.__table__
+    records = db.session.execute(
+        select(table.c.user_id, table.c.book_id, table.c.word_id, table.c.status,
+               table.c.next_review_time, table.c.review_count).order_by(table.c.id)
+    ).all()
+    questions = db.session.execute(
+        select(TestQuestion.test_id, TestQuestion.word_id, TestQuestion.user_answer).order_by(TestQuestion.id)
+    ).all()
+    return records, questions
+
+def test_seed_counts(app):
+    """测试生成的行数和关联一致"""
+    stats = SeedService.seed(**PARAMS)
+
+    assert stats['users'] == 5
+    assert stats['vocabulary_books'] == 3
+    assert stats['learning_records'] == 600
+    assert User.query.count() == 5
+    assert LearningRecord.query.count() == 600
+
+    for book in VocabularyBook.query:
+        assert 50 <= book.total_words <= 200
+        assert WordRelation.query.filter_by(book_id=book.id).count() == book.total_words
+
+    # 每个用户的记录数相同，同一词书内不重复
+    per_user = db.session.query(LearningRecord.user_id, func.count()).group_by(LearningRecord.user_id).all()
+    assert {count for _, count in per_user} == {120}
+    duplicates = db.session.query(LearningRecord.user_id, LearningRecord.word_id, LearningRecord.book_id) \
+        .group_by(LearningRecord.user_id, LearningRecord.word_id, LearningRecord.book_id) \
+        .having(func.count() > 1).count()
+    assert duplicates == 0
+
+def test_seed_records_realistic(app):
+    """测试学习记录状态、复习时间和推进位置"""
+    SeedService.seed(**PARAMS)
+
+    statuses = dict(db.session.query(LearningRecord.status, func.count()).group_by(LearningRecord.status).all())
+    assert set(statuses) <= {'learning', 'reviewing', 'mastered'}
+    assert len(statuses) >= 2
+
+    due = LearningRecord.query.filter(LearningRecord.next_review_time <= NOW).count()
+    assert 0 < due < 600
+    record = LearningRecord.query.filter(LearningRecord.review_count > 0).first()
+    assert isinstance(record.next_review_time, datetime)
+    assert record.next_review_time > record.last_review_time
+    assert record.created_at <= NOW
+
+    # 推进位置指向已学习的最后一个单词
+    frontier = LearningFrontier.query.first()
+    relation = WordRelation.query.filter_by(book_id=frontier.book_id, order=frontier.last_order).one()
+    assert LearningRecord.query.filter_by(user_id=frontier.user_id, word_id=relation.word_id).count() == 1
+
+    progress = UserBookProgress.query.filter_by(user_id=frontier.user_id, book_id=frontier.book_id).one()
+    assert progress.learning_count + progress.reviewing_count + progress.mastered_count == \
+        LearningRecord.query.filter_by(user_id=frontier.user_id, book_id=frontier.book_id).count()
+
+def test_seed_tests(app):
+    """测试已完成的测试有答题记录"""
+    SeedService.seed(**PARAMS)
+
+    assert Test.query.count() == 10
+    assert TestQuestion.query.count() == 50
+    completed = Test.query.filter_by(status='completed').all()
+    assert TestRecord.query.count() == len(completed)
+    assert TestAnswer.query.count() == len(completed) * 5
+    for test in completed:
+        record = TestRecord.query.filter_by(test_id=test.id).one()
+        assert record.correct_count == test.correct_answers
+        assert len(TestQuestion.query.filter_by(test_id=test.id).first().options) == 4
+
+def test_seed_deterministic(app):
+    """测试相同种子生成相同数据"""
+    SeedService.seed(**PARAMS)
+    first = snapshot()
+
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    SeedService.seed(**PARAMS)
+
+    assert snapshot() == first
+
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    SeedService.seed(**dict(PARAMS, seed=8))
+    assert snapshot() != first
+
+def test_seed_existing_prefix(app):
+    """测试同一前缀不能重复生成，换前缀时复用已有单词"""
+    SeedService.seed(**PARAMS)
+
+    with pytest.raises(ValueError):
+        SeedService.seed(**PARAMS)
+
+    stats = SeedService.seed(**dict(PARAMS, prefix='other'))
+    assert 'words' not in stats
+    assert User.query.count() == 10
+
+def test_seed_command(app):
+    """测试 flask seed 命令"""
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['seed', '--users', '2', '--books', '1', '--min-words', '20',
+                                 '--max-words', '30', '--records', '40', '--tests', '1', '--questions', '3'])
+
+    assert result.exit_code == 0, result.output
+    assert 'learning_records: 40' in result.output
+    assert LearningRecord.query.count() == 40
+
+    result = runner.invoke(args=['seed', '--users', '2', '--min-words', '5', '--max-words', '1'])
+    assert result.exit_code != 0
@@ -0,0 +1,137 @@
+import logging
+import pytest
+from app import db
+from app.models.user import User
+from app.models.word import Word
+from app.extensions import slow_query_log
+from app.utils.slow_query import parameters_shape
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    admin = User(username='admin_user', email='admin@example.com')
+    admin.set_password('password123')
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add_all([admin, user, Word(text='apple', definition='n. 苹果')])
+    db.session.commit()
+    app.config['ADMIN_USER_IDS'] = (admin.id,)
+    slow_query_log.clear()
+
+    return {
+        'admin_headers': {'Authorization': f'Bearer {create_access_token(identity=admin.id)}'},
+        'user_headers': {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+    }
+
+def test_records_slow_query(init_database, app, caplog):
+    """测试记录语句、参数类型、端点和执行计划"""
+    app.config['SLOW_QUERY_THRESHOLD'] = 0
+    client = app.test_client()
+
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        response = client.get('/api/v1/vocabulary/words/search?keyword=app', headers=init_database['user_headers'])
+    assert response.status_code == 200
+
+    entries = [entry for entry in slow_query_log.recent() if 'FROM words' in entry['statement']]
+    assert entries
+    entry = entries[0]
+    assert entry['endpoint'] == 'vocabulary.search_words'
+    assert entry['method'] == 'GET'
+    assert entry['duration_ms'] >= 0
+    assert 'str' in entry['parameters'] and '%app%' not in str(entry['parameters'])
+    assert entry['plan'] and all(isinstance(line, str) for line in entry['plan'])
+    assert any('"event": "slow_query"' in record.getMessage() for record in caplog.records)
+
+def test_threshold_and_sampling(init_database, app):
+    """测试低于阈值或未被抽中的语句不记录"""
+    app.config['SLOW_QUERY_THRESHOLD'] = 10
+    Word.query.count()
+    assert slow_query_log.recent() == []
+
+    app.config['SLOW_QUERY_THRESHOLD'] = 0
+    app.config['SLOW_QUERY_SAMPLE_RATE'] = 0
+    Word.query.count()
+    assert slow_query_log.recent() == []
+
+    app.config['SLOW_QUERY_SAMPLE_RATE'] = 1
+    Word.query.count()
+    entries = slow_query_log.recent()
+    assert len(entries) == 1
+    assert entries[0]['endpoint'] is None
+
+def test_ring_buffer(init_database, app):
+    """测试只保留最近的记录，新的在前"""
+    app.config['SLOW_QUERY_BUFFER_SIZE'] = 3
+    app.config['SLOW_QUERY_THRESHOLD'] = 0
+    slow_query_log.init_app(app, db)
+
+    for n in range(5):
+        Word.query.filter_by(text=f'word{n}').first()
+
+    entries = slow_query_log.recent()
+    assert [entry['id'] for entry in entries] == [5, 4, 3]
+    assert len(slow_query_log.recent(2)) == 2
+
+def test_explain_disabled(init_database, app):
+    """测试关闭执行计划"""
+    app.config['SLOW_QUERY_THRESHOLD'] = 0
+    app.config['SLOW_QUERY_EXPLAIN'] = False
+
+    Word.query.count()
+
+    assert slow_query_log.recent()[0]['plan'] is None
+
+def test_parameters_shape():
+    """测试参数类型结构"""
+    assert parameters_shape((1, 'a', None)) == ['int', 'str', 'NoneType']
+    assert parameters_shape({'id': 1}) == {'id': 'int'}
+    assert parameters_shape([(1, 'a'), (2, 'b')], executemany=True) == {'rows': 2, 'row': ['int', 'str']}
+
+def test_admin_endpoint(init_database, app):
+    """测试只有管理员可以查看和清空慢查询"""
+    client = app.test_client()
+    app.config['SLOW_QUERY_THRESHOLD'] = 0
+    Word.query.count()
+    app.config['SLOW_QUERY_THRESHOLD'] = 10
+
+    assert client.get('/api/v1/admin/slow-queries').status_code == 401
+    response = client.get('/api/v1/admin/slow-queries', headers=init_database['user_headers'])
+    assert response.status_code == 403
+    assert response.json['code'] == 403001
+
+    response = client.get('/api/v1/admin/slow-queries?limit=1', headers=init_database['admin_headers'])
+    assert response.status_code == 200
+    data = response.json['data']
+    assert data['threshold_ms'] == 10000
+    assert len(data['items']) == 1
+    assert 'count(*)' in data['items'][0]['statement']
+
+    assert client.delete('/api/v1/admin/slow-queries', headers=init_database['user_headers']).status_code == 403
+    assert client.delete('/api/v1/admin/slow-queries', headers=init_database['admin_headers']).status_code == 200
+    assert slow_query_log.recent() == []
+
+def test_explain_only_dml(init_database, app):
+    """测试 DDL 等语句不获取执行计划"""
+    app.config['SLOW_QUERY_THRESHOLD'] = 0
+
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql('CREATE TABLE slow_query_probe (id INTEGER)')
+        conn.exec_driver_sql('INSERT INTO slow_query_probe (id) VALUES (1)')
+
+    insert, create = slow_query_log.recent(2)
+    assert create['plan'] is None and 'explain_error' not in create
+    assert insert['statement'].startswith('INSERT') and insert['plan'] is not None
@@ -0,0 +1,121 @@
+import pytest
+from datetime import datetime
+from werkzeug.datastructures import MultiDict
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningRecord
+from app.models.test import Test, TestQuestion
+from app.utils.serializers import parse_fields
+from flask_jwt_extended import create_access_token
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=2)
+    db.session.add(book)
+    db.session.flush()
+
+    words = [Word(text=f'word{i}', definition=f'definition{i}', example=f'example{i}') for i in range(2)]
+    db.session.add_all(words)
+    db.session.flush()
+    for i, word in enumerate(words):
+        db.session.add(WordRelation(word_id=word.id, book_id=book.id, order=(i + 1) * WordRelation.ORDER_GAP))
+        db.session.add(LearningRecord(user_id=user.id, book_id=book.id, word_id=word.id))
+
+    test = Test(user_id=user.id, book_id=book.id, name='Test', test_type='multiple_choice')
+    db.session.add(test)
+    db.session.flush()
+    db.session.add(TestQuestion(test_id=test.id, word_id=words[0].id, question_type='multiple_choice',
+                                question='?', options=['a', 'b'], correct_answer='a'))
+    db.session.commit()
+
+    return {
+        'book_id': book.id,
+        'test_id': test.id,
+        'headers': {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+    }
+
+def test_parse_fields():
+    """测试解析字段参数"""
+    assert parse_fields(Word, MultiDict()) == Word.SERIALIZE_FIELDS
+    assert parse_fields(Word, MultiDict({'view': 'lean'})) == Word.LEAN_FIELDS
+    # 按模型字段顺序输出并补上 id
+    assert parse_fields(Word, MultiDict({'fields': 'definition, text'})) == ('id', 'text', 'definition')
+    assert 'correct_answer' not in parse_fields(TestQuestion, MultiDict(), exclude=('correct_answer',))
+
+    with pytest.raises(ValueError):
+        parse_fields(Word, MultiDict({'fields': 'text,text_key'}))
+    with pytest.raises(ValueError):
+        parse_fields(Word, MultiDict({'view': 'tiny'}))
+    with pytest.raises(ValueError):
+        parse_fields(TestQuestion, MultiDict({'fields': 'correct_answer'}), exclude=('correct_answer',))
+
+def test_book_words_fields(init_database, app):
+    """测试单词列表只输出指定字段"""
+    client = app.test_client()
+    url = f"/api/v1/vocabulary/books/{init_database['book_id']}/words"
+
+    response = client.get(url + '?fields=text', headers=init_database['headers'])
+    assert response.status_code == 200
+    assert response.get_json()['data']['items'] == [{'id': 1, 'text': 'word0'}, {'id': 2, 'text': 'word1'}]
+
+    response = client.get(url + '?view=lean', headers=init_database['headers'])
+    assert set(response.get_json()['data']['items'][0]) == set(Word.LEAN_FIELDS)
+
+    response = client.get(url + '?fields=password', headers=init_database['headers'])
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 400001
+
+def test_record_and_test_lists_lean(init_database, app):
+    """测试学习记录和测试列表的精简视图"""
+    client = app.test_client()
+    headers = init_database['headers']
+
+    response = client.get('/api/v1/learning/records?view=lean', headers=headers)
+    items = response.get_json()['data']['items']
+    assert len(items) == 2
+    assert set(items[0]) == set(LearningRecord.LEAN_FIELDS)
+
+    response = client.get('/api/v1/tests?fields=name,status', headers=headers)
+    assert response.get_json()['data']['items'] == [{'id': init_database['test_id'], 'name': 'Test', 'status': 'pending'}]
+
+def test_questions_fields(init_database, app):
+    """测试题目列表和开始测试的字段"""
+    client = app.test_client()
+    headers = init_database['headers']
+    url = f"/api/v1/tests/{init_database['test_id']}"
+
+    response = client.get(url + '/questions?fields=question,options', headers=headers)
+    assert response.get_json()['data']['items'] == [{'id': 1, 'question': '?', 'options': ['a', 'b']}]
+
+    # 开始测试不能请求正确答案
+    response = client.post(url + '/start?fields=correct_answer', headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 400001
+
+    response = client.post(url + '/start', headers=headers)
+    assert response.status_code == 200
+    question = response.get_json()['data']['questions'][0]
+    assert 'correct_answer' not in question
+    assert question['question'] == '?'
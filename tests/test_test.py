@@ -223,6 +223,25 @@ def test_generate_test(client, init_database):
     assert 'questions' in data
     assert len(data['questions']) == 5
 
+def test_submit_generated_test(client, init_database):
+    """测试提交生成测试的答案并保存答题记录"""
+    auth_headers = init_database['auth_headers']
+    response = client.post('/api/v1/tests/generate', json={
+        'book_id': 1,
+        'question_count': 3,
+        'test_type': 'multiple_choice'
+    }, headers=auth_headers)
+    data = response.json['data']
+    questions = TestQuestion.query.filter_by(test_id=data['id']).all()
+    answers = [{'question_id': q.id, 'answer': q.correct_answer} for q in questions]
+
+    response = client.post(f"/api/v1/tests/{data['id']}/submit", json={'answers': answers}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['data']['correct_count'] == 3
+    record = TestRecord.query.filter_by(test_id=data['id']).one()
+    assert len(record.answers) == 3
+
 def test_get_tests(client, init_database):
     """测试获取测试列表"""
     auth_headers = init_database['auth_headers']
@@ -0,0 +1,123 @@
+import pytest
+from app import db
+from app.extensions import token_blocklist
+from app.models.user import User
+from app.utils.bloom import BloomFilter
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
+
+@pytest.fixture
+def app():
+    """创建测试应用，Redis 不可达时使用进程内撤销记录"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['REDIS_URL'] = 'redis://127.0.0.1:1/0'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    other = User(username='other_user', email='other@example.com')
+    other.set_password('password123')
+    db.session.add_all([user, other])
+    db.session.commit()
+    return {'user_id': user.id, 'other_id': other.id}
+
+def auth_headers(token):
+    return {'Authorization': f'Bearer {token}'}
+
+def test_bloom_filter():
+    """测试布隆过滤器没有漏判，误判率接近设定值"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f'jti-{i}')
+
+    assert all(f'jti-{i}' in bloom for i in range(1000))
+    false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+    assert len(bloom) == 1000
+
+def test_logout_revokes_access_token(init_database, app):
+    """测试退出登录后令牌失效，其他令牌不受影响"""
+    client = app.test_client()
+    token = create_access_token(identity=init_database['user_id'])
+    other_token = create_access_token(identity=init_database['user_id'])
+
+    assert client.get('/api/v1/auth/profile', headers=auth_headers(token)).status_code == 200
+
+    response = client.post('/api/v1/auth/logout', headers=auth_headers(token))
+    assert response.status_code == 200
+
+    response = client.get('/api/v1/auth/profile', headers=auth_headers(token))
+    assert response.status_code == 401
+    assert response.get_json()['code'] == 401004
+    assert client.get('/api/v1/auth/profile', headers=auth_headers(other_token)).status_code == 200
+
+def test_logout_revokes_refresh_token(init_database, app):
+    """测试退出登录时一并撤销 refresh_token"""
+    client = app.test_client()
+    access_token = create_access_token(identity=init_database['user_id'])
+    refresh_token = create_refresh_token(identity=init_database['user_id'])
+
+    response = client.post('/api/v1/auth/logout', headers=auth_headers(access_token),
+                           json={'refresh_token': refresh_token})
+    assert response.status_code == 200
+
+    response = client.post('/api/v1/auth/refresh', headers=auth_headers(refresh_token))
+    assert response.status_code == 401
+    assert response.get_json()['code'] == 401004
+
+def test_logout_other_users_refresh_token(init_database, app):
+    """测试不能撤销其他用户的令牌"""
+    client = app.test_client()
+    access_token = create_access_token(identity=init_database['user_id'])
+    refresh_token = create_refresh_token(identity=init_database['other_id'])
+
+    response = client.post('/api/v1/auth/logout', headers=auth_headers(access_token),
+                           json={'refresh_token': refresh_token})
+
+    assert response.status_code == 403
+    assert client.post('/api/v1/auth/refresh', headers=auth_headers(refresh_token)).status_code == 200
+
+def test_filter_skips_redis_for_unrevoked_tokens(init_database, app, monkeypatch):
+    """测试过滤器判断未撤销的令牌不访问 Redis"""
+    token = create_access_token(identity=init_database['user_id'])
+    token_blocklist.refresh()
+
+    calls = []
+    monkeypatch.setattr(token_blocklist, '_redis', lambda operation: calls.append(operation))
+
+    assert token_blocklist.is_revoked(decode_token(token)) is False
+    assert calls == []
+
+def test_revocation_check_disabled(init_database, app):
+    """测试关闭撤销检查或令牌类型不在检查范围内"""
+    client = app.test_client()
+    token = create_access_token(identity=init_database['user_id'])
+    client.post('/api/v1/auth/logout', headers=auth_headers(token))
+
+    app.config['JWT_BLACKLIST_TOKEN_CHECKS'] = ['refresh']
+    assert client.get('/api/v1/auth/profile', headers=auth_headers(token)).status_code == 200
+
+    app.config['JWT_BLACKLIST_TOKEN_CHECKS'] = ['access', 'refresh']
+    app.config['JWT_BLACKLIST_ENABLED'] = False
+    assert client.get('/api/v1/auth/profile', headers=auth_headers(token)).status_code == 200
+
+def test_pending_revocations_survive_refresh(init_database, app):
+    """测试 Redis 不可用时撤销记录在重建过滤器后仍然有效"""
+    token = create_access_token(identity=init_database['user_id'])
+    payload = decode_token(token)
+
+    token_blocklist.revoke(payload)
+    token_blocklist.bloom = None
+    token_blocklist.refresh()
+
+    assert payload['jti'] in token_blocklist.pending
+    assert token_blocklist.is_revoked(payload) is True
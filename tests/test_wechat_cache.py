@@ -0,0 +1,129 @@
+import time
+import threading
+import pytest
+from app import db
+from app.extensions import kv_cache
+from app.services.wechat_service import WeChatService, TOKEN_KEY, USERINFO_KEY
+from app.utils.wechat_stub import WeChatStubServer
+
+USERINFO = '/sns/userinfo'
+ACCESS_TOKEN = '/sns/oauth2/access_token'
+
+@pytest.fixture
+def stub():
+    """本地微信接口替身"""
+    with WeChatStubServer(app_id='test_app_id', app_secret='test_app_secret') as server:
+        yield server
+
+@pytest.fixture
+def app(stub):
+    """创建测试应用，Redis 指向不可用的地址以使用进程内缓存"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['REDIS_URL'] = 'redis://127.0.0.1:1/0'
+    app.config['WECHAT_APP_ID'] = 'test_app_id'
+    app.config['WECHAT_APP_SECRET'] = 'test_app_secret'
+    app.config['WECHAT_API_BASE'] = stub.url
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def run_concurrently(app, count, fn):
+    """在多个线程中同时执行 fn(i)，返回结果列表"""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        with app.app_context():
+            barrier.wait()
+            results[i] = fn(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_kv_cache_local_fallback(app):
+    """测试 Redis 不可用时使用进程内缓存"""
+    kv_cache.set('key', {'a': 1}, 60)
+    assert kv_cache.get('key') == {'a': 1}
+    assert kv_cache.breaker.state != 'closed'
+
+    assert kv_cache.add('lock', 1, 0.1) is True
+    assert kv_cache.add('lock', 1, 0.1) is False
+    time.sleep(0.15)
+    assert kv_cache.get('lock') is None
+    assert kv_cache.add('lock', 1, 0.1) is True
+
+    kv_cache.delete('key')
+    assert kv_cache.get('key') is None
+
+def test_login_uses_cached_user_info(app, stub):
+    """测试同一用户再次登录不再请求用户信息"""
+    first = WeChatService.login('alice.1')
+    second = WeChatService.login('alice.2')
+
+    assert first == second
+    assert first['openid'] == 'openid_alice'
+    assert stub.calls[ACCESS_TOKEN] == 2
+    assert stub.calls[USERINFO] == 1
+
+def test_concurrent_logins_coalesced(app, stub):
+    """测试同一用户同时登录只请求一次用户信息"""
+    stub.latency = 0.1
+
+    results = run_concurrently(app, 8, lambda i: WeChatService.login(f'bob.{i}'))
+
+    assert all(result['openid'] == 'openid_bob' for result in results)
+    assert stub.calls[ACCESS_TOKEN] == 8
+    assert stub.calls[USERINFO] == 1
+
+def test_duplicate_code_exchanged_once(app, stub):
+    """测试重复提交的授权码只兑换一次"""
+    stub.latency = 0.1
+
+    results = run_concurrently(app, 5, lambda i: WeChatService.login('carol.1'))
+
+    assert all(result['openid'] == 'openid_carol' for result in results)
+    assert stub.calls[ACCESS_TOKEN] == 1
+
+def test_user_info_refresh_ahead(app, stub):
+    """测试缓存接近过期时返回旧值并在后台刷新"""
+    app.config['WECHAT_USERINFO_TTL'] = 100
+    data = WeChatService.login('dave')
+    key = USERINFO_KEY.format('openid_dave')
+    kv_cache.set(key, {'data': data, 'fetched_at': time.time() - 90}, 100)
+
+    assert WeChatService.get_cached_user_info('openid_dave', 'unused') == data
+
+    deadline = time.time() + 5
+    while time.time() < deadline and stub.calls[USERINFO] < 2:
+        time.sleep(0.02)
+    assert stub.calls[USERINFO] == 2
+    while time.time() < deadline and time.time() - kv_cache.get(key)['fetched_at'] > 10:
+        time.sleep(0.02)
+    assert time.time() - kv_cache.get(key)['fetched_at'] < 10
+
+def test_access_token_refreshed_with_refresh_token(app, stub):
+    """测试 access_token 过期后用 refresh_token 刷新，验证令牌走缓存"""
+    WeChatService.login('erin')
+    kv_cache.delete(TOKEN_KEY.format('openid_erin'))
+
+    access_token = WeChatService.get_valid_access_token('openid_erin')
+
+    assert access_token
+    assert stub.calls['/sns/oauth2/refresh_token'] == 1
+    assert stub.last_params['/sns/oauth2/refresh_token'] == {
+        'appid': 'test_app_id',
+        'grant_type': 'refresh_token',
+        'refresh_token': 'refresh_erin'
+    }
+    assert WeChatService.validate_access_token(access_token, 'openid_erin') is True
+    assert stub.calls['/sns/auth'] == 0
+    assert WeChatService.get_valid_access_token('openid_nobody') is None
@@ -1,143 +1,165 @@
+import time
 import pytest
-from unittest.mock import patch
+from app import db
+from app.models.user import User
 from app.services.wechat_service import WeChatService
+from app.utils.http_client import UpstreamError, CircuitOpenError
+from app.utils.wechat_stub import WeChatStubServer
 
 @pytest.fixture
-def app():
+def stub():
+    """本地微信接口替身"""
+    with WeChatStubServer(app_id='test_app_id', app_secret='test_app_secret') as server:
+        yield server
+
+@pytest.fixture
+def app(stub):
     """创建测试应用"""
     from app import create_app
     app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     app.config['WECHAT_APP_ID'] = 'test_app_id'
     app.config['WECHAT_APP_SECRET'] = 'test_app_secret'
-    
+    app.config['WECHAT_API_BASE'] = stub.url
+    app.config['WECHAT_RETRY_BACKOFF'] = 0.01
+
     with app.app_context():
+        db.create_all()
         yield app
+        db.session.remove()
+        db.drop_all()
 
-def test_get_access_token(app):
+def test_get_access_token(app, stub):
     """测试获取微信access_token"""
-    mock_response = {
-        'access_token': 'test_access_token',
-        'expires_in': 7200,
-        'refresh_token': 'test_refresh_token',
-        'openid': 'test_openid',
-        'scope': 'snsapi_userinfo'
+    result = WeChatService.get_access_token('test_code')
+
+    assert stub.last_params['/sns/oauth2/access_token'] == {
+        'appid': 'test_app_id',
+        'secret': 'test_app_secret',
+        'code': 'test_code',
+        'grant_type': 'authorization_code'
     }
-    
-    with patch('requests.get') as mock_get:
-        mock_get.return_value.json.return_value = mock_response
-        
-        result = WeChatService.get_access_token('test_code')
-        
-        mock_get.assert_called_once_with(
-            'https://api.weixin.qq.com/sns/oauth2/access_token',
-            params={
-                'appid': 'test_app_id',
-                'secret': 'test_app_secret',
-                'code': 'test_code',
-                'grant_type': 'authorization_code'
-            }
-        )
-        
-        assert result == mock_response
-
-def test_get_user_info(app):
+    assert result['openid'] == 'openid_test_code'
+    assert result['expires_in'] == 7200
+    assert result['access_token']
+
+def test_get_access_token_invalid_app(app):
+    """测试 appid 或 secret 错误时返回微信的错误码"""
+    app.config['WECHAT_APP_SECRET'] = 'wrong_secret'
+    assert WeChatService.get_access_token('test_code')['errcode'] == 40125
+
+    app.config['WECHAT_APP_ID'] = 'wrong_app_id'
+    assert WeChatService.get_access_token('test_code')['errcode'] == 40013
+
+def test_get_user_info(app, stub):
     """测试获取微信用户信息"""
-    mock_response = {
-        'openid': 'test_openid',
-        'nickname': 'Test User',
-        'sex': 1,
-        'province': 'Test Province',
-        'city': 'Test City',
-        'country': 'Test Country',
-        'headimgurl': 'http://test.com/avatar.jpg',
-        'privilege': [],
-        'unionid': 'test_unionid'
+    token = WeChatService.get_access_token('test_code')
+
+    result = WeChatService.get_user_info(token['access_token'], token['openid'])
+
+    assert stub.last_params['/sns/userinfo'] == {
+        'access_token': token['access_token'],
+        'openid': token['openid'],
+        'lang': 'zh_CN'
     }
-    
-    with patch('requests.get') as mock_get:
-        mock_get.return_value.json.return_value = mock_response
-        
-        result = WeChatService.get_user_info('test_access_token', 'test_openid')
-        
-        mock_get.assert_called_once_with(
-            'https://api.weixin.qq.com/sns/userinfo',
-            params={
-                'access_token': 'test_access_token',
-                'openid': 'test_openid',
-                'lang': 'zh_CN'
-            }
-        )
-        
-        assert result == mock_response
-
-def test_validate_access_token_valid(app):
+
+    assert result['openid'] == 'openid_test_code'
+    assert result['nickname']
+
+def test_validate_access_token_valid(app, stub):
     """测试验证有效的access_token"""
-    mock_response = {
-        'errcode': 0,
-        'errmsg': 'ok'
+    token = WeChatService.get_access_token('test_code')
+
+    assert WeChatService.validate_access_token(token['access_token'], token['openid']) is True
+    assert stub.last_params['/sns/auth'] == {
+        'access_token': token['access_token'],
+        'openid': token['openid']
     }
-    
-    with patch('requests.get') as mock_get:
-        mock_get.return_value.json.return_value = mock_response
-        
-        result = WeChatService.validate_access_token('test_access_token', 'test_openid')
-        
-        mock_get.assert_called_once_with(
-            'https://api.weixin.qq.com/sns/auth',
-            params={
-                'access_token': 'test_access_token',
-                'openid': 'test_openid'
-            }
-        )
-        
-        assert result is True
 
 def test_validate_access_token_invalid(app):
     """测试验证无效的access_token"""
-    mock_response = {
-        'errcode': 40001,
-        'errmsg': 'invalid credential'
-    }
-    
-    with patch('requests.get') as mock_get:
-        mock_get.return_value.json.return_value = mock_response
-        
-        result = WeChatService.validate_access_token('test_access_token', 'test_openid')
-        
-        mock_get.assert_called_once_with(
-            'https://api.weixin.qq.com/sns/auth',
-            params={
-                'access_token': 'test_access_token',
-                'openid': 'test_openid'
-            }
-        )
-        
-        assert result is False
+    assert WeChatService.validate_access_token('test_access_token', 'test_openid') is False
 
 def test_get_access_token_error(app):
     """测试获取access_token失败的情况"""
-    mock_response = {
-        'errcode': 40029,
-        'errmsg': 'invalid code'
-    }
-    
-    with patch('requests.get') as mock_get:
-        mock_get.return_value.json.return_value = mock_response
-        
-        result = WeChatService.get_access_token('invalid_code')
-        
-        assert result.get('errcode') == 40029
+    result = WeChatService.get_access_token('invalid_code')
+
+    assert result.get('errcode') == 40029
 
 def test_get_user_info_error(app):
     """测试获取用户信息失败的情况"""
-    mock_response = {
-        'errcode': 40001,
-        'errmsg': 'invalid access_token'
-    }
-    
-    with patch('requests.get') as mock_get:
-        mock_get.return_value.json.return_value = mock_response
-        
-        result = WeChatService.get_user_info('invalid_token', 'test_openid')
-        
-        assert result.get('errcode') == 40001 
\ No newline at end of file
+    result = WeChatService.get_user_info('invalid_token', 'test_openid')
+
+    assert result.get('errcode') == 40001
+
+def test_retry_on_server_error(app, stub):
+    """测试幂等请求在 5xx 响应时重试，用尽后抛出 UpstreamError"""
+    stub.error_rate = 1.0
+
+    with pytest.raises(UpstreamError):
+        WeChatService.get_user_info('test_access_token', 'test_openid')
+
+    assert stub.requests == app.config['WECHAT_RETRIES'] + 1
+
+def test_code_exchange_not_retried(app, stub):
+    """测试授权码换取令牌失败时不重试，避免重复使用一次性授权码"""
+    assert app.config['WECHAT_RETRIES'] > 0
+    stub.error_rate = 1.0
+
+    with pytest.raises(UpstreamError):
+        WeChatService.get_access_token('test_code')
+
+    assert stub.requests == 1
+
+def test_read_timeout(app, stub):
+    """测试上游响应慢时按读超时失败"""
+    stub.latency = 0.5
+    app.config['WECHAT_READ_TIMEOUT'] = 0.05
+    app.config['WECHAT_RETRIES'] = 0
+
+    start = time.monotonic()
+    with pytest.raises(UpstreamError):
+        WeChatService.get_access_token('test_code')
+    assert time.monotonic() - start < 0.5
+
+def test_circuit_breaker(app, stub):
+    """测试连续失败后熔断，恢复时间过后放行试探请求"""
+    stub.error_rate = 1.0
+    app.config['WECHAT_RETRIES'] = 0
+    app.config['WECHAT_BREAKER_THRESHOLD'] = 2
+    app.config['WECHAT_BREAKER_RESET'] = 0.2
+
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            WeChatService.get_access_token('test_code')
+    with pytest.raises(CircuitOpenError):
+        WeChatService.get_access_token('test_code')
+    assert stub.requests == 2
+
+    stub.error_rate = 0.0
+    time.sleep(0.25)
+    assert WeChatService.get_access_token('test_code')['openid'] == 'openid_test_code'
+    assert app.extensions['wechat_client'].breaker.state == 'closed'
+
+def test_wechat_login(app):
+    """测试微信登录创建用户"""
+    client = app.test_client()
+
+    response = client.post('/api/v1/auth/wechat-login', json={'code': 'login_code'})
+
+    assert response.status_code == 200
+    assert 'access_token' in response.get_json()['data']
+    assert User.query.filter_by(wechat_id='openid_login_code').count() == 1
+
+    response = client.post('/api/v1/auth/wechat-login', json={'code': 'invalid_code'})
+    assert response.status_code == 400
+
+def test_wechat_login_upstream_down(app, stub):
+    """测试微信接口不可用时返回 503"""
+    stub.error_rate = 1.0
+    client = app.test_client()
+
+    response = client.post('/api/v1/auth/wechat-login', json={'code': 'login_code'})
+
+    assert response.status_code == 503
+    assert response.get_json()['code'] == 503001
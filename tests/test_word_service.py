@@ -0,0 +1,131 @@
+import pytest
+from app import db
+from app.models.user import User
+from app.models.vocabulary import VocabularyBook, WordRelation
+from app.models.word import Word
+from app.models.learning import LearningRecord, LearningFrontier
+from app.services.word_service import WordService
+from app.services.progress_service import ProgressService
+
+@pytest.fixture
+def app():
+    """创建测试应用"""
+    from app import create_app
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def init_database(app):
+    """初始化测试数据库"""
+    user = User(username='test_user', email='test@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    book = VocabularyBook(name='Test Book', user_id=user.id, total_words=2)
+    db.session.add(book)
+    db.session.commit()
+
+    return {'user': user, 'book': book}
+
+def add_legacy_word(text, book_id=None):
+    """模拟迁移前没有规范化文本的单词"""
+    word = Word(text=text, definition=f'{text} definition')
+    word.text_key = None
+    db.session.add(word)
+    db.session.flush()
+    if book_id:
+        db.session.add(WordRelation(word_id=word.id, book_id=book_id, order=word.id * WordRelation.ORDER_GAP))
+    return word
+
+def test_normalize():
+    """测试文本规范化"""
+    assert Word.normalize('  Hello　 World ') == 'hello world'
+    assert Word.normalize('Ｃａｆé') == 'café'
+    assert Word.normalize('STRASSE') == Word.normalize('straße')
+
+def test_get_or_create(init_database, app):
+    """测试按规范化文本查找或创建"""
+    word = WordService.get_or_create('Apple', '苹果')
+    db.session.commit()
+
+    assert WordService.get_or_create(' apple ', '重复').id == word.id
+    assert WordService.find_by_text('APPLE').id == word.id
+    assert Word.query.count() == 1
+
+def test_find_by_text_stale_cache(init_database, app):
+    """测试缓存的单词被删除后回退到索引查找"""
+    word = WordService.get_or_create('apple', '苹果')
+    db.session.commit()
+    db.session.delete(word)
+    db.session.commit()
+
+    assert WordService.find_by_text('apple') is None
+
+def test_dedupe(init_database, app):
+    """测试合并重复单词"""
+    data = init_database
+    user_id = data['user'].id
+    book_id = data['book'].id
+    canonical = add_legacy_word('apple', book_id)
+    duplicate = add_legacy_word('Apple ', book_id)
+    other = add_legacy_word('APPLE')
+    db.session.add_all([
+        LearningRecord(user_id=user_id, book_id=book_id, word_id=canonical.id, status='learning'),
+        LearningRecord(user_id=user_id, book_id=book_id, word_id=duplicate.id, status='mastered'),
+        LearningRecord(user_id=user_id, book_id=book_id, word_id=other.id, status='learning')
+    ])
+    db.session.add(LearningFrontier(user_id=user_id, book_id=book_id, last_order=1))
+    db.session.commit()
+    ProgressService.get_progress(user_id, book_id)
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['words', 'dedupe'])
+
+    assert result.exit_code == 0
+    assert Word.query.count() == 1
+    assert db.session.get(Word, canonical.id).text_key == 'apple'
+    assert WordRelation.query.filter_by(book_id=book_id).count() == 1
+    assert LearningRecord.query.filter_by(word_id=canonical.id).count() == 1
+    assert db.session.get(VocabularyBook, book_id).total_words == 1
+    assert ProgressService.get_progress(user_id, book_id).studied_count == 1
+    assert LearningFrontier.query.count() == 0
+
+def test_dedupe_merges_records(init_database, app):
+    """测试重复单词的学习记录更完整时合并而不是丢弃"""
+    from datetime import datetime
+    data = init_database
+    user_id = data['user'].id
+    book_id = data['book'].id
+    canonical = add_legacy_word('apple', book_id)
+    canonical.text_key = 'apple'
+    duplicate = add_legacy_word('Apple', book_id)
+    db.session.add_all([
+        LearningRecord(user_id=user_id, book_id=book_id, word_id=canonical.id, status='learning',
+                       review_count=0, study_time=10,
+                       next_review_time=datetime(2024, 6, 2)),
+        LearningRecord(user_id=user_id, book_id=book_id, word_id=duplicate.id, status='mastered',
+                       review_count=7, study_time=300,
+                       last_review_time=datetime(2024, 5, 20), next_review_time=datetime(2024, 9, 1))
+    ])
+    db.session.flush()
+    LearningRecord.query.filter_by(word_id=duplicate.id).update({'mastery_level': 1.0})
+    db.session.commit()
+
+    result = WordService.dedupe()
+
+    assert result['merged'] == 1 and result['records'] == 1
+    record = LearningRecord.query.one()
+    assert record.word_id == canonical.id
+    assert (record.status, record.review_count, record.mastery_level) == ('mastered', 7, 1.0)
+    assert record.last_review_time == datetime(2024, 5, 20)
+    assert record.next_review_time == datetime(2024, 6, 2)
+    assert record.study_time == 310
+    assert ProgressService.get_progress(user_id, book_id).mastered_count == 1